@@ -0,0 +1,85 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import click
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(benchmarks_dir)
+
+# loaded by the interpreter before the cli starts
+STARTUP = ['site', 'encodings', 'codecs', 'io', 'abc', 'zipimport', '_frozen_importlib_external', 'time']
+
+
+def import_times(args: list) -> list:
+    """
+    Run akamai-onboard with -X importtime, returns (module, self us, cumulative us, depth) per imported module
+    """
+    cmd = [sys.executable, '-X', 'importtime', os.path.join(root, 'bin', 'akamai-onboard.py'), *args]
+    process = subprocess.run(cmd, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    if process.returncode != 0:
+        sys.exit(f'{" ".join(cmd)} failed\n{process.stderr}')
+    modules = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line.split('|')
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((module, int(self_us.split(':')[1]), int(cumulative_us), depth))
+    return modules
+
+
+@click.command(context_settings={'help_option_names': ['-h', '--help']})
+@click.option('--budget', metavar='', type=float, default=250, show_default=True,
+              help='Maximum milliseconds spent importing modules')
+@click.option('--forbid', metavar='', multiple=True, default=['pandas'], show_default=True,
+              help='Module that must not be imported, repeat for more')
+@click.option('--top', metavar='', type=int, default=10, show_default=True, help='Slowest top level imports to show')
+@click.argument('args', nargs=-1)
+def main(budget, forbid, top, args):
+    """
+    Check the import time of akamai-onboard (default: --help) stays within budget
+    and that heavy modules are only imported by the commands that need them.
+
+    \b
+    python3 benchmarks/import_time.py
+    python3 benchmarks/import_time.py --budget 400 --forbid pandas --forbid requests -- appsec-policy --help
+    """
+    modules = import_times(list(args) or ['--help'])
+    top_level = [m for m in modules if m[3] == 0 and m[0] not in STARTUP]
+    total = sum(m[2] for m in top_level) / 1000
+
+    for module, _, cumulative, _ in sorted(top_level, key=lambda m: m[2], reverse=True)[:top]:
+        print(f'{cumulative / 1000:>8.1f} ms  {module}')
+    print(f'{total:>8.1f} ms  total, budget {budget:g} ms')
+
+    failed = False
+    imported = {m[0] for m in modules}
+    for module in forbid:
+        if module in imported:
+            print(f'{module} is imported')
+            failed = True
+    if total > budget:
+        print(f'import time {total:.1f} ms is over budget')
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import json
+import os
+
+CONTRACT_ID = 'ctr_1'
+GROUP_ID = 'grp_1'
+PRODUCT_ID = 'prd_Fresca'
+EDGE_HOSTNAME = 'onboard-bench.edgekey.net'
+EMAIL = 'noreply@example.com'
+# hostnames per property in batch-create and per policy in appsec-create
+HOSTNAMES_PER_GROUP = 10
+
+
+def hostnames(size: int) -> list:
+    return [f'www.bench-{i:05d}.example.com' for i in range(size)]
+
+
+def write_csv(folder: str, name: str, rows: list, header: str | None = None) -> str:
+    file = os.path.join(folder, name)
+    with open(file, 'w') as f:
+        if header:
+            f.write(f'{header}\n')
+        for row in rows:
+            f.write(f"{','.join(str(value) for value in row)}\n")
+    return file
+
+
+def write_json(folder: str, name: str, data: dict) -> str:
+    file = os.path.join(folder, name)
+    with open(file, 'w') as f:
+        json.dump(data, f, indent=2)
+    return file
+
+
+def setup_json(property_name: str, hostname: str | None = None) -> dict:
+    property_info = {'contract_id': CONTRACT_ID, 'group_id': GROUP_ID, 'product_id': PRODUCT_ID}
+    if hostname:
+        property_info.update({'property_hostname': hostname, 'property_origin': f'origin-{hostname}'})
+    else:
+        property_info.update({'property_name': property_name, 'individual_cpcode': False})
+    return {'property_info': property_info,
+            'edge_hostname': {'secure_by_default': False,
+                              'use_existing_edge_hostname': EDGE_HOSTNAME,
+                              'create_from_existing_enrollment_id': 0},
+            'update_waf_info': {'create_new_security_config': False,
+                                'waf_config_name': ''},
+            'activate_production': False,
+            'notification_emails': [EMAIL]}
+
+
+def batch_create(folder: str, size: int, root: str) -> list:
+    rows = [(h, f'origin-{h}', f'bench-property-{i // HOSTNAMES_PER_GROUP:04d}', 'REQUEST_HOST_HEADER', EDGE_HOSTNAME)
+            for i, h in enumerate(hostnames(size))]
+    csv = write_csv(folder, 'batch-create.csv', rows, 'hostname,origin,propertyName,forwardHostHeader,edgeHostname')
+    template = os.path.join(root, 'templates', 'akamai_product_templates', f'{PRODUCT_ID}.json')
+    return ['batch-create', '--csv', csv, '-t', template, '-c', CONTRACT_ID, '-g', GROUP_ID, '-p', PRODUCT_ID,
+            '--activate', 'delivery-staging', '--email', EMAIL]
+
+
+def multi_hosts(folder: str, size: int, root: str) -> list:
+    csv = write_csv(folder, 'multi-hosts.csv', [(h, f'origin-{h}') for h in hostnames(size)])
+    setup = write_json(folder, 'multi-hosts.json', setup_json('bench-multi-hosts'))
+    return ['multi-hosts', '--csv', csv, '--file', setup]
+
+
+def single_host(folder: str, size: int, root: str) -> list:
+    # one hostname per property, the size does not apply
+    setup = write_json(folder, 'single-host.json', setup_json(None, hostnames(1)[0]))
+    return ['single-host', '--file', setup]
+
+
+def appsec_create(folder: str, size: int, root: str) -> list:
+    rows = [(f'bench_waf_{i // (HOSTNAMES_PER_GROUP * 10):03d}', f'policy_{i // HOSTNAMES_PER_GROUP:04d}', h)
+            for i, h in enumerate(hostnames(size))]
+    csv = write_csv(folder, 'appsec-create.csv', rows, 'waf_config_name,waf_policy_name,hostname')
+    return ['appsec-create', '-c', CONTRACT_ID, '-g', GROUP_ID, '--csv', csv, '--by', 'hostname',
+            '--activate', 'staging', '--email', EMAIL]
+
+
+def appsec_update(folder: str, size: int, root: str, match_target_id: int = 0) -> list:
+    csv = write_csv(folder, 'appsec-update.csv', [(h, match_target_id) for h in hostnames(size)], 'hostname,matchTargetId')
+    return ['appsec-update', '--config-id', '1', '--csv', csv, '--activate', 'staging', '--email', EMAIL]
+
+
+def appsec_remove(folder: str, size: int, root: str) -> list:
+    csv = write_csv(folder, 'appsec-remove.csv', [(h,) for h in hostnames(size)], 'hostname')
+    return ['appsec-remove', '--config-id', '1', '--csv', csv, '--activate', 'staging', '--email', EMAIL]
+
+
+COMMANDS = {'batch-create': batch_create,
+            'multi-hosts': multi_hosts,
+            'single-host': single_host,
+            'appsec-create': appsec_create,
+            'appsec-update': appsec_update,
+            'appsec-remove': appsec_remove}
@@ -0,0 +1,179 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import atexit
+import datetime
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(benchmarks_dir)
+# copied for the benchmark, multi-hosts and single-host rewrite their templates
+CLI_FILES = ['bin', 'config', 'templates', 'cli.json']
+
+
+def copy_cli() -> str:
+    """
+    Install a copy of the cli as ~/.akamai-cli/src/cli-onboard of a temporary home, returns the home folder.
+    Commands resolve their templates from there, so a run never changes the checkout.
+    """
+    home = tempfile.mkdtemp(prefix='onboard-bench-home-')
+    cli_root = os.path.join(home, '.akamai-cli', 'src', 'cli-onboard')
+    for name in CLI_FILES:
+        source = os.path.join(root, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(cli_root, name), ignore=shutil.ignore_patterns('__pycache__'))
+        else:
+            os.makedirs(cli_root, exist_ok=True)
+            shutil.copy2(source, cli_root)
+    return home
+
+
+# the harness (mock_server) and the commands read config/logging.json from the copy, nothing from the real HOME
+HOME = copy_cli()
+os.environ['HOME'] = HOME
+atexit.register(shutil.rmtree, HOME, ignore_errors=True)
+sys.path.insert(0, os.path.join(root, 'bin'))
+
+import inputs  # noqa: E402
+import mock_server  # noqa: E402
+from tabulate import tabulate  # noqa: E402
+
+SIZES = [10, 100, 1000, 10000]
+STAGES = ['csv', 'rules', 'validation']
+
+
+def write_edgerc(folder: str, host: str) -> str:
+    file = os.path.join(folder, 'edgerc')
+    with open(file, 'w') as f:
+        f.write(f'[bench]\nclient_secret = bench\nhost = {host}\naccess_token = bench\nclient_token = bench\n')
+    return file
+
+
+def new_api(command: str, size: int, activation_delay: float, latency: float, error_rate: float) -> mock_server.MockApi:
+    """
+    Fresh mock account for every run, the hostnames of the run are selectable for security configurations
+    and the edge hostname of the run exists on the account
+    """
+    api = mock_server.MockApi(activation_delay=activation_delay, latency=latency, error_rate=error_rate,
+                              hostnames=inputs.hostnames(size), edge_hostnames=[inputs.EDGE_HOSTNAME])
+    if command == 'appsec-remove':
+        api.select_hostnames(1, inputs.hostnames(size))
+    return api
+
+
+def run_command(server, command: str, size: int, options: dict, api: mock_server.MockApi | None = None,
+                folder: str | None = None) -> dict:
+    """
+    Run one command with synthetic inputs against a fresh mock account, or against `api` when given,
+    in a new temporary folder or in the `folder` of an earlier run
+    """
+    if api is None:
+        api = new_api(command, size, options['activation_delay'], options['latency'], options['error_rate'])
+    server.api = api
+    folder = folder or tempfile.mkdtemp(prefix=f'onboard-bench-{command}-{size}-')
+    edgerc = write_edgerc(folder, f'127.0.0.1:{server.server_port}')
+    cli_root = os.path.join(HOME, '.akamai-cli', 'src', 'cli-onboard')
+    if command == 'appsec-update':
+        match_target_id = next(iter(api.waf_configs[1]['versions'][1]['targets']))
+        args = inputs.appsec_update(folder, size, cli_root, match_target_id)
+    else:
+        args = inputs.COMMANDS[command](folder, size, cli_root)
+
+    cmd = [sys.executable, os.path.join(cli_root, 'bin', 'akamai-onboard.py'),
+           '--edgerc', edgerc, '--section', 'bench', '--plain-http', '--poll-interval', '1', '--poll-max-interval', '5',
+           *options['global_args'], *args, *options['command_args']]
+    env = dict(os.environ,
+               HOME=HOME,
+               AKAMAI_CLI_CACHE_DIR=folder)
+
+    start = time.perf_counter()
+    with open(os.path.join(folder, 'output.log'), 'w') as log:
+        process = subprocess.Popen(cmd, cwd=folder, env=env, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+        _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    result = {'command': command,
+              'size': size if command != 'single-host' else 1,
+              'exit_code': process.returncode,
+              'wall': round(wall, 3),
+              # kilobytes on linux, bytes on macos
+              'peak_rss_mb': round(usage.ru_maxrss / (1024 if sys.platform != 'darwin' else 1024 * 1024), 1),
+              'api_calls': None,
+              'stages': {},
+              'folder': folder}
+    metrics = sorted(glob.glob(os.path.join(folder, 'logs', 'api_metrics_*.json')))
+    if metrics:
+        with open(metrics[-1]) as f:
+            report = json.load(f)
+        result['api_calls'] = report['calls']
+        result['stages'] = report.get('stages', {})
+        result['endpoints'] = report['endpoints']
+    return result
+
+
+@click.command(context_settings={'help_option_names': ['-h', '--help']})
+@click.option('--command', 'commands', metavar='', multiple=True, type=click.Choice(list(inputs.COMMANDS)),
+              help='Command to benchmark, repeat for more  [default: all]')
+@click.option('--size', 'sizes', metavar='', multiple=True, type=int,
+              help=f'Number of hostnames, repeat for more  [default: {" ".join(str(s) for s in SIZES)}]')
+@click.option('--latency', metavar='', type=float, default=0.05, show_default=True, help='Seconds added to every API response')
+@click.option('--activation-delay', metavar='', type=float, default=2, show_default=True, help='Seconds an activation takes')
+@click.option('--error-rate', metavar='', type=float, default=0, show_default=True, help='Fraction of API calls answered with 429/503')
+@click.option('--global-arg', 'global_args', metavar='', multiple=True,
+              help='Extra akamai-onboard global option, e.g. --global-arg=--no-cache')
+@click.option('--command-arg', 'command_args', metavar='', multiple=True,
+              help='Extra option of the benchmarked command, e.g. --command-arg=--workers --command-arg=4')
+@click.option('--output', metavar='', type=click.Path(dir_okay=False), help='JSON results file  [default: benchmarks/results/<time>.json]')
+def main(commands, sizes, latency, activation_delay, error_rate, global_args, command_args, output):
+    """
+    Run onboard commands with synthetic inputs against the local mock API and report
+    wall time, API calls, peak RSS and the time spent in csv parsing, rule generation and validation.
+    """
+    options = {'latency': latency, 'activation_delay': activation_delay, 'error_rate': error_rate,
+               'global_args': list(global_args), 'command_args': list(command_args)}
+    server = mock_server.serve(mock_server.MockApi())
+    results = []
+    for command in commands or inputs.COMMANDS:
+        for size in (sizes or SIZES) if command != 'single-host' else [1]:
+            print(f'{command} {size} ...', flush=True)
+            results.append(run_command(server, command, size, options))
+            if results[-1]['exit_code'] != 0:
+                print(f"  exit code {results[-1]['exit_code']}, see {results[-1]['folder']}/output.log")
+    server.shutdown()
+
+    rows = [[r['command'], r['size'], r['exit_code'], r['wall'], r['api_calls'], r['peak_rss_mb'],
+             *[r['stages'].get(stage, {}).get('seconds', '') for stage in STAGES]] for r in results]
+    print(tabulate(rows, headers=['command', 'hostnames', 'exit', 'wall (s)', 'api calls', 'peak rss (MB)',
+                                  *[f'{stage} (s)' for stage in STAGES]], tablefmt='psql'))
+
+    output = output or os.path.join(benchmarks_dir, 'results', f"{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'started': datetime.datetime.now().isoformat(), 'options': options, 'results': results}, f, indent=4)
+    print(f'Results: {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -25,21 +25,17 @@ from time import gmtime
 from time import strftime
 
 import _logging as lg
+import api_metrics
 import click
+import metadata_cache
 import onboard
 import onboard_appsec_update
 import onboard_batch_create
 import onboard_multi_hosts
 import onboard_single_host
-import pandas as pd
-import requests
+import poll
+import run_journal
 import steps
-import utility
-import utility_papi
-import utility_waf
-import wrapper_api
-from akamai.edgegrid import EdgeGridAuth
-from akamai.edgegrid import EdgeRc
 from exceptions import get_cli_root_directory
 from exceptions import setup_logger
 from model.appsec import AppSec
@@ -47,7 +43,6 @@ from model.appsec import Generic
 from model.appsec import Property
 from model.multi_hosts import MultiHosts
 from model.single_host import SingleHost
-from tabulate import tabulate
 
 PACKAGE_VERSION = '2.4.0'
 logger = setup_logger()
@@ -62,7 +57,13 @@ class Config:
 pass_config = click.make_pass_decorator(Config, ensure=True)
 
 
-def init_config(config):
+def init_config(config, workers: int = 1):
+    # requests and pandas are only loaded once a command talks to the API, keeps --help and startup fast
+    import transport
+    import wrapper_api
+    from akamai.edgegrid import EdgeGridAuth
+    from akamai.edgegrid import EdgeRc
+
     if not config.edgerc:
         if not os.getenv('AKAMAI_EDGERC'):
             edgerc_file = os.path.join(os.path.expanduser('~'), '.edgerc')
@@ -81,10 +82,18 @@ def init_config(config):
             section = os.getenv('AKAMAI_EDGERC_SECTION')
     else:
         section = config.section
+
+    if config.plain_http:
+        host = EdgeRc(config.edgerc).get(section, 'host', fallback='')
+        if not transport.is_loopback(host):
+            logger.error(f'--plain-http is only allowed for a local mock API, not {host}')
+            sys.exit(1)
     try:
         edgerc = EdgeRc(config.edgerc)
         base_url = edgerc.get(section, 'host')
-        session = requests.Session()
+        recorder = transport.FixtureRecorder(config.record) if config.record else None
+        session = transport.new_session(pool_size=max(transport.DEFAULT_POOL_SIZE, workers), http2=config.http2,
+                                        metrics=config.metrics, recorder=recorder, plain_http=config.plain_http)
         session.auth = EdgeGridAuth.from_edgerc(edgerc, section)
 
     except configparser.NoSectionError:
@@ -93,10 +102,17 @@ def init_config(config):
         lg._log_error(f'Unknown error occurred trying to read edgerc file {edgerc_file}')
     finally:
         wrap_api = wrapper_api.apiCallsWrapper(session, base_url, config.account_key)
+        if not config.no_cache:
+            wrap_api.metadata_cache = metadata_cache.MetadataCache(get_cache_dir(), section, config.account_key,
+                                                                   ttl=config.cache_ttl,
+                                                                   refresh=config.refresh_cache)
         if config.account_key:
             account_name = wrap_api.get_account_name(config.account_key)
             logger.warning(f'Account Name: {account_name} {config.account_key}')
 
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None:
+        ctx.call_on_close(lambda: logger.debug(f'connection pool: {session.pool_stats}'))
     return session, wrap_api
 
 
@@ -108,15 +124,56 @@ def init_config(config):
 @click.option('-a', '--account-key', '--accountkey', '--accountSwitchKey', '--accountswitchkey',
               metavar='',
               help='Account Switch Key (Akamai Internal Only)', required=False)
+@click.option('--poll-interval', metavar='', type=click.FloatRange(min=1), default=5, show_default=True,
+              help='Seconds before the first activation status check', required=False)
+@click.option('--poll-max-interval', metavar='', type=click.FloatRange(min=1), default=60, show_default=True,
+              help='Upper bound in seconds between activation status checks', required=False)
+@click.option('--poll-backoff', metavar='', type=click.FloatRange(min=1), default=1.5, show_default=True,
+              help='Multiplier applied to the interval after every pending status check', required=False)
+@click.option('--poll-jitter', metavar='', type=click.FloatRange(min=0, max=1), default=0.1, show_default=True,
+              help='Random spread applied to every interval, fraction of the interval', required=False)
+@click.option('--poll-eta/--no-poll-eta', default=True, show_default=True,
+              help='Schedule status checks from the estimated finish time reported by the API', required=False)
+@click.option('--merge-engine', metavar='', type=click.Choice(['native', 'pipeline']), default='native', show_default=True,
+              help='Merge rule tree templates in process (native) or with akamai pipeline (pipeline)', required=False)
+@click.option('--cache-ttl', metavar='', type=click.IntRange(min=0), default=metadata_cache.DEFAULT_TTL, show_default=True,
+              help='Seconds groups, products, WAF configs and selectable hostnames are reused from the cache [$AKAMAI_CLI_CACHE_DIR]',
+              required=False)
+@click.option('--refresh-cache', is_flag=True, default=False,
+              help='Ignore cached metadata and fetch it again, the cache is updated', required=False)
+@click.option('--no-cache', is_flag=True, default=False,
+              help='Do not read or write cached metadata', required=False)
+@click.option('--http2', is_flag=True, default=False,
+              help='Send API calls over HTTP/2, requires httpx[http2]', required=False)
+@click.option('--record', metavar='', type=click.Path(file_okay=False),
+              help='Folder to save every API request/response pair as fixtures for bin/mock_server.py', required=False)
+@click.option('--plain-http', is_flag=True, default=False, hidden=True,
+              help='Send API calls over http to a local mock API (bin/mock_server.py), loopback hosts only', required=False)
 @click.version_option(version=PACKAGE_VERSION)
 @pass_config
-def cli(config, edgerc, section, account_key):
+def cli(config, edgerc, section, account_key, poll_interval, poll_max_interval, poll_backoff, poll_jitter, poll_eta,
+        merge_engine, cache_ttl, refresh_cache, no_cache, http2, record, plain_http):
     '''
     Akamai CLI for onboarding properties v2.4.0
     '''
     config.edgerc = edgerc
     config.section = section
     config.account_key = account_key
+    config.poll_strategy = poll.PollStrategy(initial=poll_interval,
+                                             maximum=poll_max_interval,
+                                             factor=poll_backoff,
+                                             jitter=poll_jitter,
+                                             use_eta=poll_eta)
+    config.merge_engine = merge_engine
+    config.cache_ttl = cache_ttl
+    config.refresh_cache = refresh_cache
+    config.no_cache = no_cache
+    config.http2 = http2
+    config.record = record
+    config.plain_http = plain_http
+    config.metrics = api_metrics.ApiMetrics()
+    ctx = click.get_current_context()
+    ctx.call_on_close(lambda: config.metrics.report(ctx.invoked_subcommand))
 
 
 @cli.command()
@@ -162,8 +219,11 @@ def multi_hosts(config, csv, file):
     CSV input file without headers.  Just data in format hostname,origin-hostname
     """
     logger.info('Start Akamai CLI onboard')
+    import utility
+    import utility_papi
+    import utility_waf
     _, wrap_api = init_config(config)
-    util = utility.utility()
+    util = utility.utility(config.merge_engine)
     origin_parent_rules, public_hostnames, origin_hostnames = util.csv_2_origin_rules(csv)
     setup = onboard_multi_hosts.onboard(load_json(file))
     onboard = MultiHosts(setup.property_name, setup.contract_id, setup.product_id,
@@ -189,8 +249,8 @@ def multi_hosts(config, csv, file):
             json.dump(rules, outfile, ensure_ascii=True, indent=2)
 
         # Load business rule for delivery and security
-        util_papi = utility_papi.papiFunctions()
-        util_waf = utility_waf.wafFunctions()
+        util_papi = utility_papi.papiFunctions(poll_strategy=config.poll_strategy)
+        util_waf = utility_waf.wafFunctions(poll_strategy=config.poll_strategy)
         cp_code_id = []
         logger.debug(f'{public_hostnames=}')
 
@@ -327,8 +387,11 @@ def single_host(config, file):
     Security config will also be activating on STAGING network if create_new_security_config is True.
     """
     logger.info('Start Akamai CLI onboard')
+    import utility
+    import utility_papi
+    import utility_waf
     _, wrap_api = init_config(config)
-    util = utility.utility()
+    util = utility.utility(config.merge_engine)
 
     # Populate onboarding data from user input and default values
     setup = onboard_single_host.onboard(load_json(file))
@@ -344,8 +407,8 @@ def single_host(config, file):
     util.validateSetupSteps(onboard, wrap_api, cli_mode='single_host')
     if util.valid:
         # Load business rule for delivery and security
-        util_papi = utility_papi.papiFunctions()
-        util_waf = utility_waf.wafFunctions()
+        util_papi = utility_papi.papiFunctions(poll_strategy=config.poll_strategy)
+        util_waf = utility_waf.wafFunctions(poll_strategy=config.poll_strategy)
         if onboard.create_new_cpcode:
             onboard.onboard_default_cpcode = util_papi.create_new_cpcode(onboard, wrap_api,
                                                                          onboard.new_cpcode_name,
@@ -423,21 +486,17 @@ def single_host(config, file):
 def create(config, file):
 
     logger.info('Start Akamai CLI onboard')
+    import utility
+    import utility_papi
+    import utility_waf
     _, wrapper_object = init_config(config)
     setup_json_content = load_json(file)
     onboard_object = onboard.onboard(setup_json_content, config)
 
-    # Validate setup and akamai cli and cli pipeline are installed
-    utility_object = utility.utility()
-    cli_installed = utility_object.installedCommandCheck('akamai')
-    pipeline_installed = utility_object.executeCommand(['akamai', 'pipeline'])
-
-    if not (pipeline_installed and (cli_installed or pipeline_installed)):
-        sys.exit()
-
-    # Validate akamai cli and cli pipeline are installed
-    utility_papi_object = utility_papi.papiFunctions()
-    utility_waf_object = utility_waf.wafFunctions()
+    # akamai cli and cli pipeline are validated with --merge-engine pipeline
+    utility_object = utility.utility(config.merge_engine)
+    utility_papi_object = utility_papi.papiFunctions(poll_strategy=config.poll_strategy)
+    utility_waf_object = utility_waf.wafFunctions(poll_strategy=config.poll_strategy)
 
     # Determine necessary execution steps
     steps_object = steps.executionSteps()
@@ -566,28 +625,26 @@ def create(config, file):
 @click.option('--activate', metavar='', type=click.Choice(['delivery-staging', 'waf-staging', 'delivery-production', 'waf-production']), multiple=True, help='Options: delivery-staging, delivery-production, waf-staging, waf-production', required=False)
 @click.option('--email', metavar='', multiple=True, help='email(s) for activation notifications', required=False)
 @click.option('--csv', metavar='', required=True, help='csv file with headers hostname,origin,propertyName,forwardHostHeader,edgeHostname')
+@click.option('--workers', metavar='', type=click.IntRange(min=1), default=1, show_default=True, help='number of properties to provision concurrently', required=False)
+@click.option('--resume', metavar='', help='run id of an interrupted batch-create to continue, completed steps are skipped', required=False)
 @pass_config
 def batch_create(config, **kwargs):
     """
     Create a 1 or more delivery configurations using a csv input and optionally update WAF policy
     """
     logger.info('Start Akamai CLI onboard')
-    _, wrapper_object = init_config(config)
+    import utility
+    import utility_papi
+    import utility_waf
+    _, wrapper_object = init_config(config, workers=kwargs['workers'])
     click_args = kwargs
     start_time = time.perf_counter()
 
     onboard_object = onboard_batch_create.onboard(config, click_args)
 
-    # Validate setup and akamai cli and cli pipeline are installed
+    # akamai cli and cli pipeline are validated with --merge-engine pipeline
     csv = click_args['csv']
-    utility_object = utility.utility()
-
-    # Validate akamai cli and cli pipeline are installed
-    cli_installed = utility_object.installedCommandCheck('akamai')
-    pipeline_installed = utility_object.executeCommand(['akamai', 'pipeline'])
-
-    if not (pipeline_installed and (cli_installed or pipeline_installed)):
-        sys.exit()
+    utility_object = utility.utility(config.merge_engine)
 
     # If groupId, contractId or productId is missing, list them
     if click_args['group'] is None:
@@ -605,39 +662,41 @@ def batch_create(config, **kwargs):
         logger.warning(f'Product ID is required.  Running akamai property manager cli command: {command}')
         sys.exit(os.system(command))
 
-    utility_papi_object = utility_papi.papiFunctions()
-    utility_waf_object = utility_waf.wafFunctions()
+    utility_papi_object = utility_papi.papiFunctions(poll_strategy=config.poll_strategy)
+    utility_waf_object = utility_waf.wafFunctions(poll_strategy=config.poll_strategy)
 
     # Determine necessary execution steps
     steps_object = steps.executionSteps()
 
+    # every completed step is journaled so an interrupted run can continue with --resume <run id>
+    journal_dir = os.path.join(get_cache_dir(), 'onboard-runs')
+    if click_args['resume']:
+        journal = run_journal.RunJournal.resume(journal_dir, click_args['resume'])
+    else:
+        journal = run_journal.RunJournal(journal_dir)
+
     # validate setup steps when csv input provided
     utility_object.csv_validator(onboard_object, csv)
-    utility_object.csv_2_property_dict(onboard_object)
-    utility_object.validateSetupStepsCSV(onboard_object, wrapper_object, cli_mode='batch-create')
+    utility_object.validateSetupStepsCSV(onboard_object, wrapper_object, cli_mode='batch-create', journal=journal)
 
     # Got this far, we are ready to try and execute the actual steps
     if utility_object.valid is True:
+        logger.warning(f'Run id {journal.run_id}, if interrupted continue with --resume {journal.run_id}')
 
-        # create new cpcode for each hostname
-        cpcodeList = {}
-        for hostname in onboard_object.public_hostnames:
-            if not click_args['use_cpcode']:
-                cpcode = utility_papi_object.create_new_cpcode(onboard_object,
-                                                            wrapper_object,
-                                                            hostname,
-                                                            onboard_object.contract_id,
-                                                            onboard_object.group_id,
-                                                            onboard_object.product_id)
-            else:
-                cpcode = int(click_args['use_cpcode'])
-            cpcodeList[hostname] = cpcode
         # build dictonary of json rule trees based on hostnames/property names from csv input
-        propertyJson, hostnameList = utility_object.csv_2_property_array(config, onboard_object, cpcodeList)
-        onboard_object.public_hostnames = hostnameList
-
-        # create new properties based on json rule tree dictionary
-        propertyIdDict = utility_papi_object.batch_create_update_pm(config, onboard_object, wrapper_object, utility_object, propertyJson, cpcodeList)
+        propertyJson, hostnameList = utility_object.csv_2_property_array(config, onboard_object)
+
+        # create cpcodes and properties based on json rule tree dictionary
+        propertyIdDict, failed_properties = utility_papi_object.batch_create_update_pm(config, onboard_object, wrapper_object,
+                                                                                       utility_object, propertyJson,
+                                                                                       use_cpcode=click_args['use_cpcode'],
+                                                                                       workers=click_args['workers'],
+                                                                                       journal=journal)
+        if len(propertyIdDict) == 0:
+            sys.exit(logger.error('Unable to create any property'))
+        elif failed_properties:
+            logger.info('Proceeding with properties that were successfully created')
+        onboard_object.public_hostnames = [hostname for property in propertyIdDict for hostname in property['hostnames']]
 
         # activate to staging if required
         if onboard_object.activate_property_staging:
@@ -648,7 +707,8 @@ def batch_create(config, **kwargs):
                                                     version=1,
                                                     network='STAGING',
                                                     emailList=onboard_object.notification_emails,
-                                                    notes='Onboard CLI Activation')
+                                                    notes='Onboard CLI Activation',
+                                                    journal=journal)
             # check to see if any activations failed
             if (len(failed_activations) > 0) or (activation_status is False):
                 logger.error('Unable to activate property to staging network')
@@ -725,7 +785,8 @@ def batch_create(config, **kwargs):
                                                         version=1,
                                                         network='PRODUCTION',
                                                         emailList=onboard_object.notification_emails,
-                                                        notes='Onboard CLI Activation')
+                                                        notes='Onboard CLI Activation',
+                                                        journal=journal)
         else:
             logger.info('Activate Property Production: SKIPPING')
 
@@ -765,29 +826,22 @@ def appsec_update(config, **kwargs):
     Add additional hostnames and optionally add to policy match target
     """
     logger.info('Start Akamai CLI onboard')
+    import utility
+    import utility_waf
     _, wrapper_object = init_config(config)
-    util = utility.utility()
+    util = utility.utility(config.merge_engine)
     click_args = kwargs
 
     onboard_object = onboard_appsec_update.onboard(click_args)
 
-    # Validate setup and akamai cli and cli pipeline are installed
     csv = click_args['csv']
 
-    # Validate akamai cli and cli pipeline are installed
-    cli_installed = util.installedCommandCheck('akamai')
-    pipeline_installed = util.executeCommand(['akamai', 'pipeline'])
-
-    if not (pipeline_installed and (cli_installed or pipeline_installed)):
-        sys.exit()
-
     # validate setup steps when csv input provided
     util.csv_validator_appsec(onboard_object, csv)
-    util.csv_2_appsec_array(onboard_object)
     util.validateAppsecSteps(onboard_object, wrapper_object, cli_mode='appsec-update')
 
     if util.valid is True:
-        utility_waf_object = utility_waf.wafFunctions()
+        utility_waf_object = utility_waf.wafFunctions(poll_strategy=config.poll_strategy)
         # First create new WAF configuration version
         logger.debug(f'Trying to create new version for WAF configuration: {onboard_object.waf_config_name}')
         create_waf_version = utility_waf_object.createWafVersion(wrapper_object, onboard_object, notes=onboard_object.version_notes)
@@ -847,8 +901,10 @@ def appsec_policy(config, waf_config_name, policy_name, name_contains):
     List available security configuration policy
     """
     logger.info('Start Akamai CLI onboard')
+    import utility
+    from tabulate import tabulate
     _, wrap_api = init_config(config)
-    util = utility.utility()
+    util = utility.utility(config.merge_engine)
     config_id, version, df = util.validate_waf_config_name(wrap_api, waf_config_name)
     if not waf_config_name:
         logger.warning('WAF Security Configuration')
@@ -881,29 +937,22 @@ def appsec_remove(config, **kwargs):
     Remove hostnames from selected hosts and any policy match targets
     """
     logger.info('Start Akamai CLI onboard')
+    import utility
+    import utility_waf
     _, wrapper_object = init_config(config)
-    util = utility.utility()
+    util = utility.utility(config.merge_engine)
     click_args = kwargs
 
     onboard_object = onboard_appsec_update.onboard(click_args)
 
-    # Validate setup and akamai cli and cli pipeline are installed
     csv = click_args['csv']
 
-    # Validate akamai cli and cli pipeline are installed
-    cli_installed = util.installedCommandCheck('akamai')
-    pipeline_installed = util.executeCommand(['akamai', 'pipeline'])
-
-    if not (pipeline_installed and (cli_installed or pipeline_installed)):
-        sys.exit()
-
     # validate setup steps when csv input provided
-    util.csv_validator_appsec(onboard_object, csv)
-    util.csv_2_appsec_array(onboard_object, delete=True)
+    util.csv_validator_appsec(onboard_object, csv, delete=True)
     util.validateAppsecSteps(onboard_object, wrapper_object, cli_mode='appsec-remove')
 
     if util.valid is True:
-        utility_waf_object = utility_waf.wafFunctions()
+        utility_waf_object = utility_waf.wafFunctions(poll_strategy=config.poll_strategy)
         # First create new WAF configuration version
         logger.debug(f'Trying to create new version for WAF configuration: {onboard_object.waf_config_name}')
         create_waf_version = utility_waf_object.createWafVersion(wrapper_object, onboard_object, notes=onboard_object.version_notes)
@@ -924,28 +973,32 @@ def appsec_remove(config, **kwargs):
             logger.error('Unable to remove selected hosts to WAF Configuration')
             exit(-1)
 
-        all_match_targets = wrapper_object.getAllWebMatchTargets(onboard_object.config_id, onboard_object.onboard_waf_config_version)
+        index = utility_waf_object.match_target_index(wrapper_object, onboard_object.config_id, onboard_object.onboard_waf_config_version)
+        policies = wrapper_object.get_waf_policy_update(onboard_object.config_id, onboard_object.onboard_waf_config_version)
+        hostnames_by_target = index.targets_with(onboard_object.hostname_list)
         # Update WAF match target
-        for match_target in all_match_targets:
+        for target_id in list(index.targets):
+            match_target = index.targets[target_id]
             policy_id = match_target['securityPolicy']['policyId']
-            resp = utility_waf_object.get_security_policy(wrapper_object, onboard_object.config_id, onboard_object.onboard_waf_config_version, policy_id)
-            policy_name = resp['policyName']
-            policy_name = f"'{policy_name}/{match_target['securityPolicy']['policyId']}'"
+            if policy_id not in policies:
+                resp = utility_waf_object.get_security_policy(wrapper_object, onboard_object.config_id, onboard_object.onboard_waf_config_version, policy_id)
+                policies[policy_id] = [resp['policyName']]
+            policy_name = f"'{policies[policy_id][0]}/{policy_id}'"
 
             if match_target.get('hostnames', False):
-                policy_hostnames_remaining = list(filter(lambda x: x not in onboard_object.hostname_list, match_target['hostnames']))
-                policy_hostnames_to_remove = list(filter(lambda x: x in onboard_object.hostname_list, match_target['hostnames']))
-                logger.debug(f"Removing {len(policy_hostnames_to_remove)} hostnames from {match_target['securityPolicy']['policyId']}")
+                policy_hostnames_to_remove = set(hostnames_by_target.get(target_id, []))
+                policy_hostnames_remaining = [x for x in match_target['hostnames'] if x not in policy_hostnames_to_remove]
+                logger.debug(f'Removing {len(policy_hostnames_to_remove)} hostnames from {policy_id}')
                 logger.debug(policy_hostnames_to_remove)
                 removed_hostnames = len(match_target['hostnames']) - len(policy_hostnames_remaining)
                 if removed_hostnames == 0:
-                    logger.debug(f"Website Match Targets {match_target['securityPolicy']['policyId']}: No hostnames found to removed")
+                    logger.debug(f'Website Match Targets {policy_id}: No hostnames found to removed')
                 else:
                     modify_matchtarget = utility_waf_object.updateMatchTargetRemoveHosts(wrapper_object,
                                                                                          policy_hostnames_remaining,
                                                                                          onboard_object.config_id,
                                                                                          onboard_object.onboard_waf_config_version,
-                                                                                         match_target['targetId'])
+                                                                                         target_id)
                     if modify_matchtarget:
                         logger.info(f'WAF Configuration Match Target {policy_name}: Successfully removed {removed_hostnames} hostnames')
                     else:
@@ -980,8 +1033,9 @@ class Fake:
               help='by command depends on data in CSV input file.     Options: hostname, propertyname')
 @click.option('--email', metavar='', required=False, help='email for activation notifications')
 @click.option('--version-notes', 'note', metavar='', default='Onboard CLI Activation', help='config version notes')
+@click.option('--workers', metavar='', type=click.IntRange(min=1), default=1, show_default=True, help='number of security configurations to create concurrently', required=False)
 @pass_config
-def appsec_create(config, contract_id, group_id, by, activate, csv, email, note):
+def appsec_create(config, contract_id, group_id, by, activate, csv, email, note, workers):
     """
     \b
     Batch create new security configuration, security policy, and policy match target
@@ -996,9 +1050,13 @@ def appsec_create(config, contract_id, group_id, by, activate, csv, email, note)
       Option 2 by propertyname:       Headers contain propertyname,waf_config_name,waf_policy_name,hostname
     """
     logger.info('Start Akamai CLI onboard')
-    _, wrap_api = init_config(config)
-    util = utility.utility()
-    util_waf = utility_waf.wafFunctions()
+    import utility
+    import utility_waf
+    from tabulate import tabulate
+    from worker_pool import run_in_pool
+    _, wrap_api = init_config(config, workers=workers)
+    util = utility.utility(config.merge_engine)
+    util_waf = utility_waf.wafFunctions(poll_strategy=config.poll_strategy)
 
     appsec_main = Generic(contract_id, group_id, csv, by)
     # override default
@@ -1011,75 +1069,83 @@ def appsec_create(config, contract_id, group_id, by, activate, csv, email, note)
 
     # start onboarding security config
     if util.valid:
-
-        prev_waf_config = 0
-        appsec_onboard = []
+        # policies of one security configuration share its version, so every waf_config_name is one unit of work,
+        # units run concurrently and the policies inside a unit run one after another in csv order
+        units = {}
         for i in show_df.index:
-            # populate property onboard data
-            waf_config = show_df['waf_config_name'][i]
-            policy = show_df['policy'][i]
-            public_hostnames = show_df['hostname'][i]
-            logger.debug(f'{waf_config} {policy} {public_hostnames}')
-            onboard = Property(contract_id, group_id, waf_config, policy)
-            onboard.version_notes = note
-            if len(public_hostnames) > 0:
-                onboard.public_hostnames = public_hostnames
-                if by == 'propertyname':
-                    onboard.waf_target_hostnames = show_df['waf_target_hostname'][i]
-
-            # validate hostnames and remove invalid hostnames
-            invalid_hostnames = list({x for x in onboard.public_hostnames if x not in selectable_hostnames})
-            if len(invalid_hostnames) > 1:
-                onboard.public_hostnames = list(filter(lambda x: x not in invalid_hostnames, onboard.public_hostnames))
-                if len(onboard.public_hostnames) == 0:
-                    logger.warning(f'Web security configuration {waf_config} - SKIPPING')
-                    logger.info(f'{invalid_hostnames} are not selectable hostnames')
-                    break
-                if invalid_hostnames and len(onboard.public_hostnames) > 0:
+            units.setdefault(show_df['waf_config_name'][i], []).append(i)
+
+        def create_unit(waf_config: str) -> AppSec | None:
+            policies = []
+            for i in units[waf_config]:
+                # populate property onboard data
+                policy = show_df['policy'][i]
+                public_hostnames = show_df['hostname'][i]
+                logger.debug(f'{waf_config} {policy} {public_hostnames}')
+                onboard = Property(contract_id, group_id, waf_config, policy)
+                onboard.version_notes = note
+                if len(public_hostnames) > 0:
+                    onboard.public_hostnames = public_hostnames
+                    if by == 'propertyname':
+                        onboard.waf_target_hostnames = show_df['waf_target_hostname'][i]
+
+                # validate hostnames and remove invalid hostnames
+                invalid_hostnames = list({x for x in onboard.public_hostnames if x not in selectable_hostnames})
+                if invalid_hostnames:
+                    onboard.public_hostnames = list(filter(lambda x: x not in invalid_hostnames, onboard.public_hostnames))
+                    if len(onboard.public_hostnames) == 0:
+                        logger.warning(f'Web security configuration {waf_config} policy {policy} - SKIPPING')
+                        logger.info(f'{invalid_hostnames} are not selectable hostnames')
+                        continue
                     logger.warning(f'{invalid_hostnames} are not selectable hostnames for {waf_config}')
-
-            # start onboarding security config
-            if waf_config != prev_waf_config:
-                if util_waf.create_waf_config(wrap_api, onboard):
-                    prev_waf_config_id = onboard.onboard_waf_config_id
-                    prev_waf_config_version = onboard.onboard_waf_config_version
-                    prev_waf_config = waf_config
-                    if activate:
-                        # popolate AppSec data
-                        appsec = AppSec(waf_config, onboard.onboard_waf_config_id, onboard.onboard_waf_config_version, [email])
-                        appsec.version_notes = note
-                        appsec_onboard.append(appsec)
-                else:
-                    sys.exit(logger.error('Fail to create waf config'))
-            else:
-                # add hostnames to new policy
-                onboard.onboard_waf_config_id = prev_waf_config_id
-                onboard.onboard_waf_config_version = prev_waf_config_version
-                output = []
-                for hostname in onboard.public_hostnames:
-                    member = {}
-                    member['hostname'] = hostname
-                    output.append(member)
-                payload = {}
-                payload['hostnameList'] = output
-                payload['mode'] = 'append'
-                logger.debug(output)
-                resp = wrap_api.modifyWafHosts(onboard.onboard_waf_config_id, onboard.onboard_waf_config_version, json.dumps(payload))
-                if not resp.ok:
-                    logger.error(resp.json())
-
-            if util_waf.create_waf_policy(wrap_api, onboard):
+                policies.append(onboard)
+
+            if not policies:
+                return None
+
+            # first policy creates the security config, the hostnames of the next ones are selected with one call
+            created = policies[0]
+            if not util_waf.create_waf_config(wrap_api, created):
+                sys.exit(logger.error(f'Fail to create waf config {waf_config}'))
+            selected_hosts = util_waf.selected_hosts_of(wrap_api)
+            selected_hosts.created(created.onboard_waf_config_id, created.onboard_waf_config_version, created.public_hostnames)
+            for onboard in policies[1:]:
+                onboard.onboard_waf_config_id = created.onboard_waf_config_id
+                onboard.onboard_waf_config_version = created.onboard_waf_config_version
+            selected_hosts.add(created.onboard_waf_config_id, created.onboard_waf_config_version,
+                               [hostname for onboard in policies[1:] for hostname in onboard.public_hostnames])
+
+            for onboard in policies:
+                if not util_waf.create_waf_policy(wrap_api, onboard):
+                    sys.exit(logger.error(f'Fail to create waf policy {onboard.policy_name}'))
                 if by == 'propertyname':
-                    if util_waf.create_waf_match_target(wrap_api, onboard, onboard.waf_target_hostnames):
-                        pass
+                    util_waf.create_waf_match_target(wrap_api, onboard, onboard.waf_target_hostnames)
                 else:
-                    if util_waf.create_waf_match_target(wrap_api, onboard):
-                        pass
-            else:
-                sys.exit(logger.error('Fail to create waf policy'))
+                    util_waf.create_waf_match_target(wrap_api, onboard)
+
+            appsec = AppSec(waf_config, created.onboard_waf_config_id, created.onboard_waf_config_version, [email])
+            appsec.version_notes = note
+            return appsec
+
+        if workers > 1:
+            logger.warning(f'Creating {len(units)} security configurations using {workers} workers')
+        appsec_onboard, failed_configs = [], []
+        for waf_config, appsec, error in run_in_pool(create_unit, list(units), workers):
+            if error is not None:
+                failed_configs.append([waf_config, error])
+            elif appsec is not None and activate:
+                appsec_onboard.append(appsec)
+
+        if failed_configs:
+            print()
+            logger.error(f'Unable to create {len(failed_configs)} of {len(units)} security configurations')
+            logger.error(f"\n{tabulate(failed_configs, headers=['waf_config_name', 'error'], tablefmt='psql')}")
+            if len(failed_configs) == len(units):
+                sys.exit(1)
+            logger.info('Proceeding with security configurations that were successfully created')
 
         # activating
-        if activate:
+        if activate and appsec_onboard:
             time.sleep(5)
             util_waf.activate_and_poll(wrap_api, appsec_onboard, activate)
         util.log_cli_timing()
@@ -1093,9 +1159,10 @@ def get_prog_name():
 
 
 def get_cache_dir():
+    # same default as the akamai cli, so the metadata cache and run journals never land in the working folder
     if os.getenv('AKAMAI_CLI_CACHE_DIR'):
         return os.getenv('AKAMAI_CLI_CACHE_DIR')
-    return os.curdir
+    return os.path.expanduser(os.path.join('~', '.akamai-cli', 'cache'))
 
 
 def load_json(file):
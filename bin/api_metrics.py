@@ -0,0 +1,186 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import contextlib
+import datetime
+import functools
+import json
+import math
+import re
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from exceptions import setup_logger
+from tabulate import tabulate
+
+logger = setup_logger()
+
+# ids in api paths, prp_123 -> {prp}, 123 -> {id}
+PREFIXED_ID = re.compile(r'^([a-z]{2,4})_[A-Za-z0-9\-]+$')
+NUMERIC_ID = re.compile(r'^\d+$')
+
+
+def endpoint_template(url: str) -> str:
+    """
+    /papi/v1/properties/prp_1/versions/3/rules?contractId=ctr_1 -> /papi/v1/properties/{prp}/versions/{id}/rules
+    """
+    segments = []
+    for segment in urlparse(url).path.split('/'):
+        match = PREFIXED_ID.match(segment)
+        if match:
+            segment = f'{{{match.group(1)}}}'
+        elif NUMERIC_ID.match(segment):
+            segment = '{id}'
+        segments.append(segment)
+    return '/'.join(segments)
+
+
+def percentile(values: list, pct: float) -> float:
+    """
+    nearest-rank percentile of values, values must be sorted
+    """
+    if not values:
+        return 0.0
+    return values[max(math.ceil(pct / 100 * len(values)) - 1, 0)]
+
+
+class StageTimer:
+    """
+    Wall time spent in the named stages of a command (csv, rules, validation).
+
+    A stage entered again while it is already running on the same thread, build_origin_rule
+    inside csv_2_property_array for example, is only counted once.
+    """
+    def __init__(self):
+        self.stages = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        active = self._local.__dict__.setdefault('active', set())
+        if name in active:
+            yield
+            return
+        active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            active.discard(name)
+            with self._lock:
+                calls, seconds = self.stages.get(name, (0, 0.0))
+                self.stages[name] = (calls + 1, seconds + time.perf_counter() - start)
+
+    def timed(self, name: str):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {name: {'calls': calls, 'seconds': round(seconds, 3)} for name, (calls, seconds) in self.stages.items()}
+
+
+stages = StageTimer()
+timed = stages.timed
+
+
+class ApiMetrics:
+    """
+    Thread safe record of every API call made by a command.
+
+    One entry per call: endpoint template, method, status, latency (including retries), retries and response bytes.
+    """
+    def __init__(self):
+        self.calls = []
+        self.start = time.perf_counter()
+        self.started = datetime.datetime.now()
+        self._lock = threading.Lock()
+
+    def record(self, method: str, url: str, status: int | None, latency: float,
+               retries: int = 0, size: int = 0) -> None:
+        call = {'endpoint': endpoint_template(url),
+                'method': method.upper(),
+                'status': status,
+                'latency': latency,
+                'retries': retries,
+                'bytes': size}
+        with self._lock:
+            self.calls.append(call)
+
+    def summary(self) -> list:
+        """
+        one row per method + endpoint, slowest total time first
+        """
+        groups = {}
+        with self._lock:
+            for call in self.calls:
+                groups.setdefault((call['method'], call['endpoint']), []).append(call)
+
+        rows = []
+        for (method, endpoint), calls in groups.items():
+            latencies = sorted(call['latency'] for call in calls)
+            rows.append({'method': method,
+                         'endpoint': endpoint,
+                         'calls': len(calls),
+                         'errors': sum(1 for call in calls if call['status'] is None or call['status'] >= 400),
+                         'retries': sum(call['retries'] for call in calls),
+                         'bytes': sum(call['bytes'] for call in calls),
+                         'total': round(sum(latencies), 3),
+                         'p50': round(percentile(latencies, 50), 3),
+                         'p95': round(percentile(latencies, 95), 3),
+                         'max': round(latencies[-1], 3)})
+        return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+    def print_table(self) -> None:
+        columns = ['method', 'endpoint', 'calls', 'errors', 'retries', 'bytes', 'total', 'p50', 'p95', 'max']
+        headers = ['method', 'endpoint', 'calls', 'errors', 'retries', 'bytes', 'total (s)', 'p50 (s)', 'p95 (s)', 'max (s)']
+        print()
+        print(tabulate([[row[column] for column in columns] for row in self.summary()], headers=headers, tablefmt='psql'))
+
+    def write_json(self, command: str | None = None, folder: str = 'logs') -> str:
+        file = Path(folder, f"api_metrics_{self.started.strftime('%Y%m%d-%H%M%S')}.json")
+        report = {'command': command,
+                  'started': self.started.isoformat(),
+                  'duration': round(time.perf_counter() - self.start, 3),
+                  'calls': len(self.calls),
+                  'stages': stages.summary(),
+                  'endpoints': self.summary()}
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with file.open('w') as f:
+            json.dump(report, f, indent=4)
+        return str(file)
+
+    def report(self, command: str | None = None) -> None:
+        """
+        Function to print the per endpoint latency table and save it under logs/, called when a command ends
+        """
+        if not self.calls:
+            return
+        self.print_table()
+        if stages.stages:
+            logger.info('Stages: ' + ', '.join(f"{name} {detail['seconds']}s" for name, detail in stages.summary().items()))
+        try:
+            file = self.write_json(command)
+            logger.info(f'API call metrics: {file}')
+        except OSError as e:
+            logger.debug(f'unable to write API call metrics {e}')
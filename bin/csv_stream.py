@@ -0,0 +1,65 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import csv
+import sys
+from collections.abc import Iterator
+
+from csv_validation import CsvCheck
+from exceptions import setup_logger
+
+logger = setup_logger()
+
+# columns the commands read, surrounding whitespace is dropped from their values, other columns are kept as is
+STRIPPED_COLUMNS = ('hostname', 'origin', 'propertyName', 'forwardHostHeader', 'edgeHostname', 'matchTargetId')
+
+
+def normalize(row: dict) -> dict:
+    """
+    Strip whitespace around column names and around the values of STRIPPED_COLUMNS
+    """
+    row = {(k.strip() if isinstance(k, str) else k): v for k, v in row.items()}
+    for column in STRIPPED_COLUMNS:
+        if isinstance(row.get(column), str):
+            row[column] = row[column].strip()
+    return row
+
+
+def read_rows(csv_file_loc: str, check: CsvCheck) -> Iterator[dict]:
+    """
+    Single pass over a csv file with a header row.
+
+    Every row is normalized, validated and counted by check as it is read and then handed to the consumer,
+    so validation, stats and grouping share one read and the input is never held in memory.
+    Missing trailing cells are empty. No rows are yielded when a required column is missing.
+    """
+    try:
+        f = open(csv_file_loc, encoding='utf-8-sig', newline='')
+    except FileNotFoundError:
+        sys.exit(logger.error(f'{csv_file_loc}...........missing'))
+    with f:
+        reader = csv.DictReader(f, restval='')
+        try:
+            if reader.fieldnames is None:
+                sys.exit(logger.error(f'{csv_file_loc} is not a valid csv file: no header row'))
+            check.header([column.strip() for column in reader.fieldnames])
+            if check.missing:
+                return
+            for row in reader:
+                row = normalize(row)
+                check.row(row)
+                yield row
+        except csv.Error as e:
+            sys.exit(logger.error(f'{csv_file_loc} is not a valid csv file: {e}'))
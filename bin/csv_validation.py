@@ -0,0 +1,152 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import re
+
+from exceptions import setup_logger
+from tabulate import tabulate
+
+logger = setup_logger()
+
+# rows shown in the error report, the count of the remaining errors is logged
+MAX_REPORT_ROWS = 500
+# property hostnames only, security configuration hostnames may be wildcards like *.example.com
+HOSTNAME_INVALID_CHARS = re.compile(r'[^.\-a-zA-Z0-9]')
+# DNS limits, 253 characters in total and 63 per label
+HOSTNAME_MAX_LENGTH = 253
+LABEL_TOO_LONG = re.compile(r'[^.]{64}')
+
+BATCH_CREATE = {'required': ['hostname', 'origin'],
+                'hostname': 'hostname',
+                'allowed': {'forwardHostHeader': ['REQUEST_HOST_HEADER', 'ORIGIN_HOSTNAME']},
+                'suffix': {'edgeHostname': ('.edgekey.net', '.edgesuite.net')}}
+# secure by default edge hostnames are created on activation, validateSetupStepsCSV only warns about the suffix
+BATCH_CREATE_SBD = {rule: value for rule, value in BATCH_CREATE.items() if rule != 'suffix'}
+
+APPSEC_UPDATE = {'required': ['hostname'],
+                 'digits': ['matchTargetId']}
+
+
+def hostname_value_errors(hostname: str) -> list:
+    """
+    Function to check one property hostname for characters, length and leading/trailing hyphen
+    """
+    errors = []
+    if HOSTNAME_INVALID_CHARS.search(hostname):
+        errors.append('invalid character, only alphanumeric (a-z, A-Z, 0-9), dot and hyphen (-) are supported')
+    if len(hostname) > HOSTNAME_MAX_LENGTH:
+        errors.append(f'invalid length, at most {HOSTNAME_MAX_LENGTH} characters')
+    if LABEL_TOO_LONG.search(hostname):
+        errors.append('invalid length, at most 63 characters between dots')
+    if hostname.startswith('-') or hostname.endswith('-'):
+        errors.append('cannot begin or end with a hyphen')
+    return errors
+
+
+class CsvCheck:
+    """
+    Validation and stats of one csv, fed the header and then one row at a time.
+
+    Errors are numbered like the csv data rows, starting at 1, header errors are row 0.
+    Only the first MAX_REPORT_ROWS errors are kept, the others are counted,
+    so memory grows with the distinct hostnames and property names only.
+    """
+    def __init__(self, rules: dict):
+        self.rules = rules
+        self.errors = []
+        self.error_count = 0
+        self.rows = 0
+        self.invalid_rows = 0
+        self.missing = []
+        self.hostnames = set()
+        self.properties = set()
+
+    def add_error(self, row: int, column: str, value: str, error: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORT_ROWS:
+            self.errors.append({'row': row, 'column': column, 'value': value, 'error': error})
+
+    def header(self, columns: list) -> None:
+        self.missing = [column for column in self.rules.get('required', []) if column not in columns]
+        for column in self.missing:
+            self.add_error(0, column, '', 'missing header')
+
+    def row(self, row: dict) -> None:
+        self.rows += 1
+        rules = self.rules
+        errors = []
+        for column in rules.get('required', []):
+            if column not in self.missing and row[column] == '':
+                errors.append((column, '', 'empty value'))
+
+        hostname = row.get('hostname', '')
+        column = rules.get('hostname')
+        if column and row.get(column, ''):
+            errors.extend((column, row[column], error) for error in hostname_value_errors(row[column]))
+            if row[column] in self.hostnames:
+                errors.append((column, row[column], 'duplicate hostname'))
+        if hostname:
+            self.hostnames.add(hostname)
+        if row.get('propertyName', ''):
+            self.properties.add(row['propertyName'])
+
+        for column, allowed in rules.get('allowed', {}).items():
+            if row.get(column, '') and row[column] not in allowed:
+                errors.append((column, row[column], f'must be one of {", ".join(allowed)}'))
+        for column, suffixes in rules.get('suffix', {}).items():
+            if row.get(column, '') and not row[column].endswith(suffixes):
+                errors.append((column, row[column], f'must end with {" or ".join(suffixes)}'))
+        for column in rules.get('digits', []):
+            if row.get(column, '') and not row[column].isdigit():
+                errors.append((column, row[column], 'must be a number'))
+
+        if errors:
+            self.invalid_rows += 1
+        for column, value, error in sorted(errors, key=lambda error: error[0]):
+            self.add_error(self.rows, column, value, error)
+
+    def summary(self) -> str:
+        msg = f'{self.rows} rows'
+        if self.hostnames:
+            msg = f'{msg}, {len(self.hostnames)} hostnames'
+        if self.properties:
+            msg = f'{msg}, {len(self.properties)} properties'
+        if self.invalid_rows:
+            msg = f'{msg}, {self.invalid_rows} invalid rows'
+        return msg
+
+
+def check_hostnames(hostnames, column: str = 'hostname') -> CsvCheck:
+    """
+    Function to check property hostname characters, length, leading/trailing hyphen and duplicates
+    """
+    check = CsvCheck({'hostname': column})
+    for hostname in hostnames:
+        check.row({column: str(hostname)})
+    return check
+
+
+def report(errors: list, error_count: int | None = None) -> None:
+    """
+    Function to print every validation error as one table instead of a log line per row
+    """
+    error_count = len(errors) if error_count is None else error_count
+    if not error_count:
+        return
+    shown = [{**error, 'row': error['row'] if error['row'] > 0 else 'header'} for error in errors[:MAX_REPORT_ROWS]]
+    print(tabulate(shown, headers='keys', tablefmt='psql'))
+    if error_count > len(shown):
+        logger.error(f'{error_count - len(shown)} more validation errors not shown')
+    logger.error(f'{error_count} validation errors')
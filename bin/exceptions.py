@@ -13,8 +13,10 @@ Copyright 2022 Akamai Technologies, Inc. All Rights Reserved.
 """
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import logging.config
 import os
 import shutil
 import time
@@ -23,7 +25,11 @@ from pathlib import Path
 import coloredlogs
 
 
-def setup_logger():
+@functools.cache
+def configure_logging() -> None:
+    """
+    Function to set up logging once per process, later calls are no-ops
+    """
     # Create folders and copy config json when running via Akamai CLI
     Path('logs').mkdir(parents=True, exist_ok=True)
     Path('config').mkdir(parents=True, exist_ok=True)
@@ -48,9 +54,15 @@ def setup_logger():
         log_cfg = json.load(f)
     logging.config.dictConfig(log_cfg)
     logging.Formatter.converter = time.gmtime
-    logger = logging.getLogger(__name__)
-    coloredlogs.install(logger=logger, fmt='%(levelname)-7s: %(message)s')
-    return logger
+    coloredlogs.install(logger=logging.getLogger(__name__), fmt='%(levelname)-7s: %(message)s')
+
+
+def setup_logger() -> logging.Logger:
+    """
+    Function to get the cli logger, called at module level by every module
+    """
+    configure_logging()
+    return logging.getLogger(__name__)
 
 
 def get_cli_root_directory():
@@ -0,0 +1,130 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import threading
+
+from exceptions import setup_logger
+from worker_pool import run_in_pool
+
+logger = setup_logger()
+
+EDGE_HOSTNAME_ZONES = ('edgekey.net', 'edgesuite.net')
+PROPERTY_SEARCH_WORKERS = 8
+SEARCH_ATTEMPTS = 2
+
+
+class EdgeHostnameIndex:
+    """
+    In-memory index of the account's edge hostnames.
+
+    Each dnsZone is listed once, the first time a hostname in that zone is looked up,
+    after that every lookup is a dict hit keyed by (recordName, dnsZone).
+    """
+    def __init__(self, wrapper_object):
+        self.wrapper_object = wrapper_object
+        self.zones = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def split(edge_hostname: str) -> tuple[str, str]:
+        edge_hostname = str(edge_hostname)
+        for dns_zone in EDGE_HOSTNAME_ZONES:
+            if edge_hostname.endswith(f'.{dns_zone}'):
+                return edge_hostname[:-len(dns_zone) - 1], dns_zone
+        return edge_hostname, ''
+
+    def load_zone(self, dns_zone: str) -> dict | None:
+        with self._lock:
+            if dns_zone not in self.zones:
+                resp = self.wrapper_object.listEdgeHostnames(dns_zone)
+                if resp.status_code == 200:
+                    ehns = resp.json()['edgeHostnames']
+                    self.zones[dns_zone] = {(ehn['recordName'], ehn['dnsZone']): ehn['edgeHostnameId'] for ehn in ehns}
+                    logger.debug(f'{dns_zone:<20} {len(ehns)} edge hostnames indexed')
+                else:
+                    logger.debug(f'{dns_zone:<20} unable to list edge hostnames {resp.status_code}')
+                    self.zones[dns_zone] = None
+            return self.zones[dns_zone]
+
+    def get(self, edge_hostname: str) -> int:
+        """
+        Return edgeHostnameId or 0 when the hostname is not in the index,
+        callers fall back to the per-hostname query for a miss
+        """
+        record_name, dns_zone = self.split(edge_hostname)
+        if not dns_zone:
+            return 0
+        zone = self.load_zone(dns_zone)
+        if not zone:
+            return 0
+        return zone.get((record_name, dns_zone), 0)
+
+    def add(self, edge_hostname: str, ehn_id: int) -> None:
+        record_name, dns_zone = self.split(edge_hostname)
+        with self._lock:
+            if self.zones.get(dns_zone) is not None:
+                self.zones[dns_zone][(record_name, dns_zone)] = ehn_id
+
+
+class PropertyNameIndex:
+    """
+    name -> property versions (find-by-value items) for a set of property names.
+
+    All names are searched in one pass through a bounded pool instead of
+    one property_exists() plus one get_property_id() call per name.
+    A name that does not exist maps to None. A failed search is retried once,
+    then logged and kept in `errors`, it is never cached as "does not exist".
+    """
+    def __init__(self, wrapper_object, workers: int = PROPERTY_SEARCH_WORKERS):
+        self.wrapper_object = wrapper_object
+        self.workers = workers
+        self.properties = {}
+        self.errors = {}
+
+    def search(self, property_name: str) -> list:
+        resp = self.wrapper_object.search_property_name(property_name)
+        resp.raise_for_status()
+        return resp.json()['versions']['items']
+
+    def resolve(self, property_names) -> dict:
+        pending = [name for name in dict.fromkeys(property_names) if name not in self.properties]
+        for attempt in range(SEARCH_ATTEMPTS):
+            failed = {}
+            for name, versions, error in run_in_pool(self.search, pending, self.workers):
+                if error:
+                    logger.debug(f'{name:<50} property search failed, attempt {attempt + 1}: {error}')
+                    failed[name] = error
+                else:
+                    self.properties[name] = versions if versions else None
+                    self.errors.pop(name, None)
+            pending = list(failed)
+            if not pending:
+                break
+        for name, error in failed.items():
+            logger.error(f'{name:<50} unable to search property name: {error}')
+            self.errors[name] = error
+        return {name: self.properties.get(name) for name in property_names}
+
+    def exists(self, property_name: str) -> bool:
+        return self.get_property_id(property_name) is not None
+
+    def get_property_id(self, property_name: str) -> list | None:
+        """
+        Same return value as apiCallsWrapper.get_property_id, served from the index,
+        a name whose search failed is not searched again
+        """
+        if property_name in self.errors:
+            return None
+        return self.resolve([property_name])[property_name]
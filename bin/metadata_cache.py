@@ -0,0 +1,105 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from exceptions import setup_logger
+
+logger = setup_logger()
+
+DEFAULT_TTL = 3600
+
+
+class ApiResponse:
+    """
+    Minimal look-alike of requests.Response for cached responses,
+    supports the attributes used by callers of the wrapper
+    """
+    def __init__(self, status_code: int, content: bytes, url: str, response_headers: dict | None = None):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.headers = response_headers if response_headers is not None else {}
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class MetadataCache:
+    """
+    On-disk cache of slowly changing GET responses (groups, products, WAF configs, selectable hostnames).
+
+    Entries live under <cache_dir>/onboard-metadata/<edgerc section + account key>/<family>/
+    and expire after ttl seconds. A family is dropped as soon as this CLI changes what it describes.
+    """
+    def __init__(self, cache_dir: str, section: str, account_key: str | None,
+                 ttl: int = DEFAULT_TTL, refresh: bool = False):
+        scope = hashlib.sha1(f'{section}|{account_key or ""}'.encode()).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, 'onboard-metadata', scope)
+        self.ttl = ttl
+        self.refresh = refresh
+
+    def entry_file(self, family: str, endpoint: str) -> str:
+        return os.path.join(self.path, family, f'{hashlib.sha1(endpoint.encode()).hexdigest()}.json')
+
+    def get(self, family: str, endpoint: str) -> ApiResponse | None:
+        if self.refresh:
+            return None
+        entry_file = self.entry_file(family, endpoint)
+        try:
+            with open(entry_file) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry['created'] > self.ttl or entry['endpoint'] != endpoint:
+            return None
+        logger.debug(f'{family:<25} cache hit {endpoint}')
+        return ApiResponse(entry['status_code'], entry['content'].encode('utf-8'), entry['url'], entry['headers'])
+
+    def put(self, family: str, endpoint: str, response) -> None:
+        if not response.ok:
+            return
+        entry = {'created': time.time(),
+                 'endpoint': endpoint,
+                 'status_code': response.status_code,
+                 'url': str(response.url),
+                 'headers': {'Content-Type': response.headers.get('Content-Type', 'application/json')},
+                 'content': response.text}
+        entry_file = self.entry_file(family, endpoint)
+        try:
+            os.makedirs(os.path.dirname(entry_file), exist_ok=True)
+            fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(entry_file), suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(temp_file, entry_file)
+        except OSError as e:
+            logger.debug(f'unable to write metadata cache {entry_file} {e}')
+
+    def invalidate(self, *families: str) -> None:
+        for family in families:
+            shutil.rmtree(os.path.join(self.path, family), ignore_errors=True)
@@ -0,0 +1,497 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import copy
+import datetime
+import glob
+import itertools
+import json
+import os
+import random
+import re
+import ssl
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import click
+from exceptions import setup_logger
+from transport import fixture_key
+
+logger = setup_logger()
+
+WAF_CONFIG_NAME = 'onboard_mock_waf'
+WAF_VERSION = r'/appsec/v1/configs/(?P<config_id>\d+)/versions/(?P<version>\d+)'
+
+
+class Activation:
+    """
+    Activation that completes `delay` seconds after it was submitted, or fails when `fail` is set
+    """
+    def __init__(self, activation_id, network: str, delay: float, fail: bool = False, **details):
+        self.activation_id = activation_id
+        self.network = network
+        self.delay = delay
+        self.fail = fail
+        self.details = details
+        self.submitted = time.time()
+
+    @property
+    def done(self) -> bool:
+        return time.time() - self.submitted >= self.delay
+
+    def finish_date(self) -> str:
+        finish = datetime.datetime.fromtimestamp(self.submitted + self.delay, tz=datetime.timezone.utc)
+        return finish.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def papi_status(self) -> str:
+        if not self.done:
+            return 'PENDING'
+        return 'ACTIVATION_ERROR' if self.fail else 'ACTIVE'
+
+    def waf_status(self) -> str:
+        if not self.done:
+            return 'RECEIVED' if time.time() - self.submitted < self.delay / 2 else 'PENDING_ACTIVATION'
+        return 'FAILED' if self.fail else 'ACTIVATED'
+
+
+class MockApi:
+    """
+    State behind the mock server.
+
+    Recorded fixtures are replayed first, in recording order for repeated calls of the same endpoint,
+    the last one repeats. Calls without a fixture go to the synthetic handlers below, which keep
+    enough state (properties, cp codes, activations) to run batch-create and the appsec commands.
+    """
+    def __init__(self, fixtures: str | None = None, activation_delay: float = 10, latency: float = 0,
+                 error_rate: float = 0, failure_rate: float = 0, hostnames: list | None = None,
+                 edge_hostnames: list | None = None):
+        self.activation_delay = activation_delay
+        self.latency = latency
+        self.error_rate = error_rate
+        self.failure_rate = failure_rate
+        self.fixtures = {}
+        self.replayed = {}
+        self.properties = {}
+        self.cpcodes = []
+        self.activations = {}
+        self.ids = itertools.count(100001)
+        self._lock = threading.Lock()
+        # hostnames the account may add to a security configuration, besides the ones added to properties
+        self.hostnames = set(hostnames or [])
+        # (recordName, dnsZone) -> edgeHostnameId of the edge hostnames on the account
+        self.edge_hostname_ids = {}
+        for edge_hostname in edge_hostnames or []:
+            self.add_edge_hostname(*edge_hostname.split('.', 1))
+        self.waf_configs = {}
+        self.add_waf_config(WAF_CONFIG_NAME, [])
+        if fixtures:
+            self.load_fixtures(fixtures)
+        self.routes = [
+            ('POST', r'/papi/v1/search/find-by-value', self.find_by_value),
+            ('GET', r'/papi/v1/cpcodes', self.list_cpcodes),
+            ('POST', r'/papi/v1/cpcodes', self.create_cpcode),
+            ('POST', r'/papi/v1/properties', self.create_property),
+            ('PUT', r'/papi/v1/properties/(?P<property_id>[^/]+)/versions/(?P<version>\d+)/hostnames', self.update_hostnames),
+            ('PUT', r'/papi/v1/properties/(?P<property_id>[^/]+)/versions/(?P<version>\d+)/rules', self.update_rules),
+            ('POST', r'/papi/v1/properties/(?P<property_id>[^/]+)/activations', self.activate_property),
+            ('GET', r'/papi/v1/properties/(?P<property_id>[^/]+)/activations/(?P<activation_id>[^/]+)', self.property_activation),
+            ('GET', r'/hapi/v1/edge-hostnames', self.edge_hostnames),
+            ('GET', r'/papi/v1/groups', self.groups),
+            ('GET', r'/papi/v1/products', self.products),
+            ('POST', r'/appsec/v1/activations', self.activate_waf),
+            ('GET', r'/appsec/v1/activations/(?P<activation_id>\d+)', self.waf_activation),
+            ('GET', r'/appsec/v1/configs', self.list_waf_configs),
+            ('POST', r'/appsec/v1/configs', self.create_waf_config),
+            ('GET', r'/appsec/v1/contracts/(?P<contract_id>[^/]+)/groups/(?P<group_id>[^/]+)/selectable-hostnames', self.selectable_hostnames),
+            ('GET', r'/appsec/v1/configs/(?P<config_id>\d+)/activations', self.waf_config_activations),
+            ('GET', r'/appsec/v1/configs/(?P<config_id>\d+)/versions', self.waf_versions),
+            ('POST', r'/appsec/v1/configs/(?P<config_id>\d+)/versions', self.create_waf_version),
+            ('PUT', f'{WAF_VERSION}/version-notes', self.version_notes),
+            ('GET', f'{WAF_VERSION}/selectable-hostnames', self.selectable_hostnames),
+            ('GET', f'{WAF_VERSION}/selected-hostnames', self.selected_hostnames),
+            ('PUT', f'{WAF_VERSION}/selected-hostnames', self.update_selected_hostnames),
+            ('GET', f'{WAF_VERSION}/security-policies', self.security_policies),
+            ('POST', f'{WAF_VERSION}/security-policies', self.create_security_policy),
+            ('GET', f'{WAF_VERSION}/security-policies/(?P<policy_id>[^/]+)', self.security_policy),
+            ('GET', f'{WAF_VERSION}/match-targets', self.match_targets),
+            ('POST', f'{WAF_VERSION}/match-targets', self.create_match_target),
+            ('GET', rf'{WAF_VERSION}/match-targets/(?P<target_id>\d+)', self.match_target),
+            ('PUT', rf'{WAF_VERSION}/match-targets/(?P<target_id>\d+)', self.update_match_target),
+        ]
+
+    def load_fixtures(self, folder: str) -> None:
+        for file in sorted(glob.glob(os.path.join(folder, '*.json'))):
+            with open(file) as f:
+                fixture = json.load(f)
+            self.fixtures.setdefault(fixture['key'], []).append(fixture)
+        logger.info(f'{sum(len(v) for v in self.fixtures.values())} fixtures loaded from {folder}')
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self.ids)
+
+    def replay(self, key: str) -> dict | None:
+        with self._lock:
+            fixtures = self.fixtures.get(key)
+            if not fixtures:
+                return None
+            i = self.replayed.get(key, 0)
+            self.replayed[key] = i + 1
+            return fixtures[min(i, len(fixtures) - 1)]
+
+    def handle(self, method: str, url: str, body) -> tuple:
+        """
+        (status, headers, body) for one request
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            if random.random() < 0.5:
+                return 429, {'Retry-After': '1'}, {'title': 'Too Many Requests', 'status': 429}
+            return 503, {}, {'title': 'Service Unavailable', 'status': 503}
+
+        fixture = self.replay(fixture_key(method, url))
+        if fixture is not None:
+            return fixture['status'], fixture['headers'], fixture['body']
+
+        parsed = urlparse(url)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        for route_method, pattern, handler in self.routes:
+            match = re.fullmatch(pattern, parsed.path.rstrip('/'))
+            if route_method == method and match:
+                status, payload = handler(body or {}, query, **match.groupdict())
+                return status, {}, payload
+        return 404, {}, {'title': 'Not Found', 'status': 404, 'detail': f'no fixture or mock handler for {method} {parsed.path}'}
+
+    # synthetic handlers, handler(body, query, **path parameters) -> (status, json body)
+    def find_by_value(self, body, query):
+        property_id = self.properties.get(body.get('propertyName'))
+        items = [] if property_id is None else [{'propertyName': body['propertyName'], 'propertyId': property_id,
+                                                 'propertyVersion': 1, 'contractId': query.get('contractId'),
+                                                 'groupId': query.get('groupId')}]
+        return 200, {'versions': {'items': items}}
+
+    def list_cpcodes(self, body, query):
+        with self._lock:
+            items = list(self.cpcodes)
+        return 200, {'contractId': query.get('contractId'), 'groupId': query.get('groupId'), 'cpcodes': {'items': items}}
+
+    def create_cpcode(self, body, query):
+        cpcode_id = self.next_id()
+        with self._lock:
+            self.cpcodes.append({'cpcodeId': f'cpc_{cpcode_id}', 'cpcodeName': body.get('cpcodeName'),
+                                 'productIds': [body.get('productId')]})
+        return 201, {'cpcodeLink': f"/papi/v1/cpcodes/cpc_{cpcode_id}?contractId={query.get('contractId')}&groupId={query.get('groupId')}"}
+
+    def create_property(self, body, query):
+        with self._lock:
+            if body.get('propertyName') in self.properties:
+                return 400, {'title': 'Duplicate property name', 'status': 400}
+            property_id = f'prp_{next(self.ids)}'
+            self.properties[body.get('propertyName')] = property_id
+        return 201, {'propertyLink': f"/papi/v1/properties/{property_id}?contractId={query.get('contractId')}&groupId={query.get('groupId')}"}
+
+    def update_hostnames(self, body, query, property_id, version):
+        self.hostnames.update(hostname['cnameFrom'] for hostname in body if isinstance(hostname, dict) and 'cnameFrom' in hostname)
+        return 200, {'propertyId': property_id, 'propertyVersion': int(version), 'hostnames': {'items': body}}
+
+    def update_rules(self, body, query, property_id, version):
+        return 200, {'propertyId': property_id, 'propertyVersion': int(version), 'rules': body.get('rules', {})}
+
+    def activate_property(self, body, query, property_id):
+        activation_id = f'atv_{self.next_id()}'
+        self.activations[activation_id] = Activation(activation_id, body.get('network'), self.activation_delay,
+                                                     random.random() < self.failure_rate, propertyId=property_id,
+                                                     propertyVersion=body.get('propertyVersion'))
+        return 201, {'activationLink': f'/papi/v1/properties/{property_id}/activations/{activation_id}'}
+
+    def property_activation(self, body, query, property_id, activation_id):
+        activation = self.activations.get(activation_id)
+        if activation is None:
+            return 404, {'title': 'Not Found', 'status': 404, 'detail': f'unable to locate {activation_id}'}
+        item = {'activationId': activation_id, 'network': activation.network, 'status': activation.papi_status(),
+                'estimatedFinishDate': activation.finish_date(), **activation.details}
+        if not activation.done:
+            item['fmaActivationState'] = 'steady'
+        return 200, {'activations': {'items': [item]}}
+
+    def add_edge_hostname(self, record_name: str, dns_zone: str) -> int:
+        with self._lock:
+            return self.edge_hostname_ids.setdefault((record_name, dns_zone), zlib.crc32(record_name.encode()) % 10 ** 7)
+
+    def edge_hostnames(self, body, query):
+        # a zone listing returns the account's edge hostnames in that zone,
+        # every edge hostname looked up by name exists and is listed from then on
+        dns_zone = query.get('dnsZone')
+        record_name = query.get('recordNameSubstring')
+        if record_name:
+            self.add_edge_hostname(record_name, dns_zone)
+        return 200, {'edgeHostnames': [{'edgeHostnameId': ehn_id, 'recordName': name, 'dnsZone': zone,
+                                        'securityType': 'ENHANCED-TLS'}
+                                       for (name, zone), ehn_id in sorted(self.edge_hostname_ids.items())
+                                       if zone == dns_zone and (not record_name or record_name in name)]}
+
+    def activate_waf(self, body, query):
+        activation_id = self.next_id()
+        self.activations[activation_id] = Activation(activation_id, body.get('network'), self.activation_delay,
+                                                     random.random() < self.failure_rate,
+                                                     activationConfigs=body.get('activationConfigs', []))
+        return 200, self.waf_activation({}, {}, str(activation_id))[1]
+
+    def waf_activation(self, body, query, activation_id):
+        activation = self.activations.get(int(activation_id))
+        if activation is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        submitted = datetime.datetime.fromtimestamp(activation.submitted, tz=datetime.timezone.utc)
+        return 200, {'activationId': activation.activation_id, 'action': 'ACTIVATE', 'network': activation.network,
+                     'status': activation.waf_status(), 'createDate': submitted.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                     **activation.details}
+
+    # security configurations, every version keeps its own selected hosts, policies and match targets
+    def add_waf_config(self, name: str, hostnames: list) -> dict:
+        with self._lock:
+            config_id = len(self.waf_configs) + 1
+            policy_id = f'MOCK_{next(self.ids)}'
+            target_id = next(self.ids)
+            self.waf_configs[config_id] = {
+                'id': config_id, 'name': name, 'latestVersion': 1,
+                'versions': {1: {'selected': list(hostnames),
+                                 'policies': {policy_id: f'{name}_policy'},
+                                 'targets': {target_id: {'targetId': target_id, 'type': 'website', 'sequence': 1,
+                                                         'hostnames': list(hostnames),
+                                                         'securityPolicy': {'policyId': policy_id}}},
+                                 'notes': ''}}}
+            return self.waf_configs[config_id]
+
+    def select_hostnames(self, config_id: int, hostnames: list) -> None:
+        """
+        Add hostnames to the selected hosts and first match target of the latest version of a configuration
+        """
+        config = self.waf_configs[config_id]
+        detail = config['versions'][config['latestVersion']]
+        detail['selected'] += hostnames
+        next(iter(detail['targets'].values()))['hostnames'] += hostnames
+        self.hostnames.update(hostnames)
+
+    def waf_version(self, config_id, version) -> dict | None:
+        config = self.waf_configs.get(int(config_id))
+        return config['versions'].get(int(version)) if config else None
+
+    def list_waf_configs(self, body, query):
+        return 200, {'configurations': [{'id': c['id'], 'name': c['name'], 'latestVersion': c['latestVersion'],
+                                         'productionVersion': None, 'stagingVersion': None}
+                                        for c in self.waf_configs.values()]}
+
+    def create_waf_config(self, body, query):
+        if any(c['name'] == body.get('name') for c in self.waf_configs.values()):
+            return 400, {'title': 'Duplicate configuration name', 'status': 400, 'detail': 'configuration name already in use'}
+        config = self.add_waf_config(body.get('name'), body.get('hostnames', []))
+        config['versions'][1]['policies'] = {}
+        config['versions'][1]['targets'] = {}
+        return 201, {'configId': config['id'], 'version': 1, 'name': config['name']}
+
+    def waf_config_activations(self, body, query, config_id):
+        return 200, {'activationHistory': []}
+
+    def waf_versions(self, body, query, config_id):
+        config = self.waf_configs.get(int(config_id))
+        if config is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        return 200, {'configId': config['id'], 'configName': config['name'], 'lastCreatedVersion': config['latestVersion'],
+                     'versionList': [{'version': v, 'versionNotes': d['notes']} for v, d in sorted(config['versions'].items(), reverse=True)]}
+
+    def create_waf_version(self, body, query, config_id):
+        config = self.waf_configs.get(int(config_id))
+        if config is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        with self._lock:
+            base = config['versions'][int(body.get('createFromVersion', config['latestVersion']))]
+            config['latestVersion'] += 1
+            config['versions'][config['latestVersion']] = copy.deepcopy(base)
+        return 201, {'configId': config['id'], 'version': config['latestVersion']}
+
+    def version_notes(self, body, query, config_id, version):
+        detail = self.waf_version(config_id, version)
+        if detail is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        detail['notes'] = body.get('notes', '')
+        return 200, {'notes': detail['notes']}
+
+    def selectable_hostnames(self, body, query, config_id=None, version=None, contract_id=None, group_id=None):
+        selected = set(self.waf_version(config_id, version)['selected']) if config_id else set()
+        return 200, {'availableSet': [{'hostname': h, 'activeInStaging': True, 'activeInProduction': False}
+                                      for h in sorted(self.hostnames - selected)],
+                     'selectedSet': [{'hostname': h} for h in sorted(selected)]}
+
+    def selected_hostnames(self, body, query, config_id, version):
+        detail = self.waf_version(config_id, version)
+        if detail is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        return 200, {'hostnameList': [{'hostname': h} for h in detail['selected']]}
+
+    def update_selected_hostnames(self, body, query, config_id, version):
+        detail = self.waf_version(config_id, version)
+        if detail is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        hostnames = [h['hostname'] for h in body.get('hostnameList', [])]
+        mode = body.get('mode', 'replace')
+        if mode == 'append':
+            detail['selected'] += [h for h in hostnames if h not in detail['selected']]
+        elif mode == 'remove':
+            detail['selected'] = [h for h in detail['selected'] if h not in hostnames]
+        else:
+            detail['selected'] = hostnames
+        return 200, {'hostnameList': [{'hostname': h} for h in detail['selected']]}
+
+    def security_policies(self, body, query, config_id, version):
+        detail = self.waf_version(config_id, version)
+        if detail is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        return 200, {'configId': int(config_id), 'version': int(version),
+                     'policies': [{'policyId': p, 'policyName': n} for p, n in detail['policies'].items()]}
+
+    def security_policy(self, body, query, config_id, version, policy_id):
+        detail = self.waf_version(config_id, version)
+        if detail is None or policy_id not in detail['policies']:
+            return 404, {'title': 'Not Found', 'status': 404}
+        return 200, {'policyId': policy_id, 'policyName': detail['policies'][policy_id]}
+
+    def create_security_policy(self, body, query, config_id, version):
+        detail = self.waf_version(config_id, version)
+        if detail is None:
+            return 404, {'title': 'Not Found', 'status': 404, 'detail': 'unknown configuration version'}
+        policy_id = f"{body.get('policyPrefix') or 'MOCK'}_{self.next_id()}"
+        detail['policies'][policy_id] = body.get('policyName')
+        return 201, {'policyId': policy_id, 'policyName': body.get('policyName')}
+
+    def match_targets(self, body, query, config_id, version):
+        detail = self.waf_version(config_id, version)
+        if detail is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        return 200, {'matchTargets': {'websiteTargets': list(detail['targets'].values()), 'apiTargets': []}}
+
+    def match_target(self, body, query, config_id, version, target_id):
+        detail = self.waf_version(config_id, version)
+        if detail is None or int(target_id) not in detail['targets']:
+            return 404, {'title': 'Not Found', 'status': 404}
+        return 200, detail['targets'][int(target_id)]
+
+    def create_match_target(self, body, query, config_id, version):
+        detail = self.waf_version(config_id, version)
+        if detail is None:
+            return 404, {'title': 'Not Found', 'status': 404}
+        target_id = self.next_id()
+        detail['targets'][target_id] = {**body, 'targetId': target_id, 'sequence': len(detail['targets']) + 1}
+        return 201, detail['targets'][target_id]
+
+    def update_match_target(self, body, query, config_id, version, target_id):
+        detail = self.waf_version(config_id, version)
+        if detail is None or int(target_id) not in detail['targets']:
+            return 404, {'title': 'Not Found', 'status': 404}
+        detail['targets'][int(target_id)] = {**body, 'targetId': int(target_id)}
+        return 200, detail['targets'][int(target_id)]
+
+    def groups(self, body, query):
+        return 200, {'groups': {'items': [{'groupId': 'grp_1', 'groupName': 'onboard mock', 'contractIds': ['ctr_1']}]}}
+
+    def products(self, body, query):
+        return 200, {'products': {'items': [{'productId': product, 'productName': product[4:]} for product in
+                                            ('prd_Fresca', 'prd_SPM', 'prd_API_Accel', 'prd_Site_Accel', 'prd_Download_Delivery')]}}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(f'{self.address_string()} {format % args}')
+
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+        status, headers, payload = self.server.api.handle(self.command, self.path, body)
+        content = b'' if payload is None else (payload if isinstance(payload, str) else json.dumps(payload)).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', headers.get('Content-Type', 'application/json'))
+        for name, value in headers.items():
+            if name != 'Content-Type':
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+
+def serve(api: MockApi, host: str = '127.0.0.1', port: int = 0,
+          certfile: str | None = None, keyfile: str | None = None) -> ThreadingHTTPServer:
+    """
+    Function to start the mock server in a daemon thread, port 0 picks a free port (server.server_port)
+    """
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.api = api
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@click.command(context_settings={'help_option_names': ['-h', '--help']})
+@click.option('--host', metavar='', default='127.0.0.1', show_default=True, help='Address to listen on')
+@click.option('--port', metavar='', type=int, default=8080, show_default=True, help='Port to listen on')
+@click.option('--fixtures', metavar='', type=click.Path(exists=True, file_okay=False),
+              help='Folder recorded with akamai-onboard --record', required=False)
+@click.option('--activation-delay', metavar='', type=click.FloatRange(min=0), default=10, show_default=True,
+              help='Seconds before a property or WAF activation completes')
+@click.option('--latency', metavar='', type=click.FloatRange(min=0), default=0, show_default=True,
+              help='Seconds added to every response')
+@click.option('--error-rate', metavar='', type=click.FloatRange(min=0, max=1), default=0, show_default=True,
+              help='Fraction of requests answered with 429 or 503')
+@click.option('--failure-rate', metavar='', type=click.FloatRange(min=0, max=1), default=0, show_default=True,
+              help='Fraction of activations that end in error')
+@click.option('--certfile', metavar='', type=click.Path(exists=True, dir_okay=False),
+              help='Serve https with this certificate, plain http otherwise', required=False)
+@click.option('--keyfile', metavar='', type=click.Path(exists=True, dir_okay=False),
+              help='Private key of --certfile', required=False)
+def main(host, port, fixtures, activation_delay, latency, error_rate, failure_rate, certfile, keyfile):
+    """
+    Local mock of the Akamai APIs used by akamai onboard.
+
+    Point the edgerc section `host` at host:port. For plain http also pass --plain-http to akamai onboard.
+    """
+    api = MockApi(fixtures, activation_delay, latency, error_rate, failure_rate)
+    server = serve(api, host, port, certfile, keyfile)
+    scheme = 'https' if certfile else 'http'
+    logger.info(f'Mock Akamai API listening on {scheme}://{host}:{server.server_port}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -29,7 +29,6 @@ class onboard:
             self.onboard_waf_prev_version = click_args['version']
             self.csv = click_args['csv']
             self.valid_csv = True
-            self.csv_dict = []
             self.hostname_list = []
             self.appsec_json = {}
             self.skip_selected_hosts = []
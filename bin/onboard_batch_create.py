@@ -30,7 +30,8 @@ class onboard:
             self.csv_loc = click_args['csv']
             self.property_list = []
             self.valid_csv = True
-            self.csv_dict = []
+            self.property_groups = {}
+            self.csv_hostnames = []
             self.secure_network = click_args['network']
             self.ehn_suffix = '.edgekey.net'
             if self.secure_network == 'STANDARD_TLS':
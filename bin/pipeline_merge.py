@@ -0,0 +1,114 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+
+from exceptions import setup_logger
+
+logger = setup_logger()
+
+ENV_VARIABLE = re.compile(r'\$\{env\.([^}]+)\}')
+INCLUDE_PREFIX = '#include:'
+
+
+class MergeError(Exception):
+    pass
+
+
+def load_json(file_path: str):
+    with open(file_path) as f:
+        return json.load(f)
+
+
+def substitute(node, variables: dict, templates_dir: str | None = None, missing: set | None = None):
+    """
+    Return a copy of node with akamai pipeline semantics applied:
+        "#include:file.json"  replaced by the content of file.json in templates_dir
+        "${env.name}"         replaced by the typed value when it is the whole string
+        "a-${env.name}-b"     replaced by the string value inside a larger string
+    """
+    if missing is None:
+        missing = set()
+    if isinstance(node, dict):
+        return {key: substitute(value, variables, templates_dir, missing) for key, value in node.items()}
+    if isinstance(node, list):
+        return [substitute(value, variables, templates_dir, missing) for value in node]
+    if not isinstance(node, str):
+        return node
+
+    if node.startswith(INCLUDE_PREFIX):
+        if templates_dir is None:
+            raise MergeError(f'{node} used without a templates folder')
+        include_file = os.path.join(templates_dir, node[len(INCLUDE_PREFIX):].strip())
+        if not os.path.isfile(include_file):
+            raise MergeError(f'{node} file not found {include_file}')
+        return substitute(load_json(include_file), variables, templates_dir, missing)
+
+    full_match = ENV_VARIABLE.fullmatch(node)
+    if full_match:
+        name = full_match.group(1)
+        if name not in variables:
+            missing.add(name)
+            return node
+        return variables[name]
+
+    def replace(match):
+        name = match.group(1)
+        if name not in variables:
+            missing.add(name)
+            return match.group(0)
+        value = variables[name]
+        return value if isinstance(value, str) else json.dumps(value)
+    return ENV_VARIABLE.sub(replace, node)
+
+
+def merge(template: dict, variables: dict, templates_dir: str | None = None) -> dict:
+    missing = set()
+    rule_tree = substitute(template, variables, templates_dir, missing)
+    if missing:
+        raise MergeError(f'variable not defined {sorted(missing)}')
+    return rule_tree
+
+
+def merge_file(template_file: str, values_file: str) -> dict:
+    """
+    Same result as `akamai pipeline merge` on a single template and values file
+    """
+    template = load_json(template_file)
+    variables = load_json(values_file)
+    return merge(template, variables, os.path.dirname(os.path.abspath(template_file)))
+
+
+def merge_folder(folder_path: str, env_name: str) -> dict:
+    """
+    Same result as `akamai pipeline merge` on an existing pipeline folder:
+    templates/main.json merged with environments/<env>/variables.json,
+    falling back to the defaults in environments/variableDefinitions.json
+    """
+    templates_dir = os.path.join(folder_path, 'templates')
+    variables = {}
+    definitions_file = os.path.join(folder_path, 'environments', 'variableDefinitions.json')
+    if os.path.isfile(definitions_file):
+        for name, definition in load_json(definitions_file).get('definitions', {}).items():
+            if 'default' in definition and definition['default'] is not None:
+                variables[name] = definition['default']
+    values_file = os.path.join(folder_path, 'environments', env_name, 'variables.json')
+    if os.path.isfile(values_file):
+        variables.update(load_json(values_file))
+    else:
+        raise MergeError(f'environment {env_name} not found {values_file}')
+    return merge(load_json(os.path.join(templates_dir, 'main.json')), variables, templates_dir)
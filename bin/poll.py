@@ -1,21 +1,83 @@
 from __future__ import annotations
 
+import datetime
 import json
+import random
 import time
-from time import gmtime
-from time import strftime
+from typing import TYPE_CHECKING
 
 from exceptions import setup_logger
-from rich.live import Live
-from rich.table import Table
+from worker_pool import run_in_pool
+
+if TYPE_CHECKING:
+    from rich.table import Table
 
 logger = setup_logger()
 
+POLL_WORKERS = 10
+TERMINAL_STATUS = ['ACTIVE', 'ACTIVATION_ERROR']
+
+
+class PollStrategy:
+    """
+    Interval schedule shared by every activation poll loop.
 
-def generate_table(activationDict, network) -> Table:
+    Starts at `initial` seconds and grows by `factor` on every unfinished poll up to `maximum`,
+    each wait is spread by +/- `jitter` so concurrent loops do not poll in lock step.
+    While the activation reports an estimatedFinishDate in the future the wait follows the ETA instead,
+    still bounded by `initial` and `maximum`. Once the ETA has passed the schedule grows again.
+    """
+    def __init__(self, initial: float = 5, maximum: float = 60, factor: float = 1.5,
+                 jitter: float = 0.1, use_eta: bool = True):
+        self.initial = initial
+        self.maximum = max(maximum, initial)
+        self.factor = factor
+        self.jitter = jitter
+        self.use_eta = use_eta
+
+    def delay(self, attempt: int, eta: float | None = None) -> float:
+        """
+        Seconds to wait before poll number attempt + 1 (attempt starts at 0)
+        """
+        if self.use_eta and eta is not None and eta > 0:
+            interval = min(max(eta, self.initial), self.maximum)
+        else:
+            interval = min(self.initial * self.factor ** attempt, self.maximum)
+        if self.jitter:
+            interval = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(interval, 1)
+
+    def sleep(self, attempt: int, eta: float | None = None) -> float:
+        interval = self.delay(attempt, eta)
+        time.sleep(interval)
+        return interval
+
+    @staticmethod
+    def eta(activation: dict) -> float | None:
+        """
+        Seconds until the activation is expected to finish, from the API payload if available
+        """
+        # fast metadata activations finish within minutes, poll on the short interval
+        if activation.get('fmaActivationState') not in (None, 'steady'):
+            return 0
+        finish = activation.get('estimatedFinishDate')
+        if not finish:
+            return None
+        try:
+            finish = datetime.datetime.fromisoformat(str(finish).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if finish.tzinfo is None:
+            finish = finish.replace(tzinfo=datetime.timezone.utc)
+        return max((finish - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0)
+
+
+def generate_table(activationDict, network, caption: str | None = None) -> Table:
 
     """Make a new table."""
-    table = Table()
+    from rich.table import Table
+
+    table = Table(caption=caption)
     table.add_column('Property Name')
     table.add_column('Property Id')
     table.add_column('Activation Id')
@@ -32,58 +94,87 @@ def generate_table(activationDict, network) -> Table:
     return table
 
 
-def pollActivation(activationDict, wrapper_object, contract_id, group_id, network):
-    start_time = time.perf_counter()
-    all_properties_active = False
-    elapse_time = 0
-    with Live(generate_table(activationDict, network), refresh_per_second=1) as live:
-        while (not all_properties_active):
-            end_time = time.perf_counter()
-            elapse_time = (end_time - start_time)
-            for i, propertyActivation in enumerate(activationDict):
-                activation_id = propertyActivation['activationId']
-                property_id = propertyActivation['propertyId']
-                property_name = propertyActivation['propertyName']
-                activationStatus = {'STAGING': '',
-                                    'PRODUCTION': ''}
-                if activation_id != 0:
-                    activation_status_response = wrapper_object.pollActivationStatus(contract_id,
-                                                                                    group_id,
-                                                                                    property_id,
-                                                                                    activation_id)
-                    if activation_status_response.status_code == 200:
-                        for each_activation in activation_status_response.json()['activations']['items']:
-                            if each_activation['activationId'] == activation_id:
-                                if network in each_activation['network']:
-                                    if each_activation['status'] != 'ACTIVE':
-                                        activationStatus[network] = 'PENDING_ACTIVATION'
-                                        all_properties_active = False
-                                    elif each_activation['status'] == 'ACTIVE':
-                                        end_time = time.perf_counter()
-                                        elapse_time = str(strftime('%H:%M:%S', gmtime(end_time - start_time)))
-                                        # msg = f'Successfully activated property {property_name} v1 on Akamai {network} network'
-                                        # logger.info(f'Activation Duration: {elapse_time} {msg}')
-                                        activationStatus[network] = 'ACTIVE'
-                                    else:
-                                        logger.error('Unable to parse activation status')
-                                        activationStatus[network] = 'UNABLE_TO_UPDATE_STATUS'
-                                        all_properties_active = False
+def activation_status(response, activation_id, network) -> tuple[str, dict | None]:
+    """
+    Function to read the status of one property activation from a pollActivationStatus response,
+    returns the status for the table and the activation item for ETA scheduling
+    """
+    status = ''
+    item = None
+    if response.status_code == 200:
+        for each_activation in response.json()['activations']['items']:
+            if each_activation['activationId'] == activation_id:
+                if network in each_activation['network']:
+                    item = each_activation
+                    if each_activation['status'] != 'ACTIVE':
+                        status = 'PENDING_ACTIVATION'
+                    elif each_activation['status'] == 'ACTIVE':
+                        status = 'ACTIVE'
                     else:
-                        logger.error(json.dumps(activation_status_response.json(), indent=4))
-                        logger.error(f'Unable to get activation status for {property_name}')
-                        activationStatus[network] = 'UNABLE_TO_UPDATE_STATUS'
-                        all_properties_active = False
+                        logger.error('Unable to parse activation status')
+                        status = 'UNABLE_TO_UPDATE_STATUS'
+    else:
+        logger.error(json.dumps(response.json(), indent=4))
+        status = 'UNABLE_TO_UPDATE_STATUS'
+    return status, item
+
+
+def pollActivation(activationDict, wrapper_object, contract_id, group_id, network,
+                   poll_strategy: PollStrategy | None = None, workers: int = POLL_WORKERS):
+    """
+    Poll every pending property activation until all are ACTIVE or failed,
+    statuses of one sweep are fetched concurrently and terminal activations are not polled again
+    """
+    from rich.live import Live
+
+    if poll_strategy is None:
+        poll_strategy = PollStrategy()
+    all_properties_active = False
+    attempt = 0
+
+    for i, propertyActivation in enumerate(activationDict):
+        if propertyActivation['activationId'] == 0:
+            activationDict[i]['activationStatus'] = {'STAGING': '', 'PRODUCTION': ''}
+            activationDict[i]['activationStatus'][network] = 'ACTIVATION_ERROR'
 
-                else:
-                    activationStatus[network] = 'ACTIVATION_ERROR'
+    def fetch(i):
+        propertyActivation = activationDict[i]
+        return wrapper_object.pollActivationStatus(contract_id, group_id,
+                                                   propertyActivation['propertyId'],
+                                                   propertyActivation['activationId'])
 
-            # check to see if all are active, if so - set variable to true
+    with Live(generate_table(activationDict, network), refresh_per_second=1) as live:
+        while (not all_properties_active):
+            pending = [i for i, propertyActivation in enumerate(activationDict)
+                       if propertyActivation.get('activationStatus', {}).get(network) not in TERMINAL_STATUS]
+            sweep_start = time.perf_counter()
+            etas = []
+            for i, response, error in run_in_pool(fetch, pending, min(workers, len(pending))):
+                property_name = activationDict[i]['propertyName']
+                if error:
+                    # keep the previous status, retry on the next sweep
+                    logger.debug(f'{property_name} {error}')
+                    continue
+                status, item = activation_status(response, activationDict[i]['activationId'], network)
+                if status == 'UNABLE_TO_UPDATE_STATUS':
+                    logger.error(f'Unable to get activation status for {property_name}')
+                elif status == 'PENDING_ACTIVATION':
+                    etas.append(poll_strategy.eta(item))
+                activationStatus = {'STAGING': '', 'PRODUCTION': ''}
+                activationStatus[network] = status
                 activationDict[i]['activationStatus'] = activationStatus
-            pending_activations = (list(filter(lambda x: x['activationStatus'][network] not in ['ACTIVE', 'ACTIVATION_ERROR'], activationDict)))
-            live.update(generate_table(activationDict, network))
+            sweep = time.perf_counter() - sweep_start
+
+            caption = f'{len(pending)} activations checked in {sweep:.2f}s'
+            logger.debug(caption)
+            live.update(generate_table(activationDict, network, caption=caption))
+            pending_activations = (list(filter(lambda x: x.get('activationStatus', {}).get(network) not in TERMINAL_STATUS, activationDict)))
             if len(pending_activations) == 0:
                 all_properties_active = True
                 break
-            logger.info('Polling 30s...')
-            time.sleep(30)
+            known_etas = [eta for eta in etas if eta is not None]
+            interval = poll_strategy.delay(attempt, min(known_etas) if known_etas else None)
+            logger.info(f'Polling {interval:.0f}s...')
+            time.sleep(interval)
+            attempt += 1
         return (all_properties_active, activationDict)
@@ -0,0 +1,83 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import sys
+import threading
+import uuid
+
+from exceptions import setup_logger
+
+logger = setup_logger()
+
+
+class RunJournal:
+    """
+    Append-only JSONL record of the API steps completed by one batch-create run.
+
+    Every line is one completed step of one property, for example
+        {"property": "www.example.com", "step": "createProperty", "key": "", "data": {"propertyId": "prp_1"}}
+    A resumed run reads the file back and skips the steps already recorded.
+    """
+    def __init__(self, journal_dir: str, run_id: str | None = None):
+        if run_id is None:
+            run_id = f"{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.run_id = run_id
+        self.file = os.path.join(journal_dir, f'{run_id}.jsonl')
+        self.steps = {}
+        self._lock = threading.Lock()
+        if os.path.isfile(self.file):
+            with open(self.file) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # last line of a run killed while writing
+                        continue
+                    self.steps[(entry['property'], entry['step'], entry['key'])] = entry['data']
+        else:
+            os.makedirs(journal_dir, exist_ok=True)
+
+    @classmethod
+    def resume(cls, journal_dir: str, run_id: str) -> RunJournal:
+        if not os.path.isfile(os.path.join(journal_dir, f'{run_id}.jsonl')):
+            sys.exit(logger.error(f'{run_id} run journal not found in {journal_dir}'))
+        journal = cls(journal_dir, run_id)
+        logger.warning(f'Resuming run {run_id}, {len(journal.steps)} completed steps found')
+        return journal
+
+    def record(self, property_name: str, step: str, key: str = '', **data) -> None:
+        entry = {'time': datetime.datetime.utcnow().isoformat(),
+                 'property': property_name,
+                 'step': step,
+                 'key': key,
+                 'data': data}
+        with self._lock:
+            with open(self.file, 'a') as f:
+                f.write(f'{json.dumps(entry)}\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.steps[(property_name, step, key)] = data
+
+    def get(self, property_name: str, step: str, key: str = '') -> dict | None:
+        return self.steps.get((property_name, step, key))
+
+    def properties(self) -> dict:
+        """
+        property name -> property id of every property created by this run
+        """
+        return {name: data['propertyId'] for (name, step, _), data in self.steps.items() if step == 'createProperty'}
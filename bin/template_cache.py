@@ -0,0 +1,73 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import re
+
+from exceptions import get_cli_root_directory
+
+root = get_cli_root_directory()
+behaviors_path = f'{root}/templates/akamai_product_templates/behaviors'
+
+PLACEHOLDER = re.compile(r'\$env\.([A-Za-z0-9_]+)')
+
+
+class CompiledTemplate:
+    """
+    Behavior template parsed once, with the location of every $env.<name> placeholder.
+
+    render() returns a new independent copy with the placeholders filled,
+    placeholders without a value are left as they are.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.slots = []
+        self._find_slots(tree, ())
+        self._skeleton = json.dumps(tree)
+
+    def _find_slots(self, node, path: tuple) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                self._find_slots(value, path + (key,))
+        elif isinstance(node, list):
+            for i, value in enumerate(node):
+                self._find_slots(value, path + (i,))
+        elif isinstance(node, str) and PLACEHOLDER.search(node):
+            self.slots.append((path, node))
+
+    @property
+    def placeholders(self) -> set:
+        return {name for _, text in self.slots for name in PLACEHOLDER.findall(text)}
+
+    def render(self, **values):
+        # json.loads of the serialized tree is the fastest deep copy for plain json data
+        tree = json.loads(self._skeleton)
+        for path, text in self.slots:
+            node = tree
+            for key in path[:-1]:
+                node = node[key]
+            node[path[-1]] = PLACEHOLDER.sub(lambda m: str(values.get(m.group(1), m.group(0))), text)
+        return tree
+
+
+@functools.lru_cache(maxsize=None)
+def load_behavior(name: str) -> CompiledTemplate:
+    """
+    Function to read and compile a template from templates/akamai_product_templates/behaviors once per run
+    """
+    with open(os.path.join(behaviors_path, name)) as f:
+        return CompiledTemplate(json.load(f))
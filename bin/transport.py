@@ -0,0 +1,430 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import random
+import re
+import socket
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlparse
+
+import requests
+from exceptions import setup_logger
+from requests.adapters import BaseAdapter
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+logger = setup_logger()
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# requests per second allowed per API family, bursts up to the same number
+DEFAULT_RATES = {'papi': 10, 'hapi': 10, 'appsec': 10, 'cps': 5}
+
+# pooled connections to the API host, raised to the command concurrency when that is larger
+DEFAULT_POOL_SIZE = 10
+KEEPALIVE_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+# plain http is only sent to these hosts, the Authorization header carries the edgerc tokens
+LOOPBACK_HOSTS = ('127.0.0.1', '::1', 'localhost')
+
+
+def api_family(url: str) -> str:
+    """
+    papi, hapi, appsec, cps ... from https://<host>/<family>/v1/...
+    """
+    path = urlparse(url).path.strip('/')
+    return path.split('/')[0] if path else ''
+
+
+def fixture_key(method: str, url: str) -> str:
+    """
+    GET /papi/v1/groups/?contractId=ctr_1, the account switch key is left out so fixtures replay for any account
+    """
+    parsed = urlparse(url)
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k != 'accountSwitchKey')
+    key = f'{method.upper()} {parsed.path}'
+    return f'{key}?{urlencode(query)}' if query else key
+
+
+def is_loopback(host: str) -> bool:
+    """
+    True when an url or an edgerc host[:port] points at 127.0.0.1, ::1 or localhost
+    """
+    return urlparse(host if '//' in host else f'//{host}').hostname in LOOPBACK_HOSTS
+
+
+def plain_http(url: str) -> str:
+    """
+    http:// instead of https://, for the local mock API server (bin/mock_server.py) only
+    """
+    if not is_loopback(url):
+        raise ValueError(f'plain http is only allowed to {", ".join(LOOPBACK_HOSTS)}, not {urlparse(url).hostname}')
+    return f'http://{url[8:]}' if url.startswith('https://') else url
+
+
+def parse_time(value: str) -> float | None:
+    """
+    Epoch seconds from an ISO 8601 or HTTP date header value
+    """
+    try:
+        moment = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.timestamp()
+
+
+def retry_after(response) -> float | None:
+    """
+    Seconds to wait before retrying, from Retry-After or Akamai-RateLimit-Next
+    """
+    value = response.headers.get('Retry-After')
+    if value:
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            moment = parse_time(value)
+            if moment is not None:
+                return max(moment - time.time(), 0)
+    value = response.headers.get('Akamai-RateLimit-Next')
+    if value:
+        moment = parse_time(value)
+        if moment is not None:
+            return max(moment - time.time(), 0)
+    return None
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket, acquire() blocks until a request may be sent
+    """
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens, the API said the limit is used up
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class RetrySession(requests.Session):
+    """
+    requests.Session that retries throttled and failed calls and keeps each API family under its rate limit.
+
+        idempotent methods are retried on 429, 5xx and connection errors
+        POST is only retried on 429, the request was rejected before it was processed
+        waits follow Retry-After / Akamai-RateLimit-Next when sent, exponential backoff with jitter otherwise
+        Akamai-RateLimit-Remaining: 0 pauses the family until the limit resets
+
+    Every response gets a `retries` attribute with the number of extra attempts made,
+    calls are recorded in `metrics` (api_metrics.ApiMetrics) and `recorder` (FixtureRecorder) when attached.
+    """
+    def __init__(self, max_retries: int = 5, backoff: float = 1, max_backoff: float = 60, rates: dict | None = None,
+                 metrics=None, recorder: FixtureRecorder | None = None, plain_http: bool = False):
+        super().__init__()
+        self.metrics = metrics
+        self.recorder = recorder
+        self.plain_http = plain_http
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.buckets = {family: TokenBucket(rate) for family, rate in (rates if rates is not None else DEFAULT_RATES).items()}
+
+    def backoff_delay(self, attempt: int) -> float:
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * random.uniform(0.5, 1)
+
+    def request(self, method, url, *args, **kwargs):
+        if self.plain_http:
+            url = plain_http(url)
+        if self.metrics is None and self.recorder is None:
+            return self._request_with_retries(method, url, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            response = self._request_with_retries(method, url, *args, **kwargs)
+        except requests.RequestException as e:
+            if self.metrics is not None:
+                self.metrics.record(method, url, None, time.perf_counter() - start, getattr(e, 'retries', 0))
+            raise
+        if self.metrics is not None:
+            self.metrics.record(method, url, response.status_code, time.perf_counter() - start,
+                                response.retries, len(response.content or b''))
+        if self.recorder is not None:
+            self.recorder.record(method, url, response.request.body, response)
+        return response
+
+    def _request_with_retries(self, method, url, *args, **kwargs):
+        method = method.upper()
+        bucket = self.buckets.get(api_family(url))
+        attempt = 0
+        while True:
+            if bucket is not None:
+                bucket.acquire()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if method not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+                    e.retries = attempt
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.debug(f'{method} {url} {e.__class__.__name__}, retry {attempt + 1} in {delay:.1f}s')
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if bucket is not None and response.headers.get('Akamai-RateLimit-Remaining') == '0':
+                reset = retry_after(response)
+                if reset:
+                    bucket.pause(reset)
+
+            retryable = response.status_code == 429 or \
+                (response.status_code in RETRY_STATUS and method in IDEMPOTENT_METHODS)
+            if not retryable or attempt >= self.max_retries:
+                response.retries = attempt
+                return response
+
+            delay = retry_after(response)
+            if delay is None:
+                delay = self.backoff_delay(attempt)
+            delay = min(delay, self.max_backoff)
+            logger.debug(f'{method} {url} {response.status_code}, retry {attempt + 1} in {delay:.1f}s')
+            if response.status_code == 429 and bucket is not None:
+                # the next acquire() waits, together with every other caller of the same API family
+                bucket.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+
+class FixtureRecorder:
+    """
+    Save every request/response pair to <folder>/<sequence>_<method>_<path>.json for bin/mock_server.py to replay.
+
+    Only the path, query, bodies, status and Content-Type are kept, never the Authorization header.
+    Recording into a folder that already holds fixtures continues after the highest sequence number.
+    """
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+        sequences = [int(file[:5]) for file in os.listdir(folder) if re.match(r'\d{5}_.*\.json$', file)]
+        self.sequence = max(sequences, default=0)
+        if self.sequence:
+            logger.warning(f'{folder} already holds fixtures, recording continues at {self.sequence + 1:05d}')
+
+    @staticmethod
+    def _body(content):
+        if content is None:
+            return None
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='replace')
+        try:
+            return json.loads(content)
+        except ValueError:
+            return content
+
+    def record(self, method: str, url: str, request_body, response) -> str:
+        key = fixture_key(method, url)
+        fixture = {'key': key,
+                   'method': method.upper(),
+                   'request': self._body(request_body),
+                   'status': response.status_code,
+                   'headers': {'Content-Type': response.headers.get('Content-Type', 'application/json')},
+                   'body': self._body(response.content) if response.content else None}
+        slug = '_'.join(segment for segment in urlparse(url).path.split('/') if segment)[:120]
+        with self._lock:
+            self.sequence += 1
+            file = os.path.join(self.folder, f'{self.sequence:05d}_{method.upper()}_{slug}.json')
+        with open(file, 'w') as f:
+            json.dump(fixture, f, indent=4)
+        return file
+
+
+class PoolStats:
+    """
+    Connections opened and reused by a session, and time spent waiting for a free pooled connection
+    """
+    def __init__(self):
+        self.requests = 0
+        self.opened = 0
+        self.wait = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.opened, 0)
+
+    def add(self, opened: int = 0, requests: int = 0, wait: float = 0.0) -> None:
+        with self._lock:
+            self.opened += opened
+            self.requests += requests
+            self.wait += wait
+
+    def __str__(self) -> str:
+        return f'{self.requests} requests, {self.opened} connections opened, {self.reused} reused, {self.wait:.2f}s waiting for a connection'
+
+
+class CountingPoolMixin:
+    stats: PoolStats
+
+    def _new_conn(self):
+        self.stats.add(opened=1)
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        self.stats.add(requests=1, wait=time.perf_counter() - start)
+        return conn
+
+
+class CountingHTTPConnectionPool(CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class CountingPoolManager(PoolManager):
+    def __init__(self, *args, stats: PoolStats, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {'http': CountingHTTPConnectionPool, 'https': CountingHTTPSConnectionPool}
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.stats = self.stats
+        return pool
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter keeping pool_size keep-alive connections per host.
+
+    The pool blocks when every connection is busy instead of opening a throwaway
+    connection, so each TLS handshake to the API host is paid at most pool_size times.
+    """
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, stats: PoolStats | None = None, **kwargs):
+        self.stats = stats if stats is not None else PoolStats()
+        super().__init__(pool_maxsize=pool_size, pool_block=True, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = CountingPoolManager(num_pools=connections, maxsize=maxsize, block=block,
+                                               socket_options=KEEPALIVE_OPTIONS, stats=self.stats, **pool_kwargs)
+
+
+class Http2Adapter(BaseAdapter):
+    """
+    Transport sending the prepared (already signed) requests through httpx over HTTP/2,
+    every call is multiplexed on one connection per host
+    """
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, stats: PoolStats | None = None):
+        import httpx
+        super().__init__()
+        self.stats = stats if stats is not None else PoolStats()
+        self.client = httpx.Client(http2=True,
+                                   limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size))
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        import httpx
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            resp = self.client.request(request.method, request.url, headers=dict(request.headers),
+                                       content=request.body, timeout=timeout, follow_redirects=False)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        self.stats.add(requests=1)
+
+        response = requests.Response()
+        response.status_code = resp.status_code
+        response.reason = resp.reason_phrase
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = resp.content
+        response.url = str(resp.url)
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        self.client.close()
+
+
+def new_session(pool_size: int = DEFAULT_POOL_SIZE, http2: bool = False, **kwargs) -> RetrySession:
+    """
+    Function to build the session shared by every API call of a command.
+
+    HTTP/2 needs httpx with the http2 extra (pip install httpx[http2]), without it
+    the session falls back to pooled HTTP/1.1 keep-alive connections.
+    """
+    session = RetrySession(**kwargs)
+    session.pool_stats = PoolStats()
+    adapter = None
+    if http2:
+        try:
+            adapter = Http2Adapter(pool_size, session.pool_stats)
+        except ImportError:
+            logger.warning('HTTP/2 requires httpx[http2], using HTTP/1.1')
+    if adapter is None:
+        adapter = PooledAdapter(pool_size, session.pool_stats)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
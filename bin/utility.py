@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import csv
+import functools
 import json
+import logging
 import os
-import re
 import shutil
 import subprocess
 import sys
@@ -14,9 +15,15 @@ from time import gmtime
 from time import strftime
 from urllib import parse
 
-import pandas as pd
+import csv_validation
+import pipeline_merge
+import template_cache
+from api_metrics import timed
+from csv_stream import read_rows
 from exceptions import get_cli_root_directory
 from exceptions import setup_logger
+from indexes import EdgeHostnameIndex
+from indexes import PropertyNameIndex
 from jsonschema import validate
 from jsonschema import ValidationError
 from pyisemail import is_email
@@ -31,16 +38,18 @@ column_width = 50
 
 
 class utility:
-    def __init__(self):
+    def __init__(self, merge_engine: str = 'native'):
         """
         Function to initialize a common status indicator,
         This variable should be updated by every function
         defined in validation modules to indicate validation status.
         This avoid usage of too many IF Conditions.
+        akamai cli and cli pipeline are only required by --merge-engine pipeline
         """
         # Initialize the variable to true
         self.valid = True
-        self.validate_prerequisite_cli()
+        if merge_engine == 'pipeline':
+            self.validate_prerequisite_cli()
         self.start_time = time.perf_counter()
 
     def installedCommandCheck(self, command_name) -> bool:
@@ -90,9 +99,11 @@ class utility:
         # Default Return, ideally code shouldnt come here
         return self.valid
 
-    def validateSetupStepsCSV(self, onboard_object, wrapper_object, cli_mode='batch-create') -> bool:
+    @timed('validation')
+    def validateSetupStepsCSV(self, onboard_object, wrapper_object, cli_mode='batch-create', journal=None) -> bool:
         """
-        Function to validate the input values of setup.json when in batch-create mode
+        Function to validate the input values of setup.json when in batch-create mode,
+        properties created by the run in journal are valid when resuming that run
         """
 
         count = 0
@@ -105,11 +116,20 @@ class utility:
             logger.error(f'{onboard_object.csv_loc:<30}{space:>20}invalid csv; check above validation errors')
             count += 1
 
-        # check if property name exists
-        for property in onboard_object.property_name:
+        # check if property name exists, property_list holds the csv property names (csv_2_property_dict)
+        property_names = sorted(onboard_object.property_list)
+        property_index = PropertyNameIndex(wrapper_object)
+        property_index.resolve(property_names)
+        resumed_properties = journal.properties() if journal is not None else {}
+        for property in property_names:
             width = column_width - len(property)
             msg = f'{property}{space:>{width}}'
-            if wrapper_object.property_exists(property):
+            if property in resumed_properties:
+                logger.info(f'{msg}valid property name; created by run {journal.run_id}')
+            elif property in property_index.errors:
+                logger.error(f'{msg}unable to verify property name; search failed')
+                count += 1
+            elif property_index.exists(property):
                 logger.error(f'{msg}invalid property name; already in use')
                 count += 1
             else:
@@ -148,28 +168,18 @@ class utility:
             logger.error(f'{onboard_object.secure_network}{space:>{column_width - len(onboard_object.secure_network)}}invalid secure_network')
             count += 1
 
-        # ensure hostname doesn't contain special characters and is of valid length
-        reg = re.compile(r'[^\.\-a-zA-Z0-9]')
-        for hostname in onboard_object.public_hostnames:
-            if re.search(reg, hostname):
-                logger.error(f'{hostname} contains invalid character. Only alphanumeric (a-z, A-Z, 0-9) and hyphen (-) characters are supported.')
-                count += 1
-            if len(hostname) > 60 and len(hostname) < 4:
-                logger.error(f'{hostname} is invalid length. Hostname length must be between 4-60 characters')
-                count += 1
-            if (hostname[0] == '-') or (hostname[-1] == '-'):
-                logger.error(f'{hostname} cannot begin or end with a hyphen.')
-                count += 1
+        # hostname characters, length and duplicates are checked with the csv in csv_validator
 
         # must be one of three valid modes
         edgeHostnameList = onboard_object.edge_hostname_list
         valid_modes = ['use_existing_edgehostname', 'secure_by_default']
         logger.info(f'{onboard_object.edge_hostname_mode}{space:>{column_width - len(onboard_object.edge_hostname_mode)}}edge hostname mode')
+        ehn_index = EdgeHostnameIndex(wrapper_object)
         if onboard_object.edge_hostname_mode == 'use_existing_edgehostname':
             ehn_id = 0
             # check to see if specified edge hostname exists
             for edgeHostname in edgeHostnameList:
-                ehn_id = self.validateEdgeHostnameExists(wrapper_object, str(edgeHostname))
+                ehn_id = self.validateEdgeHostnameExists(wrapper_object, str(edgeHostname), ehn_index)
                 public_hostname_str = ', '.join(onboard_object.public_hostnames)
                 if ehn_id != 0:
                     logger.info(f'{edgeHostname} valid edge hostname (ehn_{ehn_id})')
@@ -182,7 +192,7 @@ class utility:
             ehn_id = 0
             for i, edgeHostname in enumerate(edgeHostnameList):
                 # check to see if specified edge hostname exists
-                ehn_id = self.validateEdgeHostnameExists(wrapper_object, str(edgeHostname))
+                ehn_id = self.validateEdgeHostnameExists(wrapper_object, str(edgeHostname), ehn_index)
                 public_hostname_str = ', '.join(onboard_object.public_hostnames)
                 if ehn_id != 0:
                     logger.info(f'{edgeHostname} valid edge hostname (ehn_{ehn_id})')
@@ -192,7 +202,7 @@ class utility:
                     if edgeHostname.endswith(('edgekey.net', 'edgesuite.net')):
                         logger.warning(f'{edgeHostname} does not exist, will be created upon property activation')
                     else:
-                        logger.warning(f'{edgeHostname} does not end with edgekey.net or edgesuite.net, using {hostname}.{onboard_object.ehn_suffix}')
+                        logger.warning(f'{edgeHostname} does not end with edgekey.net or edgesuite.net')
                         # no need to error out if ehn doesn't exist for SBD - ehn will get created with property activation
                         # count += 1
 
@@ -225,7 +235,7 @@ class utility:
                         _, policies = wrapper_object.get_waf_policy(onboard_object)
                         _, target_ids, _ = wrapper_object.list_match_targets(onboard_object.onboard_waf_config_id,
                                                                              onboard_object.onboard_waf_prev_version,
-                                                                             policies)
+                                                                             policies, display=False)
                         if (onboard_object.update_match_target) and (onboard_object.waf_match_target_id in target_ids):
                             for k in policies:
                                 if onboard_object.waf_match_target_id in policies[k]:
@@ -286,6 +296,7 @@ class utility:
 
         return self.valid
 
+    @timed('validation')
     def validateSetupSteps(self, onboard_object, wrapper_object, cli_mode='create') -> bool:
         """
         Function to validate the input values of setup.json
@@ -371,7 +382,7 @@ class utility:
             count += 1
 
         # ensure hostname doesn't contain special characters and is of valid length
-        count = self.validate_hostnames(onboard_object.public_hostnames)
+        count += self.validate_hostnames(onboard_object.public_hostnames)
 
         # must be one of three valid modes
         valid_modes = ['use_existing_edgehostname', 'new_standard_tls_edgehostname', 'new_enhanced_tls_edgehostname', 'secure_by_default']
@@ -496,7 +507,7 @@ class utility:
                     _, policies = wrapper_object.get_waf_policy(onboard_object)
                     _, target_ids, _ = wrapper_object.list_match_targets(onboard_object.onboard_waf_config_id,
                                                                         onboard_object.onboard_waf_prev_version,
-                                                                        policies)
+                                                                        policies, display=False)
                     if onboard_object.waf_match_target_id in target_ids:
                         for k in policies:
                             if onboard_object.waf_match_target_id in policies[k]:
@@ -579,6 +590,7 @@ class utility:
 
         return self.valid
 
+    @timed('validation')
     def validateAppsecSteps(self, onboard_object, wrapper_object, cli_mode='appsec-update'):
         """
         Function to validate inputs for appsec-update
@@ -643,11 +655,11 @@ class utility:
                 policies = wrapper_object.get_waf_policy_update(onboard_object.config_id, onboard_object.onboard_waf_prev_version)
 
                 if policies:
-                    resp, waf_match_target_ids, _ = wrapper_object.list_match_targets(onboard_object.config_id, onboard_object.onboard_waf_prev_version, policies)
+                    resp, waf_match_target_ids, _ = wrapper_object.list_match_targets(onboard_object.config_id, onboard_object.onboard_waf_prev_version, policies, display=False)
                     if resp.status_code != 200:
                         sys.exit(logger.error('unable to get waf match targets....'))
                     if cli_mode != 'appsec-remove':
-                        unique_match_target_list = list(set(list(map(lambda x: x['matchTargetId'], onboard_object.csv_dict))))
+                        unique_match_target_list = list(onboard_object.appsec_json)
                         for unique_match_target in unique_match_target_list:
                             msg = f'{unique_match_target}{space:>{column_width-len(unique_match_target)}}'
                             if int(unique_match_target) in waf_match_target_ids:
@@ -733,11 +745,17 @@ class utility:
 
         return products
 
-    def validateEdgeHostnameExists(self, wrapper_object, edge_hostname) -> bool:
+    def validateEdgeHostnameExists(self, wrapper_object, edge_hostname, ehn_index: EdgeHostnameIndex | None = None) -> bool:
         """
-        Function to validate edge hostname
+        Function to validate edge hostname,
+        answered from ehn_index when given, per-hostname query otherwise or on a miss
         """
         ehn_id = 0
+        if ehn_index is not None:
+            ehn_id = ehn_index.get(edge_hostname)
+            if ehn_id != 0:
+                logger.debug(f'{ehn_id}{space:>{column_width - len(str(ehn_id))}}found edgeHostnameId')
+                return ehn_id
         edgehostname_response = wrapper_object.checkEdgeHostname(edge_hostname)
         record_name = edge_hostname
         if str(edge_hostname).endswith('edgekey.net'):
@@ -750,6 +768,8 @@ class utility:
                 if every_ehn['recordName'] == record_name:
                     ehn_id = every_ehn['edgeHostnameId']
                     logger.debug(f'{ehn_id}{space:>{column_width - len(str(ehn_id))}}found edgeHostnameId')
+                    if ehn_index is not None:
+                        ehn_index.add(edge_hostname, ehn_id)
                     return ehn_id
                 else:
                     pass
@@ -917,6 +937,28 @@ class utility:
                   'to see if files were copied or merged correctly')
             return False
 
+    @timed('rules')
+    def mergeRuleTree(self, config, onboard_object, create_mode=True) -> dict | None:
+        """
+        Function to merge template and variables into the property rule tree,
+        in process by default or through akamai pipeline with --merge-engine pipeline
+        """
+        if getattr(config, 'merge_engine', 'native') == 'pipeline':
+            if not self.doCliPipelineMerge(config, onboard_object, create_mode=create_mode, merge_type='pm'):
+                return None
+            env_name = 'test' if create_mode else onboard_object.env_name
+            with open(os.path.join('temp_pm', 'dist', f'{env_name}.temp_pm.papi.json')) as updateTemplateFile:
+                return json.load(updateTemplateFile)
+
+        try:
+            if create_mode:
+                return pipeline_merge.merge_file(onboard_object.source_template_file,
+                                                 onboard_object.source_values_file)
+            return pipeline_merge.merge_folder(onboard_object.folder_path, onboard_object.env_name)
+        except (pipeline_merge.MergeError, OSError, ValueError) as e:
+            logger.error(e)
+            return None
+
     def get_active_sec_config(self, wrapper_object):
         config = wrapper_object.getWafConfigurations()
         config_ids, responses, stg, prd = [], [], [], []
@@ -934,19 +976,16 @@ class utility:
         logger.debug(f'{len(stg)}-{len(prd)}')
         return len(stg), len(prd)
 
+    @timed('csv')
     def csv_2_origin_rules(self, csv_file_loc: str) -> dict:
-        cli_path = f'{root}/templates/akamai_product_templates/behaviors'
+        origin_template = template_cache.load_behavior('origin.json')
         logger.info(f'Validating customer hostname input: {csv_file_loc}')
 
         if not self.validateFile('csv file', csv_file_loc):
             sys.exit(logger.error(f'{csv_file_loc}...........missing'))
 
         csv_file_loc = os.path.abspath(csv_file_loc)
-        with open(csv_file_loc, encoding='utf-8-sig') as f:
-            rows = sum(1 for row in f)
-            if rows > 600:
-                logger.warning(f'{rows} hostnames/origins defined. Consider splitting hostnames into multiple properties')
-
+        rows = 0
         public_hostnames, origin_hostnames = [], []
         with open(csv_file_loc, encoding='utf-8-sig') as f:
             parent_rule = {}
@@ -957,16 +996,14 @@ class utility:
             parent_rule['comments'] = 'Route request to appropriate origin'
 
             rows_reader = csv.reader(f, delimiter=',')
-            for row in rows_reader:
+            for rows, row in enumerate(rows_reader, 1):
                 public_hostnames.append(row[0])
                 origin_hostnames.append(row[1])
-                origin_behavior_file = os.path.abspath(f'{cli_path}/origin.json')
-                with open(origin_behavior_file) as t:
-                    content = t.read()
-                content = content.replace('$env.hostname', row[0])
-                content = content.replace('$env.origin_name', row[1])
-                parent_rule['children'].append(json.loads(content))
-        logger.debug(json.dumps(parent_rule, indent=4))
+                parent_rule['children'].append(origin_template.render(hostname=row[0], origin_name=row[1]))
+        if rows > 600:
+            logger.warning(f'{rows} hostnames/origins defined. Consider splitting hostnames into multiple properties')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(parent_rule, indent=4))
         return parent_rule, public_hostnames, origin_hostnames
 
     def validate_prerequisite_cli(self) -> None:
@@ -1005,75 +1042,48 @@ class utility:
         if onboard.secure_by_default:
             onboard.edge_hostname_mode = 'secure_by_default'
 
-    def csv_validator(self, onboard_object, csv_file_loc: str):
-        csv_dict = []
-        schema = {
-            'hostname': {
-                'type': 'string',
-                'required': True,
-                'empty': False
-            },
-            'origin': {
-                'type': 'string',
-                'required': True,
-                'empty': False
-            },
-            'propertyName': {
-                'type': 'string'
-            },
-            'forwardHostHeader': {
-                'type': 'string',
-                'nullable': True,
-                'allowed': ['REQUEST_HOST_HEADER', 'ORIGIN_HOSTNAME']
-            },
-            'edgeHostname': {
-                'type': 'string',
-                'regex': (r'(.*\.edgekey\.net$|.*\.edgesuite\.net$)')}
-        }
-
-        logger.warning(f'Reading customer property name input: {csv_file_loc}')
-
-        with open(csv_file_loc, encoding='utf-8-sig', newline='') as f:
-            for i, row in enumerate(csv.DictReader(f), 1):
-                csv_dict.append(row)
-                try:
-                    validate(instance=row, schema=schema)
-                except ValidationError as e:
-                    onboard_object.valid_csv = False
-                    logger.warning(f'CSV Validation Error in row: {i} - {e}')
-
-        onboard_object.csv_dict = csv_dict
+    def validate_csv(self, onboard_object, csv_file_loc: str, rules: dict, consume) -> bool:
+        """
+        Function to read the csv once, consume(onboard_object, rows) groups the rows
+        while they are validated and counted, every error is reported in one table after the pass
+        """
+        check = csv_validation.CsvCheck(rules)
+        rows = read_rows(csv_file_loc, check)
+        consume(onboard_object, rows)
+        for _ in rows:
+            pass
+        csv_validation.report(check.errors, check.error_count)
+        logger.info(f'{csv_file_loc}: {check.summary()}')
+        if check.error_count:
+            onboard_object.valid_csv = False
         return onboard_object.valid_csv
 
-    def csv_validator_appsec(self, onboard_object, csv_file_loc: str):
-        csv_dict = []
-        schema = {
-            'hostname': {
-                'type': 'string',
-                'required': True,
-                'empty': False
-            },
-            'matchTargetId': {
-                'required': False,
-                'empty': True
-            }
-        }
+    @timed('csv')
+    def csv_validator(self, onboard_object, csv_file_loc: str):
+        """
+        Function to validate the batch-create csv and group it by property (csv_2_property_dict) in one pass
+        """
+        logger.warning(f'Reading customer property name input: {csv_file_loc}')
+        rules = csv_validation.BATCH_CREATE
+        if onboard_object.edge_hostname_mode == 'secure_by_default':
+            rules = csv_validation.BATCH_CREATE_SBD
+        return self.validate_csv(onboard_object, csv_file_loc, rules, self.csv_2_property_dict)
 
+    @timed('csv')
+    def csv_validator_appsec(self, onboard_object, csv_file_loc: str, delete: bool = False):
+        """
+        Function to validate the appsec csv and collect its hostnames (csv_2_appsec_array) in one pass
+        """
         logger.warning(f'Reading csv input: {csv_file_loc}')
+        return self.validate_csv(onboard_object, csv_file_loc, csv_validation.APPSEC_UPDATE,
+                                 functools.partial(self.csv_2_appsec_array, delete=delete))
 
-        with open(csv_file_loc, encoding='utf-8-sig', newline='') as f:
-            for i, row in enumerate(csv.DictReader(f), 1):
-                csv_dict.append(row)
-                try:
-                    validate(instance=row, schema=schema)
-                except ValidationError as e:
-                    onboard_object.valid_csv = False
-                    logger.warning(f'CSV Validation Error in row: {i} - {e}')
-
-        onboard_object.csv_dict = csv_dict
-        return onboard_object.valid_csv
-
-    def csv_2_property_dict(self, onboard_object) -> dict:
+    def csv_2_property_dict(self, onboard_object, rows) -> None:
+        """
+        Function to collect property names, hostnames and edge hostnames and group the rows by property,
+        csv_2_property_array adds the rule tree to every group
+        """
+        propertyJson = {}
         propertyList = []
         hostnameList = []
         edgeHostnameList = []
@@ -1081,46 +1091,49 @@ class utility:
         if onboard_object.secure_network == 'STANDARD_TLS':
             ehn_suffix = '.edgesuite.net'
 
-        for i, row in enumerate(onboard_object.csv_dict):
-            try:
-                propertyName = row['propertyName']
-                if (propertyName is None) or (propertyName == ''):
-                    propertyName = row['hostname']
-            except KeyError:
-                propertyName = row['hostname']
+        for i, row in enumerate(rows):
             hostname = row['hostname']
+            # rows without propertyName are a property of their own, named after the hostname
+            propertyName = row.get('propertyName') or hostname
             hostnameList.append(hostname)
             propertyList.append(propertyName)
             try:
                 edgeHostname = row['edgeHostname']
-                if (edgeHostname is None) or (edgeHostname == ''):
+                if edgeHostname == '':
                     if onboard_object.edge_hostname_mode == 'secure_by_default':
-                        edgeHostnameList.append(f'{hostname}{ehn_suffix}')
+                        edgeHostname = f'{hostname}{ehn_suffix}'
                         logger.debug(f'edgeHostname value is empty - using edge hostname {hostname}{ehn_suffix}')
                     else:
                         sys.exit(logger.error(f'No edgeHostname provided for {hostname} - row:{i+1}'))
-                else:
-                    edgeHostnameList.append(edgeHostname)
             except KeyError:
                 if onboard_object.edge_hostname_mode == 'secure_by_default':
-                    edgeHostnameList.append(f'{hostname}{ehn_suffix}')
+                    edgeHostname = f'{hostname}{ehn_suffix}'
                     logger.debug(f'edgeHostname column does not exist in csv, using edge hostname {hostname}{ehn_suffix}')
                 else:
                     sys.exit(logger.error('edgeHostname column must exist in input csv unless using secure-by-default mode'))
-
-        propertyList = list(set(propertyList))
-        hostnameList = list(set(hostnameList))
+            edgeHostnameList.append(edgeHostname)
+
+            forwardHostHeader = row.get('forwardHostHeader') or 'REQUEST_HOST_HEADER'
+            if row.get('propertyName') and propertyName in propertyJson:
+                propertyJson[propertyName]['hostnames'].append(hostname)
+                propertyJson[propertyName]['origins'].append(row['origin'])
+                propertyJson[propertyName]['edgeHostnames'].append(edgeHostname)
+                propertyJson[propertyName]['forwardHostHeader'].append(forwardHostHeader)
+            else:
+                propertyJson[propertyName] = {'hostnames': [hostname],
+                                              'origins': [row['origin']],
+                                              'edgeHostnames': [edgeHostname],
+                                              'forwardHostHeader': [forwardHostHeader]}
 
         onboard_object.edge_hostname_list = edgeHostnameList
-        onboard_object.property_list = propertyList
-        onboard_object.public_hostnames = hostnameList
+        onboard_object.property_list = list(set(propertyList))
+        onboard_object.public_hostnames = list(set(hostnameList))
+        onboard_object.csv_hostnames = hostnameList
+        onboard_object.property_groups = propertyJson
 
-        return (propertyList, hostnameList)
-
-    def csv_2_property_array(self, config, onboard_object, cpcodeList) -> dict:
-        cli_path = f'{root}/templates/akamai_product_templates/behaviors'
+    @timed('rules')
+    def csv_2_property_array(self, config, onboard_object) -> dict:
         propertyJson = {}
-        hostnameList = []
         templateFile = onboard_object.source_template_file
 
         if not self.validateFile('json file', templateFile):
@@ -1135,107 +1148,61 @@ class utility:
         default_behavior_names = list(set(list(map(lambda x: x['name'], default_behaviors))))
         if 'origin' not in default_behavior_names:
             logger.warning('No default origin behavior in provided template, adding.....')
-            with open(f'{cli_path}/origin_csv.json') as t:
-                content = json.load(t)
-                originBehavior = content['behaviors'][0]
-                originBehavior['options']['forwardHostHeader'] = 'REQUEST_HOST_HEADER'
+            originBehavior = template_cache.load_behavior('origin_csv.json').render()['behaviors'][0]
+            originBehavior['options']['forwardHostHeader'] = 'REQUEST_HOST_HEADER'
             templateData['rules']['behaviors'].append(originBehavior)
         if 'cpCode' not in default_behavior_names:
             logger.warning('No default cpCode behavior in provided template, adding.....')
-            with open(f'{cli_path}/cpCode.json') as c:
-                cp_content = json.load(c)
-            templateData['rules']['behaviors'].append(cp_content)
+            templateData['rules']['behaviors'].append(template_cache.load_behavior('cpCode.json').render())
 
-        for i, row in enumerate(onboard_object.csv_dict):
+        # rows were grouped by property while the csv was validated
+        for propertyName, group in onboard_object.property_groups.items():
+            propertyJson[propertyName] = {'ruleTree': templateData, **group}
 
-            # group by propertyName
-            propertyName = row['hostname']
-            edgeHostname = onboard_object.edge_hostname_list[i]
+        return (propertyJson, onboard_object.csv_hostnames)
 
-            try:
-                propertyName = row['propertyName']
-                if (propertyName is None) or (propertyName == ''):
-                    propertyName = row['hostname']
-
-                # check to see if property already exists in dict if it does, add hostname, origins, ehns, to hostname dict and move on to next row
-                else:
-                    if propertyName in propertyJson.keys():
-                        propertyJson[propertyName]['hostnames'].append(row['hostname'])
-                        propertyJson[propertyName]['origins'].append(row['origin'])
-                        propertyJson[propertyName]['edgeHostnames'].append(edgeHostname)
-                        try:
-                            if row['forwardHostHeader'] is not None:
-                                propertyJson[propertyName]['forwardHostHeader'].append(row['forwardHostHeader'])
-                            else:
-                                propertyJson[propertyName]['forwardHostHeader'].append('REQUEST_HOST_HEADER')
-                        except KeyError:
-                            propertyJson[propertyName]['forwardHostHeader'].append('REQUEST_HOST_HEADER')
-
-                        hostnameList.append(row['hostname'])
-                        continue
-
-        # If property doesn't already exist, add new property json rule tree to dict
-            except KeyError:
-                propertyName = row['hostname']
-
-            propertyJson[propertyName] = {}
-            propertyJson[propertyName]['ruleTree'] = templateData
-            propertyJson[propertyName]['hostnames'] = [row['hostname']]
-            propertyJson[propertyName]['origins'] = [row['origin']]
-            propertyJson[propertyName]['edgeHostnames'] = [edgeHostname]
-            try:
-                propertyJson[propertyName]['forwardHostHeader'] = [row['forwardHostHeader']]
-
-                if row['forwardHostHeader'] is None:
-                    propertyJson[propertyName]['forwardHostHeader'] = ['REQUEST_HOST_HEADER']
-            except KeyError:
-                propertyJson[propertyName]['forwardHostHeader'] = ['REQUEST_HOST_HEADER']
-
-            hostnameList.append(row['hostname'])
-
-        # create origin behaviors for multi-origin setup
-        for propertyName in propertyJson:
-
-            if len(propertyJson[propertyName]['origins']) > 1:
-                with open(f'{cli_path}/origin_csv.json') as t:
-                    content = t.read()
-                with open(f'{cli_path}/cpCode.json') as c:
-                    cp_content = c.read()
-
-                parent_rule = {}
-                parent_rule['name'] = 'Origin Rules'
-                parent_rule['behaviors'] = []
-                parent_rule['criteria'] = []
-                parent_rule['children'] = []
-                parent_rule['comments'] = 'Route request to appropriate origin'
-
-                # check default rule FOSSL settings (verificationMode: CUSTOM or verificationMode: PLATFORM_SETTINGS)
-                default_fossl_verification_settings = ''
-                for defaultBehavior in propertyJson[propertyName]['ruleTree']['rules']['behaviors']:
-                    if defaultBehavior['name'] == 'origin':
-                        default_fossl_verification_settings = defaultBehavior['options']['verificationMode']
-
-                for i in range(len(propertyJson[propertyName]['origins'])):
-                    originJson = content.replace('$env.hostname', propertyJson[propertyName]['hostnames'][i])
-                    originJson = originJson.replace('$env.origin_name', propertyJson[propertyName]['origins'][i])
-                    originJson = originJson.replace('$env.forward_host_header', propertyJson[propertyName]['forwardHostHeader'][i])
-                    originJson = json.loads(originJson)
-                    cpcodeJson = json.loads(cp_content)
-                    cpcodeJson['options']['value']['id'] = cpcodeList[propertyJson[propertyName]['hostnames'][i]]
-
-                    # update new origin behaviors to match verification setting of default rule
-                    if default_fossl_verification_settings == 'PLATFORM_SETTINGS':
-                        originJson['behaviors'][0]['options']['verificationMode'] = 'PLATFORM_SETTINGS'
-                        platform_setting_keys_to_remove = ['customValidCnValues', 'originCertsToHonor', 'standardCertificateAuthorities']
-                        for key in platform_setting_keys_to_remove:
-                            del originJson['behaviors'][0]['options'][key]
-
-                    originJson['behaviors'].append(cpcodeJson)
-                    parent_rule['children'].append(originJson)
-
-                propertyJson[propertyName]['originRule'] = parent_rule
-
-        return (propertyJson, hostnameList)
+    @timed('rules')
+    def build_origin_rule(self, property_detail: dict, cpcodeList: dict) -> dict | None:
+        """
+        Function to create origin behaviors for multi-origin setup of one property
+        """
+        if len(property_detail['origins']) <= 1:
+            return None
+
+        origin_template = template_cache.load_behavior('origin_csv.json')
+        cpcode_template = template_cache.load_behavior('cpCode.json')
+
+        parent_rule = {}
+        parent_rule['name'] = 'Origin Rules'
+        parent_rule['behaviors'] = []
+        parent_rule['criteria'] = []
+        parent_rule['children'] = []
+        parent_rule['comments'] = 'Route request to appropriate origin'
+
+        # check default rule FOSSL settings (verificationMode: CUSTOM or verificationMode: PLATFORM_SETTINGS)
+        default_fossl_verification_settings = ''
+        for defaultBehavior in property_detail['ruleTree']['rules']['behaviors']:
+            if defaultBehavior['name'] == 'origin':
+                default_fossl_verification_settings = defaultBehavior['options']['verificationMode']
+
+        for i in range(len(property_detail['origins'])):
+            originJson = origin_template.render(hostname=property_detail['hostnames'][i],
+                                                origin_name=property_detail['origins'][i],
+                                                forward_host_header=property_detail['forwardHostHeader'][i])
+            cpcodeJson = cpcode_template.render()
+            cpcodeJson['options']['value']['id'] = cpcodeList[property_detail['hostnames'][i]]
+
+            # update new origin behaviors to match verification setting of default rule
+            if default_fossl_verification_settings == 'PLATFORM_SETTINGS':
+                originJson['behaviors'][0]['options']['verificationMode'] = 'PLATFORM_SETTINGS'
+                platform_setting_keys_to_remove = ['customValidCnValues', 'originCertsToHonor', 'standardCertificateAuthorities']
+                for key in platform_setting_keys_to_remove:
+                    del originJson['behaviors'][0]['options'][key]
+
+            originJson['behaviors'].append(cpcodeJson)
+            parent_rule['children'].append(originJson)
+
+        return parent_rule
 
     def validate_group_id(self, onboard, groups) -> None:
         for group in groups:
@@ -1252,32 +1219,24 @@ class utility:
         logger.info(f'TOTAL DURATION: {elapse_time}, End Akamai CLI onboard')
 
     def validate_hostnames(self, hostnames) -> int:
-        # ensure hostname doesn't contain special characters and is of valid length
-        reg = re.compile(r'[^\.\-a-zA-Z0-9]')
-        error_count = 0
-        for hostname in hostnames:
-            if re.search(reg, hostname):
-                logger.error(f'{hostname} contains invalid character. Only alphanumeric (a-z, A-Z, 0-9) and hyphen (-) characters are supported.')
-                error_count += 1
-            if len(hostname) > 60 and len(hostname) < 4:
-                logger.error(f'{hostname} is invalid length. Hostname length must be between 4-60 characters')
-                error_count += 1
-            if (hostname[0] == '-') or (hostname[-1] == '-'):
-                logger.error(f'{hostname} cannot begin or end with a hyphen.')
-                error_count += 1
-        return error_count
-
-    def csv_2_appsec_array(self, onboard_object, delete=False) -> dict:
+        """
+        Function to check hostname characters, length and duplicates, returns the error count
+        """
+        check = csv_validation.check_hostnames(hostnames)
+        csv_validation.report(check.errors, check.error_count)
+        return check.error_count
+
+    def csv_2_appsec_array(self, onboard_object, rows, delete=False) -> dict:
         hostname_list = []
         appsec_json = {}
 
         if delete:
-            for i, row in enumerate(onboard_object.csv_dict):
+            for i, row in enumerate(rows):
 
                 hostname_list.append(row['hostname'])
 
         else:
-            for i, row in enumerate(onboard_object.csv_dict):
+            for i, row in enumerate(rows):
                 policyName = row['matchTargetId']
                 # Check if policyName already exists in dictionary and append hostname to list
                 if policyName in appsec_json.keys():
@@ -1295,6 +1254,7 @@ class utility:
         onboard_object.hostname_list = hostname_list
 
     def validate_waf_config_name(self, wrapper_object, config_name: str | None = None) -> int:
+        import pandas as pd
         if config_name:
             config_detail = self.getWafConfigIdByName(wrapper_object, config_name)
             if config_detail['Found']:
@@ -1315,6 +1275,7 @@ class utility:
             return onboard_waf_config_id, onboard_waf_prev_version, df
 
     def list_waf_policy(self, wrapper_object, config_id, version, policy_name: str | None = None) -> str:
+        import pandas as pd
         _, policies = wrapper_object.get_waf_policy_from_config(config_id, version)
         if not policies:
             sys.exit(logger.error('This configuration does not have any policy'))
@@ -1339,6 +1300,7 @@ class utility:
                     return None, policies
         return policy_str_id, policies
 
+    @timed('csv')
     def csv_2_appsec_create_by_hostname(self, csv_file_loc: str):
         schema = {'waf_config_name': {'type': 'string',
                                       'empty': False,
@@ -1365,6 +1327,7 @@ class utility:
 
         return valid, data
 
+    @timed('csv')
     def csv_2_appsec_create_by_propertyname(self, csv_file_loc: str):
         schema = {'property_name': {'type': 'string',
                                     'empty': False,
@@ -1436,10 +1399,12 @@ class utility:
                     return False
         return True
 
+    @timed('validation')
     def validate_appsec_pre_create(self, main_object, wrap_api, util_waf, selectable_df):
         """
         Function to validate inputs for appsec-create
         """
+        import pandas as pd
         count = 0
         by = main_object.template
         csv = main_object.csv
@@ -1470,11 +1435,13 @@ class utility:
 
             # validate property
             invalid_property = []
+            property_index = PropertyNameIndex(wrap_api)
+            property_index.resolve(all_property)
             for property in all_property:
-                if wrap_api.property_exists(property) is False:
+                if property_index.exists(property) is False:
                     invalid_property.append(property)
                 else:
-                    property_df = pd.DataFrame(wrap_api.get_property_id(property))
+                    property_df = pd.DataFrame(property_index.get_property_id(property))
                     if not activate:
                         new_df = property_df[property_df['stagingStatus'] == 'ACTIVE']
                     else:
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
+import copy
 import json
 import os
 import shutil
 import sys
 import time
-from pathlib import Path
 from time import gmtime
 from time import strftime
 
 from exceptions import setup_logger
 from poll import pollActivation
+from poll import PollStrategy
 from rich import print_json
+from tabulate import tabulate
+from worker_pool import run_in_pool
 
 logger = setup_logger()
 
 
+def merge_error_hint(config) -> str:
+    if getattr(config, 'merge_engine', 'native') == 'pipeline':
+        return ('Please check temp_pm folder to see if merge output file was created in dist folder '
+                'and/or devops-log.log for more details')
+    return 'Please check the template and variables files reported above'
+
+
 class papiFunctions:
+    def __init__(self, poll_strategy: PollStrategy | None = None):
+        self.poll_strategy = poll_strategy if poll_strategy is not None else PollStrategy()
+
     def activate_and_poll(self, wrapper_object, property_name,
                         contract_id, group_id, property_id, version,
                         network, emailList: list, notes):
@@ -31,8 +44,8 @@ class papiFunctions:
         if act_response.status_code == 201:
             activation_status = False
             activation_id = act_response.json()['activationLink'].split('?')[0].split('/')[-1]
+            attempt = 0
             while activation_status is False:
-                print('Polling 30s...')
                 activation_status_response = wrapper_object.pollActivationStatus(contract_id,
                                                                                  group_id,
                                                                                  property_id,
@@ -42,7 +55,10 @@ class papiFunctions:
                         if each_activation['activationId'] == activation_id:
                             if network in each_activation['network']:
                                 if each_activation['status'] != 'ACTIVE':
-                                    time.sleep(30)
+                                    interval = self.poll_strategy.delay(attempt, self.poll_strategy.eta(each_activation))
+                                    print(f'Polling {interval:.0f}s...')
+                                    time.sleep(interval)
+                                    attempt += 1
                                 elif each_activation['status'] == 'ACTIVE':
                                     end_time = time.perf_counter()
                                     elapse_time = str(strftime('%H:%M:%S', gmtime(end_time - start_time)))
@@ -64,12 +80,17 @@ class papiFunctions:
 
     def batch_activate_and_poll(self, wrapper_object, propertyDict,
                         contract_id, group_id, version,
-                        network, emailList: list, notes):
+                        network, emailList: list, notes, journal=None):
         """
         Function to activate a property to Akamai Staging or Production network.
+        Activations already submitted by a resumed run are polled instead of submitted again.
         """
 
         for i, activation in enumerate(propertyDict):
+            if journal is not None and journal.get(activation['propertyName'], 'activation', network):
+                propertyDict[i]['activationId'] = journal.get(activation['propertyName'], 'activation', network)['activationId']
+                logger.warning(f'Activation already started for {activation["propertyName"]} on Akamai {network} network')
+                continue
             logger.warning(f'Preparing to activate property {activation["propertyName"]} on Akamai {network} network')
             act_response = wrapper_object.activateConfiguration(contract_id, group_id, activation['propertyId'],
                                                                 version, network, emailList, notes)
@@ -77,13 +98,16 @@ class papiFunctions:
                 activation_status = False
                 activation_id = act_response.json()['activationLink'].split('?')[0].split('/')[-1]
                 propertyDict[i]['activationId'] = activation_id
+                if journal is not None:
+                    journal.record(activation['propertyName'], 'activation', network, activationId=activation_id)
                 logger.warning(f'Activation started for {activation["propertyName"]} on Akamai {network} network')
 
             else:
                 logger.error(json.dumps(act_response.json(), indent=4))
                 propertyDict[i]['activationId'] = 0
 
-        all_properties_active, activationDict = pollActivation(propertyDict, wrapper_object, contract_id, group_id, network)
+        all_properties_active, activationDict = pollActivation(propertyDict, wrapper_object, contract_id, group_id, network,
+                                                               poll_strategy=self.poll_strategy)
         failed_activations = (list(filter(lambda x: x['activationStatus'][network] not in ['ACTIVE'], activationDict)))
         successful_activations = (list(filter(lambda x: x['activationStatus'][network] in ['ACTIVE'], activationDict)))
         success_onboarded_hostnames = (list(map(lambda x: x['hostnames'], successful_activations)))
@@ -108,6 +132,56 @@ class papiFunctions:
             sys.exit(logger.error('Unable to create new cpcode'))
         return int(new_cpcode)
 
+    def existing_cpcodes(self, wrapper_object, contract_id, group_id, product_id) -> dict:
+        """
+        Function to list the cpcodes of the contract/group once, name -> cpcode id for cpcodes usable with product_id
+        """
+        resp = wrapper_object.listCpcodes(contract_id, group_id)
+        if resp.status_code != 200:
+            logger.warning(f'Unable to list existing cpcodes {resp.status_code}, creating all of them')
+            return {}
+        existing = {}
+        for cpcode in resp.json()['cpcodes']['items']:
+            if product_id in cpcode.get('productIds', [product_id]):
+                existing.setdefault(cpcode['cpcodeName'], int(cpcode['cpcodeId'].replace('cpc_', '')))
+        logger.debug(f'{len(existing)} existing cpcodes for {product_id}')
+        return existing
+
+    def provision_cpcodes(self, wrapper_object, cpcode_names: list,
+                          contract_id, group_id, product_id, workers: int = 1, on_create=None) -> tuple[dict, dict]:
+        """
+        Function to get a cpcode for every name. Existing cpcodes with exactly the same name are reused,
+        the others are created by up to `workers` at once and passed to on_create(name, cpcode) as soon as they exist.
+        Returns name -> cpcode id and name -> error for the names that could not be created.
+        """
+        names = list(dict.fromkeys(cpcode_names))
+        if not names:
+            return {}, {}
+        existing = self.existing_cpcodes(wrapper_object, contract_id, group_id, product_id)
+        cpcodes = {name: existing[name] for name in names if name in existing}
+        for name, cpcode in cpcodes.items():
+            logger.info(f"Reusing cpcode: '{name}', id: {cpcode}")
+
+        def create(name: str) -> int:
+            resp = wrapper_object.createCpcode(contract_id, group_id, product_id, name)
+            if resp.status_code != 201:
+                raise RuntimeError(f'{resp.status_code} {resp.text}')
+            cpcode = int(resp.json()['cpcodeLink'].split('?')[0].split('/')[-1].replace('cpc_', ''))
+            logger.info(f"Created new cpcode: '{name}', id: {cpcode}")
+            if on_create is not None:
+                on_create(name, cpcode)
+            return cpcode
+
+        pending = [name for name in names if name not in cpcodes]
+        errors = {}
+        for name, cpcode, error in run_in_pool(create, pending, workers):
+            if error is None:
+                cpcodes[name] = cpcode
+            else:
+                errors[name] = error
+        logger.warning(f'cpcodes: {len(names) - len(pending)} reused, {len(pending) - len(errors)} created, {len(errors)} failed')
+        return cpcodes, errors
+
     def create_update_pm(self, config, onboard_object, wrapper_object, utility_object, cli_mode: str | None = None):
         """
         Function with multiple goals:
@@ -166,34 +240,20 @@ class papiFunctions:
         if onboard_object.use_file:
             # Do Akamai pipeline merge from file
             logger.debug(f'{onboard_object.onboard_default_cpcode=}')
-            if utility_object.doCliPipelineMerge(config, onboard_object, create_mode=True, merge_type='pm'):
-                logger.info('Merged variables and values via CLI pipeline')
-
-                # Update property with value substituted json
-                with open(os.path.join('temp_pm', 'dist', 'test.temp_pm.papi.json')) as updateTemplateFile:
-                    updateContent = json.load(updateTemplateFile)
+            updateContent = utility_object.mergeRuleTree(config, onboard_object, create_mode=True)
+            if updateContent is not None:
+                logger.info(f'Merged variables and values via {config.merge_engine} merge engine')
             else:
-                sys.exit(logger.error('Unable to merge variables and values '
-                                      'Please check temp_pm folder to see '
-                                      'if merge output file was created in dist folder '
-                                      'and/or devops-log.log for more details'))
+                sys.exit(logger.error(f'Unable to merge variables and values. {merge_error_hint(config)}'))
 
         elif onboard_object.use_folder:
             # Do Akamai pipeline merge from folder path
             logger.info('Trying to create property rules json from merging files specified in folder_info')
-            if utility_object.doCliPipelineMerge(config, onboard_object, create_mode=False, merge_type='pm'):
+            updateContent = utility_object.mergeRuleTree(config, onboard_object, create_mode=False)
+            if updateContent is not None:
                 logger.info('Successfully merged variables and values from folder_info')
-
-                # Update property with value substituted json
-                with open(os.path.join('temp_pm', 'dist',
-                                       f'{onboard_object.env_name}.temp_pm.papi.json')
-                         ) as updateTemplateFile:
-                    updateContent = json.load(updateTemplateFile)
             else:
-                sys.exit(logger.error('Unable to merge variables and values from folder_info. '
-                                      'Please check temp_pm folder to see '
-                                      'if merge output file was created in dist folder '
-                                      'and/or devops-log.log for more details'))
+                sys.exit(logger.error(f'Unable to merge variables and values from folder_info. {merge_error_hint(config)}'))
 
         # Update the json data to include is_secure if its a secure network enabled config
         # Values have already been validated
@@ -312,129 +372,223 @@ class papiFunctions:
             logger.error(f'Unknown edge_hostname_mode: {onboard_object.edge_hostname_mode}')
             return (-1)
 
-    def batch_create_update_pm(self, config, onboard_object, wrapper_object, utility_object, propertyDict, cpcodeList):
+    def batch_create_update_pm(self, config, onboard_object, wrapper_object, utility_object, propertyDict,
+                               use_cpcode: int | None = None, workers: int = 1, journal=None):
         """
         Function with multiple goals:
-            1. Create a property
-            2. Update the property with template rules define
+            1. Create cpcode for each hostname, reusing existing cpcodes with the same name
+            2. Create a property
+            3. Update the property hostnames and template rules define
+
+        Properties are provisioned by up to `workers` at once, steps of one property always run in order.
+        Completed steps are recorded in journal, steps already in it are not repeated.
+        Returns successfully created properties and the per-property failures.
         """
-        propertyIds = []
-        for propertyName in propertyDict:
-            # set property name and hostnames the dict key value
-            onboard_object.property_name = propertyName
-            onboard_object.public_hostnames = propertyDict[propertyName]['hostnames']
-            create_property_response = wrapper_object.createProperty(onboard_object.contract_id,
-                                                                    onboard_object.group_id,
-                                                                    onboard_object.product_id,
-                                                                    onboard_object.property_name)
-            if create_property_response.status_code == 201:
-                onboard_object.onboard_property_id = create_property_response.json()['propertyLink'].split('?')[0].split('/')[-1]
+        # cpcodes for every hostname first, skipping the ones a resumed run already has,
+        # each new cpcode is journaled right away so an interrupted run never creates it twice
+        cpcodes, cpcode_errors = {}, {}
+        if not use_cpcode:
+            owners = {hostname: propertyName for propertyName, property_detail in propertyDict.items()
+                      for hostname in property_detail['hostnames']
+                      if journal is None or not journal.get(propertyName, 'cpcode', hostname)}
+
+            def journal_cpcode(hostname: str, cpcode: int) -> None:
+                if journal is not None:
+                    journal.record(owners[hostname], 'cpcode', hostname, cpcode=cpcode)
+
+            cpcodes, cpcode_errors = self.provision_cpcodes(wrapper_object, list(owners), onboard_object.contract_id,
+                                                            onboard_object.group_id, onboard_object.product_id,
+                                                            workers=workers, on_create=journal_cpcode)
+
+        if workers > 1:
+            logger.warning(f'Provisioning {len(propertyDict)} properties using {workers} workers')
+        results = run_in_pool(lambda propertyName: self.batch_create_property(onboard_object, wrapper_object, utility_object,
+                                                                               propertyName, propertyDict[propertyName],
+                                                                               use_cpcode, journal,
+                                                                               cpcodes, cpcode_errors),
+                              list(propertyDict), workers)
+
+        propertyIds, failed_properties = [], []
+        for propertyName, result, error in results:
+            if error is None and result['failedStep'] == '':
                 propertyIds.append({
-                    'propertyId': onboard_object.onboard_property_id,
-                    'propertyName': onboard_object.property_name,
-                    'hostnames': onboard_object.public_hostnames
+                    'propertyId': result['propertyId'],
+                    'propertyName': propertyName,
+                    'hostnames': result['hostnames']
                 })
+            else:
+                if error is not None:
+                    result = {'propertyName': propertyName, 'failedStep': 'unknown', 'error': error}
+                failed_properties.append(result)
 
-                logger.info(f"Created property name: '{onboard_object.property_name}', id: {onboard_object.onboard_property_id}")
+        if failed_properties:
+            print()
+            logger.error(f'Unable to provision {len(failed_properties)} of {len(propertyDict)} properties')
+            table = [[x['propertyName'], x['failedStep'], x['error']] for x in failed_properties]
+            logger.error(f"\n{tabulate(table, headers=['propertyName', 'failed step', 'error'], tablefmt='psql')}")
+        return (propertyIds, failed_properties)
+
+    def batch_create_property(self, onboard_object, wrapper_object, utility_object, propertyName, property_detail,
+                              use_cpcode: int | None = None, journal=None,
+                              cpcodes: dict | None = None, cpcode_errors: dict | None = None) -> dict:
+        """
+        Function to run cpcode -> createProperty -> updatePropertyHostname -> updatePropertyRules for one property.
+        onboard_object is shared by all workers so only settings common to every property are read from it.
+        cpcodes/cpcode_errors are the hostname results of provision_cpcodes, hostnames missing from both get a new cpcode here.
+        """
+        cpcodes = cpcodes or {}
+        cpcode_errors = cpcode_errors or {}
+        result = {'propertyName': propertyName,
+                  'propertyId': None,
+                  'hostnames': property_detail['hostnames'],
+                  'cpcodes': {},
+                  'failedStep': '',
+                  'error': ''}
+
+        def failed(step: str, error: str) -> dict:
+            logger.error(f'{propertyName}: {error}')
+            result['failedStep'] = step
+            result['error'] = error
+            return result
+
+        def journaled(step: str, key: str = '') -> dict | None:
+            return journal.get(propertyName, step, key) if journal is not None else None
+
+        def record(step: str, key: str = '', **data) -> None:
+            if journal is not None:
+                journal.record(propertyName, step, key, **data)
+
+        # create new cpcode for each hostname
+        for hostname in property_detail['hostnames']:
+            if use_cpcode:
+                result['cpcodes'][hostname] = int(use_cpcode)
+                continue
+            if hostname in cpcodes:
+                result['cpcodes'][hostname] = cpcodes[hostname]
+                # new cpcodes were journaled by provision_cpcodes, reused ones are recorded here
+                if not journaled('cpcode', hostname):
+                    record('cpcode', hostname, cpcode=cpcodes[hostname])
+                continue
+            if journaled('cpcode', hostname):
+                result['cpcodes'][hostname] = journaled('cpcode', hostname)['cpcode']
+                logger.info(f"Reusing cpcode: '{hostname}', id: {result['cpcodes'][hostname]}")
+                continue
+            if hostname in cpcode_errors:
+                return failed('cpcode', f'Unable to create new cpcode {hostname}: {cpcode_errors[hostname]}')
+            try:
+                result['cpcodes'][hostname] = self.create_new_cpcode(onboard_object, wrapper_object, hostname,
+                                                                     onboard_object.contract_id,
+                                                                     onboard_object.group_id,
+                                                                     onboard_object.product_id)
+            except SystemExit:
+                return failed('cpcode', f'Unable to create new cpcode {hostname}')
+            record('cpcode', hostname, cpcode=result['cpcodes'][hostname])
+
+        if journaled('createProperty'):
+            property_id = journaled('createProperty')['propertyId']
+            result['propertyId'] = property_id
+            logger.info(f"Reusing property name: '{propertyName}', id: {property_id}")
+        else:
+            create_property_response = wrapper_object.createProperty(onboard_object.contract_id,
+                                                                     onboard_object.group_id,
+                                                                     onboard_object.product_id,
+                                                                     propertyName)
+            if create_property_response.status_code == 201:
+                property_id = create_property_response.json()['propertyLink'].split('?')[0].split('/')[-1]
+                result['propertyId'] = property_id
+                logger.info(f"Created property name: '{propertyName}', id: {property_id}")
+                record('createProperty', propertyId=property_id)
             else:
-                logger.error('Unable to create property')
-                sys.exit(logger.error(json.dumps(create_property_response.json(), indent=4)))
+                logger.error(json.dumps(create_property_response.json(), indent=4))
+                return failed('createProperty', 'Unable to create property')
 
+        if journaled('updatePropertyHostname'):
+            logger.info(f'Hostnames already updated for {propertyName}')
+        else:
             # Do edgehostname logic
-            edgeHostname_id = self.batch_process_ehn(onboard_object, wrapper_object, utility_object)
-
             secure_by_default = False
             secure_by_default_create_ehn = False
             if onboard_object.edge_hostname_mode == 'secure_by_default':
                 secure_by_default = True
-            edgehostname_list = wrapper_object.bulkCreateEdgehostnameArray(onboard_object.public_hostnames,
-                                                                    propertyDict[propertyName]['edgeHostnames'],
-                                                                    secure_by_default,
-                                                                    secure_by_default_create_ehn)
+            edgehostname_list = wrapper_object.bulkCreateEdgehostnameArray(property_detail['hostnames'],
+                                                                           property_detail['edgeHostnames'],
+                                                                           secure_by_default,
+                                                                           secure_by_default_create_ehn)
 
             # Update property hostnames and edgehostnames
             property_update_reponse = wrapper_object.updatePropertyHostname(onboard_object.contract_id,
                                                                             onboard_object.group_id,
-                                                                            onboard_object.onboard_property_id,
+                                                                            property_id,
                                                                             json.dumps(edgehostname_list))
             if property_update_reponse.status_code == 200:
                 if onboard_object.edge_hostname_mode == 'secure_by_default':
-                    logger.warning('Secure by default Tokens')
+                    logger.warning(f'Secure by default Tokens {propertyName}')
                     property_update_response_json = property_update_reponse.json()
                     for hostname in property_update_response_json['hostnames']['items']:
                         property_update_response_sbd_token = hostname['certStatus']['validationCname']
                         logger.info(f'{property_update_response_sbd_token}')
                 else:
-                    logger.info(f'Updated public hostname {onboard_object.public_hostnames}, '
-                                f"and edge hostname '{propertyDict[propertyName]['edgeHostnames']}'")
+                    logger.info(f"Updated public hostname {property_detail['hostnames']}, "
+                                f"and edge hostname '{property_detail['edgeHostnames']}'")
             else:
                 logger.info(onboard_object.edge_hostname_mode)
-                logger.error(f'Unable to update public hostname {onboard_object.public_hostnames}, '
-                            f"and edge hostname '{propertyDict[propertyName]['edgeHostnames']}'")
-                sys.exit(logger.error(json.dumps(property_update_reponse.json(), indent=4)))
+                logger.error(json.dumps(property_update_reponse.json(), indent=4))
+                return failed('updatePropertyHostname',
+                              f"Unable to update public hostname {property_detail['hostnames']}, "
+                              f"and edge hostname '{property_detail['edgeHostnames']}'")
+            record('updatePropertyHostname', hostnames=property_detail['hostnames'])
 
-            # Update the json data to include is_secure if its a secure network enabled config
-            # Values have already been validated
+        if journaled('updatePropertyRules'):
+            logger.info(f'Rules already updated for {propertyName}')
+            return result
 
-            updateContent = propertyDict[propertyName]['ruleTree']
-
-            if onboard_object.secure_network == 'ENHANCED_TLS':
-                updateContent['rules']['options'] = dict()
-                updateContent['rules']['options']['is_secure'] = True
-            else:
-                # This is a non-secure configuration
-                updateContent['rules']['options'] = dict()
-                updateContent['rules']['options']['is_secure'] = False
-            updateContent['comments'] = onboard_object.version_notes
-            updateContent['ruleFormat'] = onboard_object.rule_format
-
-            try:
-                # look for the cpcode and origin behavior in the default rule and update it with origin hostname and custom forwardHostHeader
-                first_hostname = propertyDict[propertyName]['hostnames'][0]
-                first_origin = propertyDict[propertyName]['origins'][0]
-                forward_host_header = propertyDict[propertyName]['forwardHostHeader'][0]
-                for each_behavior in updateContent['rules']['behaviors']:
-                    if each_behavior['name'] == 'cpCode':
-                        each_behavior['options']['value']['id'] = cpcodeList[first_hostname]
-                        logger.info(f'Updated default rule with with cpcode name: {first_hostname} id: {cpcodeList[first_hostname]}')
-                    if each_behavior['name'] == 'origin':
-                        each_behavior['options']['hostname'] = first_origin
-                        each_behavior['options']['forwardHostHeader'] = forward_host_header
-            except:
-                # cp code behavior didn't exist in default rule for some reason so must be error with template and error
-                sys.exit(logger.error('Unable to update default rule cpcode and origin hostname'))
-
-            try:
-                onboard_object.level_0_rules.insert(0, propertyDict[propertyName]['originRule'])
-                updateContent['rules'].update({'children': onboard_object.level_0_rules})
-                self.reset_level_0_rules(onboard_object)
-            except KeyError:
-                updateContent['rules']['children'] = onboard_object.level_0_rules
-                self.reset_level_0_rules(onboard_object)
-
-            # Update Property Rules
-            updateRulesResponse = wrapper_object.updatePropertyRules(onboard_object.contract_id,
-                                                                    onboard_object.group_id,
-                                                                    onboard_object.onboard_property_id,
-                                                                    onboard_object.rule_format,
-                                                                    ruletree=json.dumps(updateContent))
-
-            if updateRulesResponse.status_code == 200:
-                logger.info('Updated property with rules')
-                print()
-            else:
-                logger.error('Unable to update rules for property')
-                sys.exit(logger.error(json.dumps(updateRulesResponse.json(), indent=4)))
+        # Update the json data to include is_secure if its a secure network enabled config
+        # Values have already been validated
+        # every property gets its own copy, rule tree from template is shared by all properties
+        updateContent = copy.deepcopy(property_detail['ruleTree'])
+        updateContent['rules']['options'] = dict()
+        if onboard_object.secure_network == 'ENHANCED_TLS':
+            updateContent['rules']['options']['is_secure'] = True
+        else:
+            # This is a non-secure configuration
+            updateContent['rules']['options']['is_secure'] = False
+        updateContent['comments'] = onboard_object.version_notes
+        updateContent['ruleFormat'] = onboard_object.rule_format
 
-        return (propertyIds)
+        try:
+            # look for the cpcode and origin behavior in the default rule and update it with origin hostname and custom forwardHostHeader
+            first_hostname = property_detail['hostnames'][0]
+            first_origin = property_detail['origins'][0]
+            forward_host_header = property_detail['forwardHostHeader'][0]
+            for each_behavior in updateContent['rules']['behaviors']:
+                if each_behavior['name'] == 'cpCode':
+                    each_behavior['options']['value']['id'] = result['cpcodes'][first_hostname]
+                    logger.info(f"Updated default rule with with cpcode name: {first_hostname} id: {result['cpcodes'][first_hostname]}")
+                if each_behavior['name'] == 'origin':
+                    each_behavior['options']['hostname'] = first_origin
+                    each_behavior['options']['forwardHostHeader'] = forward_host_header
+        except:
+            # cp code behavior didn't exist in default rule for some reason so must be error with template and error
+            return failed('updatePropertyRules', 'Unable to update default rule cpcode and origin hostname')
+
+        level_0_rules = copy.deepcopy(onboard_object.level_0_rules)
+        origin_rule = utility_object.build_origin_rule(property_detail, result['cpcodes'])
+        if origin_rule is not None:
+            level_0_rules.insert(0, origin_rule)
+        updateContent['rules']['children'] = level_0_rules
 
-    def reset_level_0_rules(self, onboard_object):
-        home = str(Path.home())
-        cli_path = f'{home}/.akamai-cli/src/cli-onboard/templates/akamai_product_templates/behaviors'
-        templateFile = onboard_object.source_template_file
-        with open(templateFile) as templateHandler:
-            templateData = json.load(templateHandler)
+        # Update Property Rules
+        updateRulesResponse = wrapper_object.updatePropertyRules(onboard_object.contract_id,
+                                                                 onboard_object.group_id,
+                                                                 property_id,
+                                                                 onboard_object.rule_format,
+                                                                 ruletree=json.dumps(updateContent))
 
-        # update template to include origin and cpCode behaviors in default rule if they don't exist
-        default_behaviors = templateData['rules']['behaviors']
-        onboard_object.level_0_rules = templateData['rules']['children']
+        if updateRulesResponse.status_code == 200:
+            logger.info(f'Updated property {propertyName} with rules')
+            print()
+        else:
+            logger.error(json.dumps(updateRulesResponse.json(), indent=4))
+            return failed('updatePropertyRules', 'Unable to update rules for property')
+        record('updatePropertyRules')
+        return result
@@ -1,22 +1,171 @@
 from __future__ import annotations
 
+import copy
 import datetime
 import json
 import re
 import sys
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import ALL_COMPLETED
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from time import gmtime
 from time import strftime
 
 from exceptions import setup_logger
+from poll import POLL_WORKERS
+from poll import PollStrategy
 from rich.live import Live
 from rich.table import Table
+from worker_pool import run_in_pool
 
 logger = setup_logger()
+
+ACTIVATION_WORKERS = 10
+WAF_FAILED_STATUS = ['FAILED', 'ABORTED']
+# how often to look for activation ids while submissions are still running
+SUBMISSION_CHECK = 0.5
 dot = ' '
 
 
+class SelectedHosts:
+    """
+    Selected hosts per (config_id, version), changed with the selected-hostnames append and
+    remove modes instead of a read-modify-write of the whole list.
+
+    The selected hosts of a config version are read once and kept up to date, so hostnames
+    already selected are not appended, hostnames not selected are not removed and a change
+    with nothing left to send makes no call.
+    """
+    def __init__(self, wrapper_object):
+        self.wrapper_object = wrapper_object
+        self.selected = {}
+        self._lock = threading.Lock()
+
+    def load(self, config_id, version) -> set | None:
+        key = (str(config_id), str(version))
+        if key not in self.selected:
+            resp = self.wrapper_object.getWafSelectedHosts(config_id, version)
+            if not resp.ok:
+                logger.error(json.dumps(resp.json(), indent=4))
+                return None
+            self.selected[key] = {host['hostname'] for host in resp.json().get('hostnameList', [])}
+        return self.selected[key]
+
+    def created(self, config_id, version, hostnames) -> None:
+        """
+        Record the selected hosts of a config version this run just created, it is not read back
+        """
+        with self._lock:
+            self.selected[(str(config_id), str(version))] = set(hostnames)
+
+    def add(self, config_id, version, hostnames) -> tuple[bool, list]:
+        return self.change(config_id, version, 'append', hostnames)
+
+    def remove(self, config_id, version, hostnames) -> tuple[bool, list]:
+        return self.change(config_id, version, 'remove', hostnames)
+
+    def change(self, config_id, version, mode: str, hostnames) -> tuple[bool, list]:
+        """
+        Send only the hostnames the mode changes, returns success and those hostnames
+        """
+        key = (str(config_id), str(version))
+        with self._lock:
+            selected = self.load(config_id, version)
+            if selected is None:
+                return False, []
+            if mode == 'append':
+                delta = [h for h in dict.fromkeys(hostnames) if h not in selected]
+            else:
+                delta = [h for h in dict.fromkeys(hostnames) if h in selected]
+            if not delta:
+                logger.debug(f'selected hosts of config {config_id} version {version} already up to date')
+                return True, delta
+            payload = {'hostnameList': [{'hostname': hostname} for hostname in delta], 'mode': mode}
+            resp = self.wrapper_object.modifyWafHosts(config_id, version, json.dumps(payload))
+            if not resp.ok:
+                logger.error(json.dumps(resp.json(), indent=4))
+                # the list on the server is unknown now, read it again next time
+                self.selected.pop(key, None)
+                return False, delta
+            if mode == 'append':
+                selected.update(delta)
+            else:
+                selected.difference_update(delta)
+            return True, delta
+
+
+class MatchTargetIndex:
+    """
+    Website match targets of one config version, fetched once and indexed by hostname,
+    target and policy, so hostnames are looked up instead of scanning every target.
+
+    Kept current with updated() after each successful match target change.
+    """
+    def __init__(self, config_id, version, targets: list):
+        self.config_id = config_id
+        self.version = version
+        self.targets = {}
+        self.hostname_targets = defaultdict(set)
+        self.target_policy = {}
+        self.policy_targets = defaultdict(list)
+        self._lock = threading.Lock()
+        for target in targets:
+            self.updated(target)
+
+    @classmethod
+    def fetch(cls, wrapper_object, config_id, version) -> MatchTargetIndex:
+        return cls(config_id, version, wrapper_object.getAllWebMatchTargets(config_id, version))
+
+    def target(self, target_id) -> dict | None:
+        """
+        Copy of the match target, safe to modify for a PUT
+        """
+        target = self.targets.get(int(target_id))
+        return copy.deepcopy(target) if target is not None else None
+
+    def targets_with(self, hostnames) -> dict:
+        """
+        Function to find the match targets holding any of the hostnames, returns {target_id: [hostname, ...]}
+        """
+        found = defaultdict(list)
+        for hostname in dict.fromkeys(hostnames):
+            for target_id in self.hostname_targets.get(hostname, ()):
+                found[target_id].append(hostname)
+        return dict(found)
+
+    def updated(self, target: dict) -> None:
+        """
+        Function to index a fetched match target or replace it after a successful modifyMatchTarget
+        """
+        target_id = int(target['targetId'])
+        policy_id = target['securityPolicy']['policyId']
+        with self._lock:
+            previous = self.targets.get(target_id)
+            if previous is not None:
+                for hostname in previous.get('hostnames', []):
+                    self.hostname_targets[hostname].discard(target_id)
+            if self.target_policy.get(target_id) != policy_id:
+                if target_id in self.target_policy:
+                    self.policy_targets[self.target_policy[target_id]].remove(target_id)
+                self.policy_targets[policy_id].append(target_id)
+            self.target_policy[target_id] = policy_id
+            self.targets[target_id] = target
+            for hostname in target.get('hostnames', []):
+                self.hostname_targets[hostname].add(target_id)
+
+
 class wafFunctions:
+    def __init__(self, poll_strategy: PollStrategy | None = None):
+        self.poll_strategy = poll_strategy if poll_strategy is not None else PollStrategy()
+        self.config_names = None
+        self.selected_hosts = None
+        self.match_targets = {}
+        self._lock = threading.Lock()
+
     def activateAndPoll(self, wrap_api, onboard_object, network):
         """
         Function to activate WAF configuration to Akamai Staging or Production network.
@@ -33,18 +182,19 @@ class wafFunctions:
         if act_response.status_code == 200:
             activation_status = False
             activation_id = act_response.json()['activationId']
+            attempt = 0
             while activation_status is False:
-                print('Polling 30s...')
                 polling_status_response = wrap_api.pollWafActivationStatus(activation_id)
 
                 logger.debug(json.dumps(polling_status_response.json(), indent=4))
                 logger.debug(polling_status_response.url)
                 if polling_status_response.status_code == 200:
                     if network in polling_status_response.json()['network']:
-                        if 'status' not in polling_status_response.json():
-                            time.sleep(30)
-                        elif polling_status_response.json()['status'] != 'ACTIVATED':
-                            time.sleep(30)
+                        if polling_status_response.json().get('status') != 'ACTIVATED':
+                            interval = self.poll_strategy.delay(attempt, self.poll_strategy.eta(polling_status_response.json()))
+                            print(f'Polling {interval:.0f}s...')
+                            time.sleep(interval)
+                            attempt += 1
                         elif polling_status_response.json()['status'] == 'ACTIVATED':
                             end_time = time.perf_counter()
                             elapse_time = str(strftime('%H:%M:%S', gmtime(end_time - start_time)))
@@ -84,18 +234,19 @@ class wafFunctions:
         if act_response.ok:
             activation_status = False
             activation_id = act_response.json()['activationId']
+            attempt = 0
             while activation_status is False:
-                print('Polling 30s...')
                 polling_status_response = wrap_api.pollWafActivationStatus(activation_id)
 
                 logger.debug(json.dumps(polling_status_response.json(), indent=4))
                 logger.debug(polling_status_response.url)
                 if polling_status_response.ok:
                     if network in polling_status_response.json()['network']:
-                        if 'status' not in polling_status_response.json():
-                            time.sleep(30)
-                        elif polling_status_response.json()['status'] != 'ACTIVATED':
-                            time.sleep(30)
+                        if polling_status_response.json().get('status') != 'ACTIVATED':
+                            interval = self.poll_strategy.delay(attempt, self.poll_strategy.eta(polling_status_response.json()))
+                            print(f'Polling {interval:.0f}s...')
+                            time.sleep(interval)
+                            attempt += 1
                         elif polling_status_response.json()['status'] == 'ACTIVATED':
                             end_time = time.perf_counter()
                             elapse_time = str(strftime('%H:%M:%S', gmtime(end_time - start_time)))
@@ -119,71 +270,29 @@ class wafFunctions:
         logger.debug(act_response.url)
         return False
 
+    def selected_hosts_of(self, wrapper_object) -> SelectedHosts:
+        with self._lock:
+            if self.selected_hosts is None or self.selected_hosts.wrapper_object is not wrapper_object:
+                self.selected_hosts = SelectedHosts(wrapper_object)
+            return self.selected_hosts
+
     def addHostnames(self, wrapper_object, hostname_list, config_id, version):
         """
-        Function to fetch and update Match Target
+        Function to add hostnames to the selected hosts, only the ones not selected yet are sent
         """
         logger.debug(f'{hostname_list}, config_id: {config_id}, version: {version}')
-        selected_hosts_response = wrapper_object.getWafSelectedHosts(config_id, version)
-        logger.debug(selected_hosts_response.url)
-        logger.debug(selected_hosts_response.status_code)
-        if selected_hosts_response.ok:
-            # Update the hostnames here
-            updated_json_data = selected_hosts_response.json()
-            logger.debug(json.dumps(updated_json_data, indent=4))
-            for every_hostname in hostname_list:
-                host_entry = dict()
-                host_entry['hostname'] = every_hostname
-                updated_json_data['hostnameList'].append(host_entry)
-
-            # Now update the match target
-            modify_hosts_response = wrapper_object.modifyWafHosts(config_id,
-                                                                  version,
-                                                                  json.dumps(updated_json_data))
-            if modify_hosts_response.ok:
-                logger.debug(f'Created WAF configuration version: {version}')
-                return True
-            else:
-                logger.debug(modify_hosts_response.url)
-                logger.debug(modify_hosts_response.status_code)
-                logger.error(json.dumps(modify_hosts_response.json(), indent=4))
-                return False
-        else:
-            logger.error(json.dumps(selected_hosts_response.json(), indent=4))
-            return False
+        success, _ = self.selected_hosts_of(wrapper_object).add(config_id, version, hostname_list)
+        return success
 
     def removeHostnames(self, wrapper_object, hostname_list, config_id, version):
         """
-        Function to fetch and update Match Target
+        Function to remove hostnames from the selected hosts, only the ones currently selected are sent
         """
         logger.debug(f'{hostname_list}, config_id: {config_id}, version: {version}')
-        selected_hosts_response = wrapper_object.getWafSelectedHosts(config_id, version)
-        logger.debug(selected_hosts_response.url)
-        logger.debug(selected_hosts_response.status_code)
-        if selected_hosts_response.ok:
-            # Update the hostnames here
-            updated_json_data = selected_hosts_response.json()
-            removed_selected_hosts = list(filter(lambda x: x['hostname'] not in hostname_list, updated_json_data['hostnameList']))
-
-            hostnames_removed = (len(updated_json_data['hostnameList'])) - len(removed_selected_hosts)
-
-            updated_json_data['hostnameList'] = removed_selected_hosts
-            logger.debug(json.dumps(updated_json_data, indent=4))
-            # Now update the match target
-            modify_hosts_response = wrapper_object.modifyWafHosts(config_id,
-                                                                  version,
-                                                                  json.dumps(updated_json_data))
-            if modify_hosts_response.ok:
-                logger.debug(f'Created WAF configuration version: {version}')
-                return True, hostnames_removed
-            else:
-                logger.debug(modify_hosts_response.url)
-                logger.debug(modify_hosts_response.status_code)
-                logger.error(json.dumps(modify_hosts_response.json(), indent=4))
-                return False, None
-        else:
-            logger.error(json.dumps(selected_hosts_response.json(), indent=4))
+        success, removed = self.selected_hosts_of(wrapper_object).remove(config_id, version, hostname_list)
+        if not success:
             return False, None
+        return True, len(removed)
 
     def get_security_policy(self, wrapper_object, config_id, version, policy_id):
         """
@@ -191,19 +300,45 @@ class wafFunctions:
         """
         return wrapper_object.get_security_policy(config_id, version, policy_id)
 
+    def match_target_index(self, wrapper_object, config_id, version) -> MatchTargetIndex:
+        """
+        Function to fetch the match targets of a config version once, later calls reuse the index
+        """
+        key = (str(config_id), str(version))
+        with self._lock:
+            if key not in self.match_targets:
+                self.match_targets[key] = MatchTargetIndex.fetch(wrapper_object, config_id, version)
+            return self.match_targets[key]
+
+    def match_target(self, wrapper_object, config_id, version, target_id) -> dict | None:
+        """
+        Function to get a Match Target from the index, targets created after the index was built are fetched
+        """
+        index = self.match_target_index(wrapper_object, config_id, version)
+        target = index.target(target_id)
+        if target is None:
+            match_target_response = wrapper_object.getMatchTarget(config_id, version, target_id)
+            logger.debug(json.dumps(match_target_response.json(), indent=4))
+            if not match_target_response.ok:
+                logger.error(json.dumps(match_target_response.json(), indent=4))
+                return None
+            index.updated(match_target_response.json())
+            target = index.target(target_id)
+        return target
+
     def updateMatchTarget(self, wrapper_object, hostname_list, config_id, version, target_id):
         """
         Function to fetch and update Match Target
         """
-        match_target_response = wrapper_object.getMatchTarget(config_id, version, target_id)
-        logger.debug(json.dumps(match_target_response.json(), indent=4))
-        if match_target_response.ok:
+        updated_json_data = self.match_target(wrapper_object, config_id, version, target_id)
+        if updated_json_data is not None:
             # Update the hostnames here
-            updated_json_data = match_target_response.json()
             if 'hostnames' in updated_json_data.keys():
-
-                for every_hostname in hostname_list:
-                    updated_json_data['hostnames'].append(every_hostname)
+                new_hostnames = [h for h in dict.fromkeys(hostname_list) if h not in updated_json_data['hostnames']]
+                if not new_hostnames:
+                    logger.debug(f'match target {target_id} already has {hostname_list}')
+                    return True, updated_json_data['securityPolicy']['policyId']
+                updated_json_data['hostnames'].extend(new_hostnames)
                 logger.debug(json.dumps(updated_json_data, indent=4))
 
                 # Now update the match target
@@ -211,6 +346,7 @@ class wafFunctions:
                                                                                 version, target_id,
                                                                                 json.dumps(updated_json_data))
                 if modify_match_target_response.status_code == 200:
+                    self.match_target_index(wrapper_object, config_id, version).updated(updated_json_data)
                     return True, updated_json_data['securityPolicy']['policyId']
                 else:
                     logger.error(json.dumps(modify_match_target_response.json(), indent=4))
@@ -219,31 +355,31 @@ class wafFunctions:
                 logger.info('This WAF policy already uses "ALL HOSTNAMES" as match target.')
                 return True, updated_json_data['securityPolicy']['policyId']
         else:
-            logger.error(json.dumps(match_target_response.json(), indent=4))
             return False, None
 
     def updateMatchTargetRemoveHosts(self, wrapper_object, remaining_hostname_list, config_id, version, target_id):
         """
         Function to fetch and update Match Target
         """
-        match_target_response = wrapper_object.getMatchTarget(config_id, version, target_id)
-        logger.debug(json.dumps(match_target_response.json(), indent=4))
-        if match_target_response.status_code == 200:
+        updated_json_data = self.match_target(wrapper_object, config_id, version, target_id)
+        if updated_json_data is not None:
             # Update the hostnames here
-            updated_json_data = match_target_response.json()
+            if updated_json_data.get('hostnames') == list(remaining_hostname_list):
+                logger.debug(f'match target {target_id} has no hostnames to remove')
+                return True
             updated_json_data['hostnames'] = remaining_hostname_list
             # Now update the match target
             modify_match_target_response = wrapper_object.modifyMatchTarget(config_id,
                                                                                 version, target_id,
                                                                                 json.dumps(updated_json_data))
             if modify_match_target_response.status_code == 200:
+                self.match_target_index(wrapper_object, config_id, version).updated(updated_json_data)
                 return True
             else:
                 logger.error(json.dumps(modify_match_target_response.json(), indent=4))
                 return False
 
         else:
-            logger.error(json.dumps(match_target_response.json(), indent=4))
             return False
 
     def createWafVersion(self, wrapper_object, onboard_obj, notes: str):
@@ -367,80 +503,153 @@ class wafFunctions:
         logger.error('Unable to create a match target')
         return False
 
-    def activation_detail(self, wrap_api, onboard_object, activate):
-        logger.warning(f'Activating Security Config on {activate} network')
-        count = 0
-        for i, appsec in enumerate(onboard_object):
-            config_id = onboard_object[i].onboard_waf_config_id
-            response = wrap_api.activateWafPolicy(config_id,
-                                            onboard_object[i].onboard_waf_config_version,
-                                            network='STAGING',
-                                            emails=onboard_object[i].notification_emails,
-                                            note=onboard_object[i].version_notes)
-            if response.ok:
-                onboard_object[i].activation_id = response.json()['activationId']
-                onboard_object[i].activation_create = response.json()['createDate']
-                onboard_object[i].activation_status = response.json()['status']
-                logger.debug(onboard_object[i])
-                logger.debug(f'wag_config_id {config_id} {onboard_object[i].activation_id}')
+    def config_name(self, wrap_api, config_id: int) -> str:
+        """
+        Function to get a security config name, every config is listed once with one getWafConfigurations call
+        """
+        with self._lock:
+            if self.config_names is None:
+                resp = wrap_api.getWafConfigurations()
+                configs = resp.json().get('configurations', []) if resp.ok else []
+                self.config_names = {int(config['id']): config['name'] for config in configs}
+            if config_id not in self.config_names:
+                self.config_names[config_id] = wrap_api.getWafConfigVersions(config_id).json()['configName']
+            return self.config_names[config_id]
+
+    def submit_activation(self, wrap_api, appsec, network: str) -> None:
+        config_id = appsec.onboard_waf_config_id
+        response = wrap_api.activateWafPolicy(config_id,
+                                              appsec.onboard_waf_config_version,
+                                              network=network,
+                                              emails=appsec.notification_emails,
+                                              note=appsec.version_notes)
+        if response.ok:
+            appsec.activation_create = response.json()['createDate']
+            appsec.activation_status = response.json()['status']
+            appsec.activation_id = response.json()['activationId']
+            logger.debug(appsec)
+            logger.debug(f'wag_config_id {config_id} {appsec.activation_id}')
+            return
+
+        activation_status = 'ACTIVATION_ERROR'
+        err_msg = ''
+        try:
+            err_msg = response.json()['detail']
+        except:
+            logger.error(response.json())
+
+        if 'MultipleConfigs' in err_msg:
+            if 'another pending process' in err_msg:
+                activation_status = f'{activation_status}\nHostnames involved in another pending process'
             else:
-                count += 1
-                activation_status = 'ACTIVATION_ERROR'
                 try:
-                    err_msg = response.json()['detail']
+                    old_config_id = re.findall(r'\d+', err_msg)
+                    old_config_id = int(old_config_id[0])
+                    old_config_name = self.config_name(wrap_api, old_config_id)
+                    activation_status = f'{activation_status}\nhostname conflict with config "{old_config_name}" [{old_config_id}]'
                 except:
-                    logger.error(response.json())
+                    logger.error(f'wag_config_id {config_id} {err_msg}')
+                    activation_status = f'{activation_status}\nconflict with multiple configs'
+        else:
+            # logger.error(f'wag_config_id {config_id} {err_msg}')
+            activation_status = f'{activation_status} - unable to process request'
+        appsec.activation_status = activation_status
 
-                if 'MultipleConfigs' in err_msg:
-                    if 'another pending process' in err_msg:
-                        activation_status = f'{activation_status}\nHostnames involved in another pending process'
-                    else:
-                        try:
-                            old_config_id = re.findall(r'\d+', err_msg)
-                            old_config_id = int(old_config_id[0])
-                            old_config_name = wrap_api.getWafConfigVersions(old_config_id).json()['configName']
-                            activation_status = f'{activation_status}\nhostname conflict with config "{old_config_name}" [{old_config_id}]'
-                        except:
-                            logger.error(f'wag_config_id {config_id} {err_msg}')
-                            activation_status = f'{activation_status}\nconflict with multiple configs'
-                else:
-                    # logger.error(f'wag_config_id {config_id} {err_msg}')
-                    activation_status = f'{activation_status} - unable to process request'
-                onboard_object[i].activation_status = activation_status
-        time.sleep(1)
+    def activation_detail(self, wrap_api, onboard_object, activate, network: str = 'STAGING', wait_all: bool = True) -> list:
+        """
+        Function to submit the activation of every security config at once.
+        With wait_all False it returns as soon as the first submission is done, the others finish in the background,
+        waf_poll_activation skips configs without activation id until their submission is done.
+        """
+        logger.warning(f'Activating Security Config on {activate} network')
+
+        def submit(appsec) -> None:
+            try:
+                self.submit_activation(wrap_api, appsec, network)
+            except (Exception, SystemExit) as e:
+                logger.error(f'{appsec.waf_config_name} {e!r}')
+                appsec.activation_status = 'ACTIVATION_ERROR - unable to process request'
+
+        if not onboard_object:
+            return []
+        executor = ThreadPoolExecutor(max_workers=min(ACTIVATION_WORKERS, len(onboard_object)))
+        submissions = [executor.submit(submit, appsec) for appsec in onboard_object]
+        executor.shutdown(wait=False)
+        wait(submissions, return_when=ALL_COMPLETED if wait_all else FIRST_COMPLETED)
+        return submissions
 
     def activate_and_poll(self, wrap_api, onboard_object, activate):
         print()
-        self.activation_detail(wrap_api, onboard_object, activate)
+        self.activation_detail(wrap_api, onboard_object, activate, network='STAGING', wait_all=False)
         self.waf_poll_activation(wrap_api, onboard_object, network='STAGING')
 
         if activate == 'production':
             print()
-            self.activation_detail(wrap_api, onboard_object, activate)
+            for appsec in onboard_object:
+                appsec.activation_id, appsec.activation_status, appsec.activation_create = 0, '', ''
+            self.activation_detail(wrap_api, onboard_object, activate, network='PRODUCTION', wait_all=False)
             self.waf_poll_activation(wrap_api, onboard_object, network='PRODUCTION')
 
-    def waf_poll_activation(self, wrapper_api, appsec_onboard, network):
-        all_waf_configs_active = False
-        with Live(self.waf_activation_table(appsec_onboard, network), refresh_per_second=1) as live:
-            while (not all_waf_configs_active):
-                for i, appsec in enumerate(appsec_onboard):
-                    response = wrapper_api.pollWafActivationStatus(appsec_onboard[i].activation_id)
-                    if response.status_code == 200:
-                        try:
-                            if response.json()['status'] == 'ACTIVATED':
-                                appsec_onboard[i].activation_end = datetime.datetime.utcnow().isoformat().replace('+00:00', 'Z')
-                                appsec_onboard[i].activation_status = response.json()['status']
-                        except:
-                            'no change to previous status'
-                live.update(self.waf_activation_table(appsec_onboard, network))
-                total_status = [appsec_onboard[i].activation_status for i, appsec in enumerate(appsec_onboard)]
-                pending = list(filter(lambda x: not x.startswith('ACTIVATION_ERROR') and x not in ['ACTIVATED'], total_status))
-                if len(pending) == 0:
-                    all_waf_configs_active = True
+    def waf_poll_activation(self, wrapper_api, appsec_onboard, network, workers: int = POLL_WORKERS):
+        """
+        Poll the security config activations until all are ACTIVATED or failed.
+
+        Only pending configs are polled, the ones due are fetched concurrently. Every config has
+        its own next poll time from PollStrategy, the wait grows with the polls it has been pending.
+        The live table is redrawn when an activation id or status changes, not every cycle.
+        """
+        attempts = {}
+        next_poll = {}
+
+        def pending(appsec) -> bool:
+            return not appsec.activation_status.startswith('ACTIVATION_ERROR') and appsec.activation_status != 'ACTIVATED'
+
+        def snapshot() -> list:
+            return [(appsec.activation_id, appsec.activation_status) for appsec in appsec_onboard]
+
+        def fetch(i):
+            return wrapper_api.pollWafActivationStatus(appsec_onboard[i].activation_id)
+
+        with Live(self.waf_activation_table(appsec_onboard, network), auto_refresh=False) as live:
+            shown = snapshot()
+            while True:
+                now = time.monotonic()
+                # activation id 0 is a submission still running, see activation_detail
+                due = [i for i, appsec in enumerate(appsec_onboard)
+                       if pending(appsec) and appsec.activation_id != 0 and next_poll.get(i, 0) <= now]
+                for i, response, error in run_in_pool(fetch, due, workers):
+                    eta = None
+                    if error is None and response.status_code == 200:
+                        status = response.json().get('status', '')
+                        if status == 'ACTIVATED':
+                            appsec_onboard[i].activation_end = datetime.datetime.utcnow().isoformat().replace('+00:00', 'Z')
+                            appsec_onboard[i].activation_status = status
+                        elif status in WAF_FAILED_STATUS:
+                            appsec_onboard[i].activation_status = f'ACTIVATION_ERROR - {status}'
+                        else:
+                            appsec_onboard[i].activation_status = status or appsec_onboard[i].activation_status
+                            eta = self.poll_strategy.eta(response.json())
+                    elif error is not None:
+                        logger.debug(f'{appsec_onboard[i].waf_config_name} poll failed {error}')
+                    attempts[i] = attempts.get(i, 0) + 1
+                    next_poll[i] = time.monotonic() + self.poll_strategy.delay(attempts[i] - 1, eta)
+
+                if snapshot() != shown:
+                    shown = snapshot()
+                    live.update(self.waf_activation_table(appsec_onboard, network), refresh=True)
+
+                waiting = [i for i, appsec in enumerate(appsec_onboard) if pending(appsec)]
+                if not waiting:
                     break
-                logger.info('Polling 1m...')
-                time.sleep(60)
-        return all_waf_configs_active, appsec_onboard
+                wake = [next_poll.get(i, now) for i in waiting if appsec_onboard[i].activation_id != 0]
+                submitting = len(wake) < len(waiting)
+                interval = min(wake) - time.monotonic() if wake else SUBMISSION_CHECK
+                if submitting:
+                    interval = min(interval, SUBMISSION_CHECK)
+                if interval > 0:
+                    logger.debug(f'{len(waiting)} pending, polling in {interval:.0f}s')
+                    time.sleep(interval)
+        return True, appsec_onboard
 
     def waf_activation_table(self, appsec_onboard, network) -> Table:
         table = Table()
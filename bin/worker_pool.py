@@ -0,0 +1,44 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from exceptions import setup_logger
+
+logger = setup_logger()
+
+
+def run_in_pool(func, items: list, workers: int = 1) -> list:
+    """
+    Run func(item) for every item with at most `workers` running at once.
+
+    Returns a list of (item, result, error) in the same order as items.
+    A failing item never stops the others; sys.exit() raised deep inside
+    the existing helpers is captured as an error like any other exception.
+    """
+    def _call(item):
+        try:
+            return item, func(item), None
+        except SystemExit as e:
+            return item, None, f'exited ({e.code})' if e.code else 'exited, check errors above'
+        except Exception as e:
+            logger.debug(f'{item} {e!r}')
+            return item, None, str(e) or repr(e)
+
+    if workers <= 1 or len(items) <= 1:
+        return [_call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_call, items))
@@ -17,7 +17,6 @@ import string
 import sys
 
 import _logging as lg
-import pandas as pd
 from exceptions import setup_logger
 from rich import print_json
 from tabulate import tabulate
@@ -33,6 +32,23 @@ class apiCallsWrapper:
         self.account_switch_key = f'&accountSwitchKey={account_switch_key}' \
                                   if account_switch_key is not None else ''
         self.session = session
+        self.metadata_cache = None
+
+    def cached_get(self, url: str, family: str):
+        """
+        Function to GET rarely changing metadata through the on-disk cache when one is configured
+        """
+        if self.metadata_cache is None:
+            return self.session.get(url)
+        response = self.metadata_cache.get(family, url)
+        if response is None:
+            response = self.session.get(url)
+            self.metadata_cache.put(family, url, response)
+        return response
+
+    def invalidate_cache(self, *families: str) -> None:
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate(*families)
 
     def formUrl(self, url):
         if '?' in url:
@@ -65,11 +81,14 @@ class apiCallsWrapper:
                 return True
         return False
 
-    def get_property_id(self, property_name: str):
+    def search_property_name(self, property_name: str):
         url = f'https://{self.access_hostname}/papi/v1/search/find-by-value'
         url = self.formUrl(url)
         payload = {'propertyName': property_name}
-        resp = self.session.post(url, headers=headers, json=payload)
+        return self.session.post(url, headers=headers, json=payload)
+
+    def get_property_id(self, property_name: str):
+        resp = self.search_property_name(property_name)
         if resp.status_code == 200:
             if len(resp.json()['versions']['items']) > 0:
                 return resp.json()['versions']['items']
@@ -86,7 +105,7 @@ class apiCallsWrapper:
     def get_groups_without_parent(self) -> list:
         url = f'https://{self.access_hostname}/papi/v1/groups/'
         url = self.formUrl(url)
-        resp = self.session.get(url)
+        resp = self.cached_get(url, 'groups')
 
         groups = []
         if resp.status_code == 401:
@@ -125,6 +144,14 @@ class apiCallsWrapper:
                                               headers=headers)
         return create_cpcode_response
 
+    def listCpcodes(self, contractId, groupId):
+        """
+        Function to list cpcodes of a contract and group
+        """
+        list_cpcodes_url = f'https://{self.access_hostname}/papi/v1/cpcodes?contractId={contractId}&groupId={groupId}'
+        list_cpcodes_url = self.formUrl(list_cpcodes_url)
+        return self.session.get(list_cpcodes_url)
+
     def createProperty(self, contractId, groupId, productId, property_name):
         """
         Function to create property
@@ -217,6 +244,15 @@ class apiCallsWrapper:
         edgehostname_response = self.session.get(get_edgehostnameid_url)
         return edgehostname_response
 
+    def listEdgeHostnames(self, dns_zone: str):
+        """
+        Function to list all edge hostnames of the account in one dnsZone
+        """
+        list_edgehostnames_url = f'https://{self.access_hostname}/hapi/v1/edge-hostnames?dnsZone={dns_zone}'
+        list_edgehostnames_url = self.formUrl(list_edgehostnames_url)
+        list_edgehostnames_response = self.session.get(list_edgehostnames_url)
+        return list_edgehostnames_response
+
     def updatePropertyHostname(self, contractId, groupId, propertyId, edgehostnamedata):
         """
         Function to update property hostnames and edgehostname
@@ -266,6 +302,7 @@ class apiCallsWrapper:
         actUrl = self.formUrl(actUrl)
         try:
             response = self.session.post(actUrl, data=json.dumps(activationDetails), headers=headers)
+            self.invalidate_cache('selectable_hostnames')
             logger.debug(f'{response.text} {response.status_code}')
             if response.status_code == 201:
                 link = response.json()['activationLink']
@@ -290,7 +327,7 @@ class apiCallsWrapper:
         """
         get_products_url = f'https://{self.access_hostname}/papi/v1/products?contractId={contractId}'
         get_products_url = self.formUrl(get_products_url)
-        get_products_response = self.session.get(get_products_url)
+        get_products_response = self.cached_get(get_products_url, 'products')
         return get_products_response
 
     def createEdgehostname(self, productId: str, domainPrefix: str, secureNetwork: str,
@@ -368,7 +405,7 @@ class apiCallsWrapper:
         """
         get_waf_configs_url = f'https://{self.access_hostname}/appsec/v1/configs/'
         get_waf_configs_url = self.formUrl(get_waf_configs_url)
-        get_waf_configs_response = self.session.get(get_waf_configs_url)
+        get_waf_configs_response = self.cached_get(get_waf_configs_url, 'waf_configs')
         return get_waf_configs_response
 
     def getWafConfigVersions(self, config_id):
@@ -394,6 +431,7 @@ class apiCallsWrapper:
         create_waf_configversion_response = self.session.post(create_waf_configversion_url,
                                                          data=json.dumps(version_info),
                                                          headers=headers)
+        self.invalidate_cache('waf_configs')
         logger.debug(create_waf_configversion_response.url)
         return create_waf_configversion_response
 
@@ -406,32 +444,29 @@ class apiCallsWrapper:
         match_target_response = self.session.get(get_match_target_url)
         return match_target_response
 
-    def list_match_targets(self, config_id, version, policies: dict):
+    def list_match_targets(self, config_id, version, policies: dict, display: bool = True):
         url = f'https://{self.access_hostname}/appsec/v1/configs/{config_id}/versions/{version}/match-targets'
         url = self.formUrl(url)
         resp = self.session.get(url)
-        logger.debug(json.dumps(resp.json()['matchTargets'], indent=3))
         waf_match_target_ids = []
         waf_targets = {}
         if resp.status_code == 200:
+            logger.debug(json.dumps(resp.json()['matchTargets'], indent=3))
             web_tgts = resp.json()['matchTargets']['websiteTargets']
             # logger.warning(f'{"Policy Name":<50}waf_target_id (Website Match Target)')
             for tgt in web_tgts:
                 policy_id = tgt['securityPolicy']['policyId']
-                name = policies[policy_id][0]
                 if policy_id in policies.keys():
+                    name = policies[policy_id][0]
                     policies[policy_id].append('WEB')
                     policies[policy_id].append(tgt['targetId'])
                     waf_targets[name] = tgt['targetId']
                 waf_match_target_ids.append(tgt['targetId'])
                 # logger.info(f"{name:<50}{tgt['targetId']}")
 
-            df = pd.DataFrame.from_dict(waf_targets, orient='index')
-            df.index.name = 'Policy Name'
-            df.columns = ['Website Match Target']
-            df['Website Match Target'] = df['Website Match Target'].astype(str)
-            df.sort_values(by='Policy Name', inplace=True)
-            print(tabulate(df, headers='keys', tablefmt='psql', showindex=True))
+            if display:
+                print(tabulate(sorted((name, str(target_id)) for name, target_id in waf_targets.items()),
+                               headers=['Policy Name', 'Website Match Target'], tablefmt='psql'))
         else:
             logger.error('The system was unable to locate security match targets.')
         return resp, waf_match_target_ids, waf_targets
@@ -479,6 +514,7 @@ class apiCallsWrapper:
         modify_hosts_url = self.formUrl(modify_hosts_url)
 
         modify_hosts_response = self.session.put(modify_hosts_url, data=data, headers=headers)
+        self.invalidate_cache('selectable_hostnames')
         logger.debug(f'{modify_hosts_response.status_code}: {modify_hosts_response.url}')
         logger.debug(data)
         return modify_hosts_response
@@ -504,6 +540,7 @@ class apiCallsWrapper:
         waf_activate_url = f'https://{self.access_hostname}/appsec/v1/activations'
         waf_activate_url = self.formUrl(waf_activate_url)
         waf_activate_response = self.session.post(waf_activate_url, data=json.dumps(data), headers=headers)
+        self.invalidate_cache('waf_configs', 'selectable_hostnames')
         return waf_activate_response
 
     def pollWafActivationStatus(self, activationId):
@@ -550,6 +587,7 @@ class apiCallsWrapper:
         logger.debug(payload)
 
         resp = self.session.post(url, data=json.dumps(payload), headers=headers)
+        self.invalidate_cache('waf_configs', 'selectable_hostnames')
         if resp.ok:
             ion.onboard_waf_config_id = resp.json()['configId']
             ion.onboard_waf_config_version = resp.json()['version']
@@ -666,9 +704,10 @@ class apiCallsWrapper:
         return policies_name
 
     def get_selectable_hostnames(self, contract_id: int, group_id: int, network: str | None = 'staging'):
+        import pandas as pd
         url = f'https://{self.access_hostname}/appsec/v1/contracts/{contract_id}/groups/{group_id}/selectable-hostnames'
         url = self.formUrl(url)
-        response = self.session.get(url)
+        response = self.cached_get(url, 'selectable_hostnames')
         if response.ok:
             if len(response.json()['availableSet']) > 0:
                 df = pd.json_normalize(response.json()['availableSet'])
@@ -686,6 +725,7 @@ class apiCallsWrapper:
         return response, hostnames, selectable_df
 
     def get_property_hostnames(self, property_id: str, contract_id: str, group_id: str, network: str | None = 'staging'):
+        import pandas as pd
         response = self.list_property_hostname(property_id, contract_id, group_id)
         hostnames = []
         if isinstance(response, list):
@@ -702,13 +742,11 @@ class apiCallsWrapper:
         url = f'https://{self.access_hostname}/appsec/v1/configs/{config_id}/versions/{version}/match-targets'
         url = self.formUrl(url)
         resp = self.session.get(url)
-        logger.debug(json.dumps(resp.json()['matchTargets'], indent=3))
         if resp.status_code == 200:
-            web_tgts = resp.json()['matchTargets']['websiteTargets']
-            return web_tgts
-        else:
-            logger.error('The system was unable to locate security match targets.')
-        return web_tgts
+            logger.debug(json.dumps(resp.json()['matchTargets'], indent=3))
+            return resp.json()['matchTargets']['websiteTargets']
+        logger.error('The system was unable to locate security match targets.')
+        return []
 
     def get_security_policy(self, config_id, version_numnber, policy_id):
         url = f'https://{self.access_hostname}/appsec/v1/configs/{config_id}/versions/{version_numnber}/security-policies/{policy_id}'
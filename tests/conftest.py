@@ -0,0 +1,49 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# every module sets up logging in the current folder at import, keep logs/ and config/ out of the checkout
+WORK_DIR = tempfile.mkdtemp(prefix='onboard-tests-')
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+os.chdir(WORK_DIR)
+sys.path[:0] = [os.path.join(root, 'bin'), os.path.join(root, 'benchmarks')]
+
+# installs a copy of the cli under a temporary HOME, the bin modules read config/logging.json from there
+import run_benchmarks  # noqa: E402
+import mock_server  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    """
+    Mock API server, run_benchmarks.run_command() points it at the account of the run
+    """
+    server = mock_server.serve(mock_server.MockApi())
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def options():
+    return {'latency': 0, 'activation_delay': 1, 'error_rate': 0, 'global_args': [], 'command_args': []}
@@ -0,0 +1,39 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import inputs
+import run_benchmarks
+
+
+def calls(result: dict, method: str, endpoint_suffix: str) -> int:
+    return sum(e['calls'] for e in result['endpoints'] if e['method'] == method and e['endpoint'].endswith(endpoint_suffix))
+
+
+def test_selected_hosts_are_added_with_one_put_per_config(server, options):
+    # 200 hostnames, two security configurations of ten policies each
+    api = run_benchmarks.new_api('appsec-create', 200, options['activation_delay'], 0, 0)
+    options['command_args'] = ['--workers', '2']
+
+    result = run_benchmarks.run_command(server, 'appsec-create', 200, options, api=api)
+
+    assert result['exit_code'] == 0
+    created = [config for config in api.waf_configs.values() if config['name'].startswith('bench_waf_')]
+    assert len(created) == 2
+    for config in created:
+        assert len(config['versions'][1]['policies']) == 10
+        assert len(config['versions'][1]['selected']) == 100
+    assert {h for config in created for h in config['versions'][1]['selected']} == set(inputs.hostnames(200))
+    assert calls(result, 'PUT', '/selected-hostnames') == 2
+    assert calls(result, 'GET', '/selected-hostnames') == 0
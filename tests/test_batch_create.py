@@ -0,0 +1,92 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+import threading
+import time
+
+import run_benchmarks
+
+
+def output(result: dict) -> str:
+    with open(os.path.join(result['folder'], 'output.log')) as f:
+        return f.read()
+
+
+def journal_entries(folder: str) -> list:
+    entries = []
+    for file in glob.glob(os.path.join(folder, 'onboard-runs', '*.jsonl')):
+        with open(file) as f:
+            entries.extend(json.loads(line) for line in f)
+    return entries
+
+
+def replace_handler(api, name: str, handler) -> None:
+    api.routes = [(method, pattern, handler if original.__name__ == name else original)
+                  for method, pattern, original in api.routes]
+
+
+def test_existing_property_name_fails_validation(server, options):
+    api = run_benchmarks.new_api('batch-create', 20, options['activation_delay'], 0, 0)
+    api.properties['bench-property-0000'] = 'prp_1'
+
+    result = run_benchmarks.run_command(server, 'batch-create', 20, options, api=api)
+
+    lines = output(result).splitlines()
+    assert any('bench-property-0000' in line and 'invalid property name; already in use' in line for line in lines)
+    assert any('bench-property-0001' in line and line.endswith(' valid property name') for line in lines)
+    assert 'ERROR  : Please review all errors' in lines
+    assert list(api.properties) == ['bench-property-0000']
+
+
+def test_cpcodes_are_created_by_workers_and_journaled_when_created(server, options):
+    api = run_benchmarks.new_api('batch-create', 20, options['activation_delay'], 0, 0)
+    create_cpcode, create_property = api.create_cpcode, api.create_property
+    active, most_active = [0], [0]
+    lock = threading.Lock()
+
+    def slow_cpcode(body, query):
+        # first hostname of bench-property-0001 fails, the other nine cpcodes of that property are created
+        if body['cpcodeName'] == 'www.bench-00010.example.com':
+            return 500, {'title': 'Internal Server Error', 'status': 500}
+        with lock:
+            active[0] += 1
+            most_active[0] = max(most_active[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return create_cpcode(body, query)
+
+    replace_handler(api, 'create_cpcode', slow_cpcode)
+    replace_handler(api, 'create_property', lambda body, query: (500, {'title': 'Internal Server Error', 'status': 500}))
+    options['command_args'] = ['--workers', '4']
+    first = run_benchmarks.run_command(server, 'batch-create', 20, options, api=api)
+
+    assert most_active[0] == 4
+    journaled = {entry['key'] for entry in journal_entries(first['folder']) if entry['step'] == 'cpcode'}
+    assert len(api.cpcodes) == 19
+    assert journaled == {cpcode['cpcodeName'] for cpcode in api.cpcodes}
+
+    replace_handler(api, 'slow_cpcode', create_cpcode)
+    replace_handler(api, '<lambda>', create_property)
+    run_id = os.path.basename(glob.glob(os.path.join(first['folder'], 'onboard-runs', '*.jsonl'))[0])[:-len('.jsonl')]
+    options['command_args'] = ['--workers', '4', '--resume', run_id]
+    second = run_benchmarks.run_command(server, 'batch-create', 20, options, api=api, folder=first['folder'])
+
+    assert second['exit_code'] == 0
+    assert len(api.cpcodes) == 20
+    assert sorted(api.properties) == ['bench-property-0000', 'bench-property-0001']
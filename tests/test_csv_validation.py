@@ -0,0 +1,85 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import csv_validation
+from csv_stream import read_rows
+
+HEADER = 'hostname,origin,propertyName,forwardHostHeader,edgeHostname'
+
+
+def read(tmp_path, lines: list, rules: dict) -> tuple[list, csv_validation.CsvCheck]:
+    csv_file = tmp_path / 'batch-create.csv'
+    csv_file.write_text('\n'.join(lines) + '\n')
+    check = csv_validation.CsvCheck(rules)
+    return list(read_rows(str(csv_file), check)), check
+
+
+def errors_of(tmp_path, rows: list, rules: dict) -> list:
+    return read(tmp_path, [HEADER, *rows], rules)[1].errors
+
+
+def test_secure_by_default_row_accepts_any_edge_hostname(tmp_path):
+    rows = ['www.example.com,origin.example.com,example,REQUEST_HOST_HEADER,www.example.com.akamaized.net']
+    assert errors_of(tmp_path, rows, csv_validation.BATCH_CREATE_SBD) == []
+
+
+def test_existing_edge_hostname_must_end_with_akamai_suffix(tmp_path):
+    rows = ['www.example.com,origin.example.com,example,REQUEST_HOST_HEADER,www.example.com.akamaized.net',
+            'api.example.com,origin.example.com,example,REQUEST_HOST_HEADER,api.example.com.edgekey.net']
+    assert errors_of(tmp_path, rows, csv_validation.BATCH_CREATE) == [
+        {'row': 1, 'column': 'edgeHostname', 'value': 'www.example.com.akamaized.net',
+         'error': 'must end with .edgekey.net or .edgesuite.net'}]
+
+
+def test_hostname_and_header_errors_are_reported_per_row(tmp_path):
+    rows = ['www.example.com,origin.example.com,example,REQUEST_HOST_HEADER,',
+            'www.example.com,,example,HOST,',
+            'bad_host.example.com,origin.example.com,example,,']
+    errors = errors_of(tmp_path, rows, csv_validation.BATCH_CREATE_SBD)
+    assert [(e['row'], e['column'], e['error']) for e in errors] == [
+        (2, 'forwardHostHeader', 'must be one of REQUEST_HOST_HEADER, ORIGIN_HOSTNAME'),
+        (2, 'hostname', 'duplicate hostname'),
+        (2, 'origin', 'empty value'),
+        (3, 'hostname', 'invalid character, only alphanumeric (a-z, A-Z, 0-9), dot and hyphen (-) are supported')]
+
+
+def test_rows_are_validated_and_counted_in_one_pass(tmp_path):
+    rows = ['www.example.com,origin.example.com,example,,',
+            'api.example.com,origin.example.com,example,,',
+            'bad_host.example.com,origin.example.com,other,,']
+    records, check = read(tmp_path, [HEADER, *rows], csv_validation.BATCH_CREATE_SBD)
+    assert [record['hostname'] for record in records] == ['www.example.com', 'api.example.com', 'bad_host.example.com']
+    assert check.summary() == '3 rows, 3 hostnames, 2 properties, 1 invalid rows'
+
+
+def test_only_known_columns_are_stripped(tmp_path):
+    lines = [' hostname , origin ,notes', ' www.example.com ,origin.example.com ,  keep  spaces ', 'api.example.com']
+    records, check = read(tmp_path, lines, csv_validation.BATCH_CREATE_SBD)
+    assert records[0] == {'hostname': 'www.example.com', 'origin': 'origin.example.com', 'notes': '  keep  spaces '}
+    assert records[1] == {'hostname': 'api.example.com', 'origin': '', 'notes': ''}
+    assert [(e['row'], e['column'], e['error']) for e in check.errors] == [(2, 'origin', 'empty value')]
+
+
+def test_missing_header_stops_the_pass(tmp_path):
+    records, check = read(tmp_path, ['hostname,propertyName', 'www.example.com,example'], csv_validation.BATCH_CREATE)
+    assert records == []
+    assert check.errors == [{'row': 0, 'column': 'origin', 'value': '', 'error': 'missing header'}]
+
+
+def test_report_keeps_a_bounded_number_of_errors(tmp_path):
+    rows = [f'host_{i}.example.com,origin.example.com,example,,' for i in range(csv_validation.MAX_REPORT_ROWS + 10)]
+    _, check = read(tmp_path, [HEADER, *rows], csv_validation.BATCH_CREATE_SBD)
+    assert len(check.errors) == csv_validation.MAX_REPORT_ROWS
+    assert check.error_count == csv_validation.MAX_REPORT_ROWS + 10
@@ -0,0 +1,57 @@
+"""
+Copyright 2024 Akamai Technologies, Inc. All Rights Reserved.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+    http://www.apache.org/licenses/LICENSE-2.0
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+from __future__ import annotations
+
+import datetime
+
+from poll import PollStrategy
+
+
+def test_delay_grows_without_eta():
+    strategy = PollStrategy(initial=5, maximum=60, factor=2, jitter=0)
+    assert [strategy.delay(attempt) for attempt in range(6)] == [5, 10, 20, 40, 60, 60]
+
+
+def test_delay_follows_future_eta():
+    strategy = PollStrategy(initial=5, maximum=60, factor=2, jitter=0)
+    assert strategy.delay(0, eta=30) == 30
+    assert strategy.delay(3, eta=30) == 30
+    assert strategy.delay(3, eta=600) == 60
+    assert strategy.delay(3, eta=1) == 5
+
+
+def test_delay_backs_off_once_eta_passed():
+    strategy = PollStrategy(initial=5, maximum=60, factor=2, jitter=0)
+    delays = [strategy.delay(attempt, eta=0) for attempt in range(20)]
+    assert delays[:5] == [5, 10, 20, 40, 60]
+    assert delays[5:] == [60] * 15
+
+
+def test_delay_ignores_eta_when_disabled():
+    strategy = PollStrategy(initial=5, maximum=60, factor=2, jitter=0, use_eta=False)
+    assert strategy.delay(2, eta=30) == 20
+
+
+def test_delay_jitter_stays_in_bounds():
+    strategy = PollStrategy(initial=10, maximum=60, factor=2, jitter=0.1)
+    for _ in range(50):
+        assert 9 <= strategy.delay(0, eta=0) <= 11
+
+
+def test_eta_from_estimated_finish_date():
+    finish = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=120)
+    eta = PollStrategy.eta({'estimatedFinishDate': finish.strftime('%Y-%m-%dT%H:%M:%SZ')})
+    assert 100 < eta <= 120
+    assert PollStrategy.eta({'estimatedFinishDate': '2000-01-01T00:00:00Z'}) == 0
+    assert PollStrategy.eta({}) is None